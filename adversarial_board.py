@@ -0,0 +1,174 @@
+"""
+Code Written by Jackson L. Davis
+
+This class is for a decoding board that cheats: instead of choosing a code at the start, it keeps every code that
+is consistent with the responses it has given so far, and answers each guess with the response that leaves the
+most of them. So a codebreaker never gets lucky against it, and the number of guesses it takes to break its code is
+a worst case for the codebreaker's strategy, found in one game instead of by trying every code, ex.
+ComputerPlayer(AdversarialBoard()).solve()
+
+The response is chosen by splitting the consistent codes by the response each one would give to the guess (see
+partitions.py), and taking the biggest group. Ties go to a response that does not break the code, and then to the
+response with the least index, so the same guesses always get the same responses. The winning response is only
+given once the guess is the only consistent code.
+
+The board never has a code until the game is over. Once the code is broken or the guesses are used up, the code
+is the consistent code with the least index, and code and code_index can be used like a Board's.
+
+An adversarial board is a DecodingBoard like a Board (see board.py), so it has the same properties and methods, and
+anything that plays against a Board can play against it.
+"""
+
+from board import DecodingBoard
+from codes import DEFAULT_PEGS, DEFAULT_COLOURS, mask_to_codes
+from partitions import split_codes
+
+
+class AdversarialBoard(DecodingBoard):
+    # like every decoding board, an adversarial board only holds its slots and no __dict__
+    __slots__ = ("__consistent_codes",)
+
+    def __init__(self, pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS):
+        """
+        Constructor method for the adversarial board
+        :param pegs: the number of pegs in a code
+        :param colours: the number of colours a peg can be
+        """
+        super().__init__(pegs, colours)
+        self.__consistent_codes = self.code_space.all_codes_mask  # a bitset of the codes that could be the code
+
+    @property
+    def code(self):
+        return self.code_space.index_to_code(self.code_index)
+
+    @property
+    def code_index(self):
+        if not self.game_over:
+            raise Exception("Cannot get the code, the adversarial board does not choose one until the game is over.")
+        else:
+            consistent_codes = self.__consistent_codes
+            return (consistent_codes & -consistent_codes).bit_length() - 1
+
+    @property
+    def consistent_codes(self):
+        return mask_to_codes(self.__consistent_codes)
+
+    @property
+    def number_of_consistent_codes(self):
+        return self.__consistent_codes.bit_count()
+
+    def answer_guess(self, guess):
+        """
+        Work out the response to a guess that is being added, the response that leaves the most consistent codes
+        :param guess: the index of the guess
+        :postcond: only the codes that would give the response are still consistent
+        :return: the index of the response
+        """
+        resp, self.__consistent_codes = self.choose_response(guess)
+        return resp
+
+    def choose_response(self, guess):
+        """
+        Choose the response to a guess that leaves the most consistent codes, ties go to a response that does not
+        break the code, and then to the response with the least index
+        :param guess: the index of a guess
+        :return: a tuple of the index of the response and the bitset of the codes that would give it
+        """
+        winning_response = self.code_space.winning_response
+        groups = split_codes(self.code_space, self.__consistent_codes, guess)
+        resp = min(groups, key=lambda r: (-groups[r].bit_count(), r == winning_response, r))
+        return resp, groups[resp]
+
+    def create_response_index(self, guess):
+        """
+        Find the response the adversarial board would give to a guess, without adding the guess or turning the
+        response into a tuple
+        :param guess: a string representing a guess, or the guess's index
+        :precond: guess should be a valid code for this board
+        :return: the index of the response in the code space's responses (see codes.py)
+        """
+        return self.choose_response(self.code_space.code_to_index(guess))[0]
+
+    def __repr__(self):
+        """
+        Make a representation of the adversarial board that looks exactly like
+        the way one would make it in code
+        :return: a string representation of the code necessary to make the adversarial board
+        """
+        if self.pegs == DEFAULT_PEGS and self.colours == DEFAULT_COLOURS:
+            return f"{self.__class__.__name__}()"
+        else:
+            return f"{self.__class__.__name__}(pegs={self.pegs}, colours={self.colours})"
+
+
+if __name__ == '__main__':
+    from board import Board
+    from computer_player import ComputerPlayer
+    from strategies import STRATEGIES
+
+    print("Testing adversarial_board.py")
+    errors = 0
+
+    # every strategy should break the code, and Donald Knuth's algorithm never needs more than five guesses
+    for strategy_name in STRATEGIES:
+        test_board = AdversarialBoard()
+        ComputerPlayer(test_board, strategy=strategy_name, use_guess_cache=False).solve(verbose=False)
+        print(strategy_name + ": " + str(len(test_board.guesses)) + " guesses, " + " ".join(test_board.guesses))
+        if not test_board.solved:
+            print("Error: " + strategy_name + " did not break the adversarial board's code.")
+            errors += 1
+        elif strategy_name == "minimax" and len(test_board.guesses) > 5:
+            print("Error: Donald Knuth's algorithm took more than five guesses.")
+            errors += 1
+        else:
+            pass
+
+        # a board with the code it revealed should give the same responses
+        replay_board = Board(test_board.code)
+        replay_board.add_guesses(test_board.guesses)
+        if replay_board.responses != test_board.responses:
+            print("Error: the code " + test_board.code + " does not give the adversarial board's responses.")
+            errors += 1
+        else:
+            pass
+
+    # the response should leave the most codes, and should not win while another code is consistent
+    # (0, 0), (0, 1), and (1, 0) each leave 256 codes after 1122, and (0, 0) has the least index
+    first_board = AdversarialBoard()
+    first_board.add_guess("1122")
+    if first_board.responses != [(0, 0)] or first_board.number_of_consistent_codes != 256:
+        print("Error: the response to 1122 should be (0, 0), which leaves 256 codes.")
+        errors += 1
+    else:
+        pass
+    two_codes = AdversarialBoard(pegs=2, colours=2)
+    two_codes.add_guesses(g for g in ["11", "12"])
+    if two_codes.solved or two_codes.number_of_consistent_codes != 1:
+        print("Error: the adversarial board gave the winning response while another code was consistent.")
+        errors += 1
+    else:
+        pass
+
+    try:
+        AdversarialBoard().code
+        print("Error: the adversarial board revealed a code before the game was over.")
+        errors += 1
+    except:
+        pass
+    if not str(first_board).endswith("????\n") or hasattr(first_board, "__dict__"):
+        print("Error: the adversarial board should print like a Board, hide its code, and have no __dict__.")
+        errors += 1
+    else:
+        pass
+
+    # a bigger code space without a feedback table
+    big_board = AdversarialBoard(pegs=5, colours=7)
+    ComputerPlayer(big_board, seed=1).solve(verbose=False)
+    print("5 pegs and 7 colours: " + str(len(big_board.guesses)) + " guesses, " + " ".join(big_board.guesses))
+    if not big_board.solved:
+        print("Error: the computer player did not break the code with 5 pegs and 7 colours.")
+        errors += 1
+    else:
+        pass
+
+    print("Finished testing with " + str(errors) + " errors.")
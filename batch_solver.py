@@ -0,0 +1,429 @@
+"""
+Code Written by Jackson L. Davis
+
+This class is for a batch solver that has a computer player break every possible code.
+It is used to check a strategy: it reports how many codes were broken in each number of guesses, the average number
+of guesses, and the worst case.
+
+A computer player always makes the same guess after the same responses, so the batch solver keeps a trie of the
+game states it has reached, where each state is found by following the responses given so far. The guess for a
+state is only searched for the first time a code reaches that state, and every later code that reaches the same
+state reuses it. This way the first guesses are worked out once instead of once for each code.
+
+There is also a lockstep solver for playing many games at once, ex. for a server with many computer codebreakers.
+It holds the state of every game (the possible codes and the unused codes, like a computer player), and works out the
+next guess for every game in one call to propose_all(), then takes the responses for every game in one call to
+observe_all(). Games that are in the same state are grouped and their guess is only worked out once, and the groups
+that are left are scored together: each code's masks are looked up once and used for every group that scores it,
+instead of once for each computer player. A state where a possible code splits the possible codes into groups of
+one code each is not scored at all, since that code is the guess (see find_perfect_guess()).
+"""
+
+from board import Board
+from codes import DEFAULT_PEGS, DEFAULT_COLOURS, get_code_space, mask_to_codes
+from computer_player import ComputerPlayer, get_guess_cache
+from feedback_table import get_feedback_table
+from guess_cache import make_fingerprint
+from partitions import split_codes
+from strategies import DEFAULT_STRATEGY, STRATEGIES, get_strategy
+from symmetry import orbit_representatives
+import random as rand
+import time as time
+
+
+class BatchSolver:
+
+    def __init__(self, pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS, **player_options):
+        """
+        Constructor method for the batch solver
+        :param pegs: the number of pegs in a code
+        :param colours: the number of colours a peg can be
+        :param player_options: keyword arguments for making each ComputerPlayer that searches for a guess,
+                               ex. processes=4
+        """
+        self.__code_space = get_code_space(pegs, colours)
+        self.__player_options = player_options
+        # the root of the trie of game states, each state is a list [guess, children] where children is a dictionary
+        # from the index of a response to the state after that response
+        self.__root = [self.__code_space.first_guess, {}]
+        self.__positions_scored = 0
+
+    @property
+    def code_space(self):
+        return self.__code_space
+
+    @property
+    def positions_scored(self):
+        return self.__positions_scored
+
+    def solve(self, code):
+        """
+        Have the computer player's strategy break one code, reusing any game states that are already in the trie
+        :param code: the code to break, as a string or an index
+        :return: the decoding board after the code has been broken, or after all guesses are used up
+        """
+        board = Board(code, self.__code_space.pegs, self.__code_space.colours)
+        state = self.__root
+        while not board.solved and len(board.guess_indexes) < board.max_guesses:
+            board.add_guess(state[0])
+            resp = board.response_indexes[-1]
+            if not board.solved and len(board.guess_indexes) < board.max_guesses:
+                # the next guess is only searched for if the board has a guess left to make it with
+                if resp not in state[1]:
+                    state[1][resp] = [self.find_guess(board), {}]
+                else:
+                    pass
+                state = state[1][resp]
+            else:
+                pass
+        return board
+
+    def find_guess(self, board):
+        """
+        Search for the guess a computer player would make after the guesses and responses on a board
+        :param board: a decoding board that has not been solved
+        :return: the index of the next guess
+        """
+        player = ComputerPlayer(None, pegs=self.__code_space.pegs, colours=self.__code_space.colours,
+                                **self.__player_options)
+        for i in range(len(board.guess_indexes)):
+            player.record_response(board.guess_indexes[i], board.response_indexes[i])
+        self.__positions_scored += 1
+        return player.next_guess()
+
+    def solve_all(self, codes=None):
+        """
+        Break every code in codes
+        :param codes: a list of the codes to break, as strings or indexes, or None for every possible code
+        :return: a dictionary from the index of each code to the number of guesses it took,
+                 or to None if the code was not broken
+        """
+        if codes is None:
+            codes = range(self.__code_space.number_of_codes)
+        else:
+            pass
+        results = {}
+        for code in codes:
+            board = self.solve(code)
+            if board.solved:
+                results[board.code_index] = len(board.guess_indexes)
+            else:
+                results[board.code_index] = None
+        return results
+
+
+class LockstepSolver:
+
+    def __init__(self, pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS, strategy=DEFAULT_STRATEGY, use_symmetry=True,
+                 use_guess_cache=True):
+        """
+        Constructor method for the lockstep solver, every game makes the same guesses a ComputerPlayer made with the
+        same options would make
+        :param pegs: the number of pegs in a code
+        :param colours: the number of colours a peg can be
+        :param strategy: the name of a strategy in STRATEGIES (see strategies.py), or a function that scores a
+                         partition histogram
+        :param use_symmetry: True if only one code out of each set of codes that are symmetric after the guesses
+                             made so far should be scored
+        :param use_guess_cache: True if the guess cache that is shared by every computer player in this process
+                                should be looked in and added to
+        """
+        get_strategy(strategy)  # throws an exception if there is no such strategy
+        self.__code_space = get_code_space(pegs, colours)
+        self.__feedback_table = get_feedback_table(self.__code_space)
+        self.__strategy = strategy
+        self.__use_symmetry = use_symmetry
+        self.__use_guess_cache = use_guess_cache
+        # the state of game g is self.__possible_codes[g] and self.__unused_codes[g], both bitsets (see codes.py)
+        self.__possible_codes = []
+        self.__unused_codes = []
+        self.__histories = []        # a list of (guess, response) tuples for each game
+        self.__proposed_guesses = []  # the guess waiting for a response in each game, or None
+        self.__solved = []
+        self.__states_searched = 0
+
+    @property
+    def code_space(self):
+        return self.__code_space
+
+    @property
+    def number_of_games(self):
+        return len(self.__solved)
+
+    @property
+    def states_searched(self):
+        return self.__states_searched
+
+    def new_games(self, count):
+        """
+        Start games
+        :param count: the number of games to start
+        :return: a list of the numbers of the new games, which are used in propose_all() and observe_all()
+        """
+        first_game = len(self.__solved)
+        for g in range(count):
+            self.__possible_codes.append(self.__code_space.all_codes_mask)
+            self.__unused_codes.append(self.__code_space.all_codes_mask)
+            self.__histories.append([])
+            self.__proposed_guesses.append(None)
+            self.__solved.append(False)
+        return list(range(first_game, first_game + count))
+
+    def is_solved(self, game):
+        """
+        Determine whether the code of a game has been broken
+        :param game: the number of a game
+        :return: True if the winning response has been observed for the game, False otherwise
+        """
+        return self.__solved[game]
+
+    def propose_all(self, games=None):
+        """
+        Choose the next guess of many games at once.
+        The games are grouped by their state, and the guess for each state is found once by find_guesses().
+        Calling propose_all() again before observe_all() gives the same guesses without searching again.
+        :param games: a list of the numbers of the games, or None for every game that has not been solved
+        :precond: none of the games have been solved
+        :return: a dictionary from the number of each game to the index of its next guess
+        """
+        if games is None:
+            games = [g for g in range(len(self.__solved)) if not self.__solved[g]]
+        else:
+            pass
+        states = {}  # the games waiting for a guess in each state
+        for game in games:
+            if self.__solved[game]:
+                raise Exception("Cannot propose a guess for game " + str(game) + ", its code has already been broken.")
+            elif self.__proposed_guesses[game] is None:
+                state = (self.__possible_codes[game], self.__unused_codes[game])
+                states.setdefault(state, []).append(game)
+            else:
+                pass
+        state_guesses = self.find_guesses({state: states[state][0] for state in states})
+        for state in states:
+            for game in states[state]:
+                self.__proposed_guesses[game] = state_guesses[state]
+        return {game: self.__proposed_guesses[game] for game in games}
+
+    def observe_all(self, responses):
+        """
+        Take the responses to the guesses from propose_all() into account.
+        Games with the same possible codes that made the same guess share one split of their possible codes (see
+        partitions.py), so each split is only worked out once.
+        :param responses: a dictionary from the number of each game to the response to its guess, as a tuple or an
+                          index, ex. the last response on each game's board
+        :precond: propose_all() has been called for each game since its last response
+        :postcond: the codes that would not give each game's response are no longer possible in that game, or the
+                   game is solved if its response is the winning response
+        """
+        splits = {}  # the split of the possible codes for each (possible codes, guess)
+        for game, resp in responses.items():
+            guess = self.__proposed_guesses[game]
+            if guess is None:
+                raise Exception("Cannot observe a response for game " + str(game) + ", no guess has been proposed.")
+            else:
+                pass
+            resp = self.__code_space.response_to_index(resp)
+            self.__proposed_guesses[game] = None
+            if resp == self.__code_space.winning_response:
+                self.__solved[game] = True
+            else:
+                key = (self.__possible_codes[game], guess)
+                if key not in splits:
+                    splits[key] = split_codes(self.__code_space, self.__possible_codes[game], guess)
+                else:
+                    pass
+                self.__possible_codes[game] = splits[key].get(resp, 0) & ~(1 << guess)
+                self.__unused_codes[game] &= ~(1 << guess)
+                self.__histories[game].append((guess, resp))
+
+    def find_guesses(self, states):
+        """
+        Find the guess for each of many states.
+        The first guess is the code space's first guess, and a state that is in the guess cache is looked up. With
+        a feedback table, the codes each state has to score are found like ComputerPlayer.next_guess() finds them,
+        then every code is scored for all of the states that need it at once, with its masks looked up once. The
+        best code of a state is the one with the least (score, not possible, index), which is the same code that
+        ComputerPlayer.choose_best_code() chooses. Without a feedback table, a computer player is given the
+        history of one game in the state and searches for the guess.
+        :param states: a dictionary from each state, a tuple (possible codes, unused codes), to the number of a game
+                       in that state
+        :return: a dictionary from each state to the index of its guess
+        """
+        code_space = self.__code_space
+        guesses = {}
+        states_to_score = {}  # the states that score each code
+        for state in states:
+            possible_codes, unused_codes = state
+            # the cache is looked up once, since another thread can remove the guess between two lookups
+            cached_guess = None
+            if self.__use_guess_cache and unused_codes != code_space.all_codes_mask:
+                cached_guess = get_guess_cache().get(make_fingerprint(possible_codes, unused_codes, code_space.pegs,
+                                                                      code_space.colours, self.__strategy))
+            else:
+                pass
+            if unused_codes == code_space.all_codes_mask:
+                guesses[state] = code_space.first_guess
+            elif cached_guess is not None:
+                guesses[state] = cached_guess
+            elif self.__feedback_table is None:
+                player = ComputerPlayer(None, pegs=code_space.pegs, colours=code_space.colours,
+                                        strategy=self.__strategy, use_symmetry=self.__use_symmetry,
+                                        use_guess_cache=self.__use_guess_cache)
+                for guess, resp in self.__histories[states[state]]:
+                    player.record_response(guess, resp)
+                guesses[state] = player.next_guess()
+                self.__states_searched += 1
+            else:
+                if self.__use_symmetry:
+                    made_guesses = tuple(mask_to_codes(code_space.all_codes_mask & ~unused_codes))
+                    codes_to_score = unused_codes & orbit_representatives(code_space.pegs, code_space.colours,
+                                                                          made_guesses)
+                else:
+                    codes_to_score = unused_codes
+                self.__states_searched += 1
+                perfect_guess = self.find_perfect_guess(possible_codes & codes_to_score, possible_codes)
+                if perfect_guess is not None:
+                    guesses[state] = perfect_guess
+                    continue
+                else:
+                    pass
+                for code in mask_to_codes(codes_to_score):
+                    if code in states_to_score:
+                        states_to_score[code].append(state)
+                    else:
+                        states_to_score[code] = [state]
+
+        score_histogram = get_strategy(self.__strategy)
+        best_keys = {}  # the least (score, not possible, index) of each state
+        for code in sorted(states_to_score):
+            code_masks = self.__feedback_table.masks(code)
+            for state in states_to_score[code]:
+                possible_codes = state[0]
+                code_key = (score_histogram(list(map(int.bit_count, map(possible_codes.__and__, code_masks)))),
+                            not (possible_codes >> code) & 1, code)
+                if state not in best_keys or code_key < best_keys[state]:
+                    best_keys[state] = code_key
+                else:
+                    pass
+        for state in best_keys:
+            guesses[state] = best_keys[state][2]
+        if self.__use_guess_cache:
+            for state in guesses:
+                get_guess_cache().put(make_fingerprint(state[0], state[1], code_space.pegs, code_space.colours,
+                                                       self.__strategy), guesses[state])
+        else:
+            pass
+        return guesses
+
+    def find_perfect_guess(self, candidates, possible_codes):
+        """
+        Look for a possible code that splits the possible codes into groups of one code each.
+        With any of the built-in strategies, no code can score better than that, and from the codes with the best
+        score a possible code with the least index is chosen, so the first such code in index order is the guess.
+        Late in a game most states have one, so most of their codes never have to be scored.
+        :param candidates: a bitset of the possible codes that would be scored
+        :param possible_codes: a bitset of the possible codes
+        :return: the index of the first code in candidates that splits possible_codes into groups of one code, or
+                 None if there is none or the strategy is not a built-in one
+        """
+        if callable(self.__strategy) or self.__strategy not in STRATEGIES:
+            return None
+        else:
+            pass
+        for code in mask_to_codes(candidates):
+            if max(map(int.bit_count, map(possible_codes.__and__, self.__feedback_table.masks(code)))) == 1:
+                return code
+            else:
+                pass
+        return None
+
+    def solve_boards(self, boards):
+        """
+        Break the codes on many boards at once, one guess on every board at a time
+        :param boards: a list of decoding boards with this solver's number of pegs and colours
+        :return: the number of guesses made on all of the boards together
+        """
+        games = dict(zip(self.new_games(len(boards)), boards))
+        moves = 0
+        while len(games) > 0:
+            guesses = self.propose_all(list(games))
+            for game in games:
+                games[game].add_guess(guesses[game])
+            moves += len(games)
+            self.observe_all({game: games[game].response_indexes[-1] for game in games})
+            games = {game: board for game, board in games.items()
+                     if not board.solved and len(board.guess_indexes) < board.max_guesses}
+        return moves
+
+
+def summarize(results):
+    """
+    Work out the distribution, average, and worst case of the number of guesses
+    :param results: a dictionary from code indexes to numbers of guesses, like the one from BatchSolver.solve_all()
+    :return: a tuple of a dictionary from each number of guesses to how many codes took that many,
+             the average number of guesses, and the largest number of guesses
+             (codes that were not broken are counted under None and left out of the average and worst case)
+    """
+    distribution = {}
+    for number_of_guesses in results.values():
+        distribution[number_of_guesses] = distribution.get(number_of_guesses, 0) + 1
+    broken = [n for n in results.values() if n is not None]
+    if len(broken) == 0:
+        return distribution, 0, 0
+    else:
+        return distribution, sum(broken) / len(broken), max(broken)
+
+
+if __name__ == '__main__':
+    print("Breaking every code with Donald Knuth's five-guess algorithm.")
+    start_time = time.time()
+    batch_solver = BatchSolver()
+    all_results = batch_solver.solve_all()
+    end_time = time.time()
+
+    guess_distribution, average_guesses, worst_guesses = summarize(all_results)
+    for guesses in sorted(n for n in guess_distribution if n is not None):
+        print(str(guesses) + " guesses: " + str(guess_distribution[guesses]) + " codes")
+    if None in guess_distribution:
+        print("Not broken: " + str(guess_distribution[None]) + " codes")
+    else:
+        pass
+    print("Average number of guesses: " + str(average_guesses))
+    print("Worst case: " + str(worst_guesses) + " guesses")
+    worst_codes = [batch_solver.code_space.index_to_code(c) for c in all_results if all_results[c] == worst_guesses]
+    print("Codes that need the worst case, ex. " + ", ".join(worst_codes[:5]))
+    print("Searched " + str(batch_solver.positions_scored) + " positions in " + str(end_time - start_time) +
+          " seconds.")
+
+    # the lockstep solver should make the same guesses, and make them faster than a computer player for each game
+    lockstep_boards = [Board(code) for code in range(batch_solver.code_space.number_of_codes)]
+    start_time = time.time()
+    LockstepSolver(use_guess_cache=False).solve_boards(lockstep_boards)
+    lockstep_time = time.time() - start_time
+    lockstep_results = {board.code_index: len(board.guess_indexes) for board in lockstep_boards}
+    if lockstep_results != all_results:
+        print("Error: the lockstep solver did not take the same number of guesses as the batch solver.")
+    else:
+        pass
+    print("The lockstep solver broke every code in " + str(lockstep_time) + " seconds.")
+    separate_codes = rand.Random(1122).sample(range(batch_solver.code_space.number_of_codes), 100)
+    start_time = time.time()
+    separate_moves = 0
+    for code in separate_codes:
+        separate_board = Board(code)
+        ComputerPlayer(separate_board, use_guess_cache=False).solve(verbose=False)
+        separate_moves += len(separate_board.guess_indexes)
+    separate_time = time.time() - start_time
+    start_time = time.time()
+    lockstep_moves = LockstepSolver(use_guess_cache=False).solve_boards([Board(code) for code in separate_codes])
+    lockstep_time = time.time() - start_time
+    print("100 games: " + str(round(separate_moves / separate_time)) + " moves a second with a computer player "
+          "for each game, " + str(round(lockstep_moves / lockstep_time)) + " moves a second in lockstep")
+
+    # compare every strategy
+    for strategy_name in STRATEGIES:
+        strategy_results = BatchSolver(strategy=strategy_name).solve_all()
+        guess_distribution, average_guesses, worst_guesses = summarize(strategy_results)
+        print(strategy_name + ": average " + str(round(average_guesses, 4)) + " guesses, worst case " +
+              str(worst_guesses) + " guesses")
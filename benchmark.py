@@ -0,0 +1,363 @@
+"""
+Code Written by Jackson L. Davis
+
+This file is for a benchmark suite that measures how fast the board and the computer player are.
+Each part is measured on its own with time.perf_counter(), after warm-up runs, using fixed seeds so that every run
+does the same work:
+
+response throughput: how many responses Board.create_response() and ComputerPlayer.simulate_response() make each
+second.
+
+next_guess latency: how long ComputerPlayer.next_guess() takes at each move of a game.
+
+solve latency: how long it takes to break a fixed set of random codes, and every code if --all is given.
+
+worst case: how many guesses it takes to break the code of an adversarial board, which answers every guess with the
+response that leaves the most codes (see adversarial_board.py).
+
+memory: how much memory a computer player holds, and the most memory used while breaking a code (from tracemalloc).
+
+startup time: how long it takes a new Python process to import the computer player.
+
+The results are written as JSON, and can be compared against a saved baseline, ex.
+python benchmark.py --output baseline.json
+python benchmark.py --baseline baseline.json
+"""
+
+from adversarial_board import AdversarialBoard
+from board import Board
+from codes import get_code_space
+from computer_player import ComputerPlayer, get_decision_tree, get_guess_cache
+import argparse
+import json
+import platform
+import random as rand
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BENCHMARK_VERSION = 1
+DEFAULT_SEED = 1122
+DEFAULT_GAMES = 20
+# a metric is reported as a regression if it is worse than the baseline by more than this fraction
+DEFAULT_TOLERANCE = 0.10
+
+
+def make_metric(value, unit, better):
+    """
+    Make one result of the benchmark
+    :param value: the measured value
+    :param unit: the unit of value, ex. "seconds"
+    :param better: "lower" if a lower value is better, or "higher" if a higher value is better
+    :return: a dictionary for the metric
+    """
+    return {"value": value, "unit": unit, "better": better}
+
+
+def time_repeats(function, repeats, warm_ups=1):
+    """
+    Time a function with time.perf_counter(), after running it a few times first
+    :param function: a function with no parameters
+    :param repeats: the number of timed runs
+    :param warm_ups: the number of runs that are not timed
+    :return: a list of the number of seconds each timed run took
+    """
+    for w in range(warm_ups):
+        function()
+    times = []
+    for r in range(repeats):
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+    return times
+
+
+def random_codes(seed, number_of_codes):
+    """
+    Choose codes to break, the same codes every time for the same seed
+    :param seed: the seed for the random numbers
+    :param number_of_codes: the number of codes to choose
+    :return: a list of code indexes
+    """
+    random_generator = rand.Random(seed)
+    return [random_generator.randrange(get_code_space().number_of_codes) for c in range(number_of_codes)]
+
+
+def benchmark_responses(seed, repeats):
+    """
+    Measure how many responses create_response() and simulate_response() make each second
+    :param seed: the seed for choosing the codes and guesses
+    :param repeats: the number of timed runs, the best run is reported
+    :return: a dictionary of metrics
+    """
+    code_space = get_code_space()
+    random_generator = rand.Random(seed)
+    pairs = [(random_generator.randrange(code_space.number_of_codes),
+              random_generator.randrange(code_space.number_of_codes)) for p in range(10000)]
+    boards = {code: Board(code) for code, guess in pairs}
+    player = ComputerPlayer(None)
+
+    def create_responses():
+        for code, guess in pairs:
+            boards[code].create_response(guess)
+
+    def simulate_responses():
+        for code, guess in pairs:
+            player.simulate_response(code, guess)
+
+    return {
+        "create_response_per_second": make_metric(len(pairs) / min(time_repeats(create_responses, repeats)),
+                                                  "responses/second", "higher"),
+        "simulate_response_per_second": make_metric(len(pairs) / min(time_repeats(simulate_responses, repeats)),
+                                                    "responses/second", "higher"),
+    }
+
+
+def benchmark_next_guess(codes, player_options, repeats):
+    """
+    Measure how long next_guess() takes at each move, with the guess cache turned off so each move is searched.
+    Every game is played once as a warm-up, so the feedback table's masks and the symmetry caches are loaded, and
+    then played repeats more times, and the fastest time for each move of each game is kept.
+    :param codes: a list of the indexes of the codes to break
+    :param player_options: keyword arguments for making each ComputerPlayer
+    :param repeats: the number of timed runs of each game
+    :return: a dictionary of metrics
+    """
+    code_space = get_code_space()
+    best_times = {}  # from (code, move number) to the fewest seconds, the first guess is move 1
+    for r in range(repeats + 1):
+        for code in codes:
+            player = ComputerPlayer(None, use_guess_cache=False, **player_options)
+            guess = code_space.first_guess
+            move = 1
+            while guess != code:
+                player.record_response(guess, code_space.response_index(code, guess))
+                move += 1
+                start_time = time.perf_counter()
+                guess = player.next_guess()
+                move_time = time.perf_counter() - start_time
+                if r > 0:
+                    best_times[(code, move)] = min(move_time, best_times.get((code, move), move_time))
+                else:
+                    pass
+
+    times_by_move = {}  # from move number to a list of seconds
+    for (code, move), move_time in best_times.items():
+        times_by_move.setdefault(move, []).append(move_time)
+
+    metrics = {}
+    for move in sorted(times_by_move):
+        metrics["next_guess_move_" + str(move) + "_median_seconds"] = make_metric(
+            statistics.median(times_by_move[move]), "seconds", "lower")
+    return metrics
+
+
+def benchmark_solve(codes, player_options, name, repeats=1):
+    """
+    Measure how long it takes to break codes, each with a new computer player.
+    The guess cache is cleared before each run, so each run does the same work.
+    :param codes: a list of the indexes of the codes to break
+    :param player_options: keyword arguments for making each ComputerPlayer
+    :param name: the start of the metric names, ex. "solve_seeded"
+    :param repeats: the number of timed runs, the fastest run is reported
+    :return: a dictionary of metrics
+    """
+    ComputerPlayer(Board(codes[0]), **player_options).solve(verbose=False)  # warm-up
+    total_time = None
+    for r in range(repeats):
+        get_guess_cache().clear()
+        run_solve_times = []
+        guesses = []
+        start_time = time.perf_counter()
+        for code in codes:
+            board = Board(code)
+            player = ComputerPlayer(board, **player_options)
+            solve_start_time = time.perf_counter()
+            player.solve(verbose=False)
+            run_solve_times.append(time.perf_counter() - solve_start_time)
+            guesses.append(len(board.guess_indexes))
+        run_total_time = time.perf_counter() - start_time
+        if total_time is None or run_total_time < total_time:
+            total_time = run_total_time
+            solve_times = run_solve_times
+        else:
+            pass
+    return {
+        name + "_total_seconds": make_metric(total_time, "seconds", "lower"),
+        name + "_median_seconds": make_metric(statistics.median(solve_times), "seconds", "lower"),
+        name + "_average_guesses": make_metric(sum(guesses) / len(guesses), "guesses", "lower"),
+    }
+
+
+def benchmark_adversarial(player_options):
+    """
+    Measure the guesses it takes to break the code of an adversarial board (see adversarial_board.py), which is a
+    worst case for the computer player's strategy
+    :param player_options: keyword arguments for making the ComputerPlayer
+    :return: a dictionary of metrics
+    """
+    board = AdversarialBoard()
+    ComputerPlayer(board, use_guess_cache=False, **player_options).solve(verbose=False)
+    return {
+        "adversarial_guesses": make_metric(len(board.guess_indexes) if board.solved else board.max_guesses + 1,
+                                           "guesses", "lower"),
+    }
+
+
+def benchmark_memory(code, player_options):
+    """
+    Measure the memory held by a computer player and the most memory used while breaking a code.
+    The shared feedback table and guess cache are loaded first, so they are not counted.
+    :param code: the index of the code to break
+    :param player_options: keyword arguments for making each ComputerPlayer
+    :return: a dictionary of metrics
+    """
+    ComputerPlayer(Board(code), **player_options).solve(verbose=False)  # load the shared tables first
+    number_of_players = 100
+    tracemalloc.start()
+    try:
+        start_size = tracemalloc.get_traced_memory()[0]
+        players = [ComputerPlayer(Board(code), **player_options) for p in range(number_of_players)]
+        player_size = (tracemalloc.get_traced_memory()[0] - start_size) / len(players)
+        tracemalloc.reset_peak()
+        peak_start_size = tracemalloc.get_traced_memory()[0]
+        ComputerPlayer(Board(code), use_guess_cache=False, **player_options).solve(verbose=False)
+        solve_peak = tracemalloc.get_traced_memory()[1] - peak_start_size
+    finally:
+        tracemalloc.stop()
+    return {
+        "memory_per_player_bytes": make_metric(player_size, "bytes", "lower"),
+        "memory_solve_peak_bytes": make_metric(solve_peak, "bytes", "lower"),
+    }
+
+
+def benchmark_startup(repeats):
+    """
+    Measure how long a new Python process takes to start and import the computer player
+    :param repeats: the number of timed runs, the median run is reported
+    :return: a dictionary of metrics
+    """
+    command = [sys.executable, "-c", "import computer_player"]
+
+    def start_process():
+        subprocess.run(command, check=True)
+
+    return {
+        "startup_import_seconds": make_metric(statistics.median(time_repeats(start_process, repeats)), "seconds",
+                                              "lower"),
+    }
+
+
+def run_benchmarks(seed=DEFAULT_SEED, games=DEFAULT_GAMES, every_code=False, player_options=None):
+    """
+    Run every benchmark
+    :param seed: the seed for choosing codes
+    :param games: the number of random codes to break
+    :param every_code: True if every code should also be broken
+    :param player_options: keyword arguments for making each ComputerPlayer, ex. {"strategy": "entropy"}
+    :return: a dictionary with information about the run and a dictionary of metrics
+    """
+    if player_options is None:
+        player_options = {}
+    else:
+        pass
+    codes = random_codes(seed, games)
+    metrics = {}
+    metrics.update(benchmark_responses(seed, 5))
+    metrics.update(benchmark_next_guess(codes, player_options, 3))
+    metrics.update(benchmark_solve(codes, player_options, "solve_seeded", 3))
+    metrics.update(benchmark_solve(codes, dict(player_options, use_decision_tree=True), "solve_decision_tree", 3))
+    if every_code:
+        metrics.update(benchmark_solve(list(range(get_code_space().number_of_codes)), player_options, "solve_all"))
+    else:
+        pass
+    metrics.update(benchmark_adversarial(player_options))
+    metrics.update(benchmark_memory(codes[0], player_options))
+    metrics.update(benchmark_startup(5))
+    return {
+        "version": BENCHMARK_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "games": games,
+        "player_options": player_options,
+        "metrics": metrics,
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare the metrics of a run to the metrics of a baseline run
+    :param results: the dictionary from run_benchmarks()
+    :param baseline: a dictionary from run_benchmarks() that was saved earlier
+    :param tolerance: the fraction a metric can be worse than the baseline by before it is a regression
+    :return: a list of tuples (metric name, baseline value, new value, change), where change is the fraction the
+             metric got better by (negative if it got worse), and a list of the names of the metrics that regressed
+    """
+    comparisons = []
+    regressions = []
+    for name, metric in results["metrics"].items():
+        if name in baseline["metrics"] and baseline["metrics"][name]["value"] != 0:
+            old_value = baseline["metrics"][name]["value"]
+            change = (old_value - metric["value"]) / old_value
+            if metric["better"] == "higher":
+                change = -change
+            else:
+                pass
+            comparisons.append((name, old_value, metric["value"], change))
+            if change < -tolerance:
+                regressions.append(name)
+            else:
+                pass
+        else:
+            pass
+    return comparisons, regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the board and the computer player.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="the seed for choosing codes")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="the number of random codes to break")
+    parser.add_argument("--all", action="store_true", help="also break every code")
+    parser.add_argument("--strategy", default=None, help="the strategy for the computer player")
+    parser.add_argument("--output", default=None, help="the file to write the results to, as JSON")
+    parser.add_argument("--baseline", default=None, help="a results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="the fraction a metric can be worse than the baseline by before it is a regression")
+    arguments = parser.parse_args()
+
+    options = {}
+    if arguments.strategy is not None:
+        options["strategy"] = arguments.strategy
+    else:
+        pass
+    get_decision_tree()  # build the decision tree before timing anything, if it has not been saved yet
+    benchmark_results = run_benchmarks(arguments.seed, arguments.games, arguments.all, options)
+
+    if arguments.output is not None:
+        with open(arguments.output, "w") as output_file:
+            json.dump(benchmark_results, output_file, indent=2)
+        print("Wrote the results to " + arguments.output)
+    else:
+        print(json.dumps(benchmark_results, indent=2))
+
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as baseline_file:
+            baseline_results = json.load(baseline_file)
+        all_comparisons, all_regressions = compare_to_baseline(benchmark_results, baseline_results,
+                                                               arguments.tolerance)
+        for metric_name, baseline_value, new_value, metric_change in all_comparisons:
+            if metric_change >= 0:
+                change_text = str(round(metric_change * 100, 1)) + "% better"
+            else:
+                change_text = str(round(-metric_change * 100, 1)) + "% worse"
+            print(metric_name + ": " + str(baseline_value) + " -> " + str(new_value) + " (" + change_text + ")")
+        if len(all_regressions) > 0:
+            print("Regressions: " + ", ".join(all_regressions))
+            sys.exit(1)
+        else:
+            print("No regressions.")
+    else:
+        pass
@@ -22,117 +22,174 @@ If the code is "1234" and a guess is "5111", the response to the guess would be
 code, so only one "1" counts for being the correct colour but in the wrong position.
 
 If the code is "2111" and a guess is "1654", the response to the guess would be (0, 1).
+
+The standard game has four pegs and six colours, but a decoding board can be made with any number of pegs and
+colours, ex. Board("12345", pegs=5, colours=8).
+
+Inside the decoding board, codes and responses are stored as integers (see codes.py). Each guess and its response
+are packed into one integer, guess * (number of responses) + response, and these are kept in one array (see the
+array module) instead of lists, so each guess only takes two bytes in the standard game.
+The properties code, guesses, and responses turn them back into strings and tuples.
+
+Everything that does not depend on where the responses come from, ex. storing the moves and printing the board, is
+in DecodingBoard, so Board and AdversarialBoard (see adversarial_board.py) share it.
 """
 
+from codes import DEFAULT_PEGS, DEFAULT_COLOURS, get_code_space
+from array import array
 
-class Board:
+MAX_GUESSES = 10
 
-    def __init__(self, code):
-        """
-        Constructor method for the decoding board
-        :param code: a string of a four-digit number representing the code to break
-        :precond: is_valid_code(code)
-        """
-        if not self.is_valid_code(code):
-            raise Exception("Cannot make Board, code is not valid.")
+
+def smallest_typecode(largest):
+    """
+    Find the array typecode with the fewest bytes that can hold every integer from 0 to largest
+    :param largest: the largest integer that has to fit
+    :return: an unsigned typecode for array.array
+    """
+    for typecode in ["B", "H", "I", "L", "Q"]:
+        if largest < 2 ** (8 * array(typecode).itemsize):
+            return typecode
         else:
             pass
+    raise Exception("Cannot find a typecode, " + str(largest) + " does not fit in 64 bits.")
+
 
-        self.__code = code
-        self.__max_guesses = 10
-        self.__solved = False
-        self.__guesses = []    # a list of strings where each string is a guess, ex. ["1234", "1256", "3344"]
-        self.__responses = []  # a list of tuples where each tuple is the response to a guess
-                               # ex. (2, 1) means that two pegs are the correct colour and position,
-                               # and one peg is the correct colour but incorrect position
+class DecodingBoard:
+    # a board only holds these attributes and no __dict__, so millions of boards can be kept in memory
+    __slots__ = ("__code_space", "__moves")
+
+    def __init__(self, pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS):
+        """
+        Constructor method for the parts of a decoding board that do not depend on how it chooses its responses,
+        see Board and AdversarialBoard (adversarial_board.py)
+        :param pegs: the number of pegs in a code
+        :param colours: the number of colours a peg can be
+        """
+        self.__code_space = get_code_space(pegs, colours)  # shared by every board with these pegs and colours
+        # an array with guess * number_of_responses + response for each guess, using the fewest bytes that fit,
+        # ex. with four pegs and six colours 724 is the guess 51 ("1234") and the response 10, which is (2, 1)
+        # meaning that two pegs are the correct colour and position, and one peg is the correct colour but incorrect
+        # position
+        self.__moves = array(smallest_typecode(self.__code_space.number_of_codes *
+                                               self.__code_space.number_of_responses - 1))
 
     @property
-    def code(self):
-        return self.__code
+    def code_space(self):
+        return self.__code_space
+
+    @property
+    def pegs(self):
+        return self.__code_space.pegs
+
+    @property
+    def colours(self):
+        return self.__code_space.colours
 
     @property
     def max_guesses(self):
-        return self.__max_guesses
+        return MAX_GUESSES
+
+    @property
+    def number_of_guesses(self):
+        return len(self.__moves)
 
     @property
     def solved(self):
-        return self.__solved
+        return len(self.__moves) > 0 and \
+            self.__moves[-1] % self.__code_space.number_of_responses == self.__code_space.winning_response
+
+    @property
+    def game_over(self):
+        return self.solved or len(self.__moves) >= MAX_GUESSES
 
     @property
     def guesses(self):
-        return self.__guesses
+        return [self.__code_space.index_to_code(g) for g in self.guess_indexes]
 
     @property
     def responses(self):
-        return self.__responses
+        return [self.__code_space.index_to_response(r) for r in self.response_indexes]
+
+    @property
+    def guess_indexes(self):
+        number_of_responses = self.__code_space.number_of_responses
+        return [m // number_of_responses for m in self.__moves]
+
+    @property
+    def response_indexes(self):
+        number_of_responses = self.__code_space.number_of_responses
+        return [m % number_of_responses for m in self.__moves]
 
     def add_guess(self, guess):
         """
         Add a guess for the code, and add a response
-        :param guess: a string of a four-digit number representing a guess
-        :precond: is_valid_code(guess)
-        :precond: len(self.__guesses) < self.__max_guesses and not self.__solved
-        :postcond: guess is added to guesses, and a response for the guess is added to responses
+        :param guess: a string representing a guess, or the guess's index
+        :precond: is_valid_code(guess, pegs, colours)
+        :precond: len(self.__moves) < MAX_GUESSES and not self.solved
+        :postcond: guess is added to guesses, and the response from answer_guess() is added to responses
                    unless the preconditions are not met
         """
-        if not self.is_valid_code(guess):
+        if not self.__code_space.is_valid_code(guess):
             raise Exception("Cannot add guess because the guess is not valid.")
-        elif len(self.__guesses) < self.__max_guesses and not self.__solved:
-            self.__guesses.append(guess)
-            resp = self.create_response(guess)
-            self.__responses.append(resp)
-            if resp == (4, 0):
-                self.__solved = True
-            else:
-                pass
+        elif len(self.__moves) < MAX_GUESSES and not self.solved:
+            guess = self.__code_space.code_to_index(guess)
+            self.__moves.append(guess * self.__code_space.number_of_responses + self.answer_guess(guess))
         else:
             pass
 
-    def create_response(self, guess):
+    def add_guesses(self, guesses):
         """
-        Create a response based on the guess
-        :param guess: a string of a four-digit number representing a guess
-        :precond: guess should be a four-digit number where each digit can be 1, 2, 3, 4, 5, or 6, add_guess() would have already checked this
-        :return: a tuple representing a response
+        Add many guesses at once, ex. to replay the guesses of a game that was saved.
+        Every guess is checked before any are added.
+        :param guesses: an iterable of strings representing guesses, or of the guesses' indexes, ex. a list
+        :precond: is_valid_code(guess, pegs, colours) for every guess in guesses
+        :postcond: the guesses are added in order along with their responses, the same as calling add_guess() on
+                   each one, so guesses after the code is broken or after the last guess is used up are not added
         """
-        correct_colour_and_position = 0
-        correct_colour_wrong_position = 0
-        code_peg_taken = [False] * 4   # list to keep track of which pegs in the code are taken by a peg in the guess
-        guess_peg_taken = [False] * 4  # list to keep track of which pegs in the guess are taken by a peg in the code
-
-        # check for correct colour and position
-        for i in range(4):
-            if guess[i] == self.__code[i]:
-                correct_colour_and_position += 1
-                code_peg_taken[i] = True
-                guess_peg_taken[i] = True
-            else:
-                pass
+        for guess in self.check_guesses(guesses):
+            self.add_guess(guess)
 
-        # check correct colour wrong position
-        for j in range(4):
-            if not guess_peg_taken[j]:
-                for k in range(4):
-                    if j != k:
-                        if guess[j] == self.__code[k] and not code_peg_taken[k]:
-                            correct_colour_wrong_position += 1
-                            code_peg_taken[k] = True
-                            guess_peg_taken[j] = True
-                            break
-                    else:
-                        pass
+    def check_guesses(self, guesses):
+        """
+        Check every guess before any are added by add_guesses()
+        :param guesses: an iterable of strings representing guesses, or of the guesses' indexes
+        :return: a list of the guesses, so an iterable that can only be gone through once can still be added
+        """
+        guesses = list(guesses)
+        for guess in guesses:
+            if not self.__code_space.is_valid_code(guess):
+                raise Exception("Cannot add guesses because " + str(guess) + " is not a valid guess.")
             else:
                 pass
+        return guesses
 
-        return (correct_colour_and_position, correct_colour_wrong_position)
+    def extend_moves(self, guesses, resps):
+        """
+        Add guesses that have already been checked along with their responses
+        :param guesses: a list of the indexes of the guesses
+        :param resps: a list of the indexes of the responses, in the same order as guesses
+        :precond: the guesses fit in the guesses that are left, and only the last one can get the winning response
+        """
+        number_of_responses = self.__code_space.number_of_responses
+        self.__moves.extend(guesses[i] * number_of_responses + resps[i] for i in range(len(guesses)))
 
-    def __repr__(self):
+    def answer_guess(self, guess):
         """
-        Make a representation of the decoding board that looks exactly like
-        the way one would make it in code
-        :return: a string representation of the code necessary to make the decoding board
+        Work out the response to a guess that is being added, this is overridden by each kind of board
+        :param guess: the index of the guess
+        :return: the index of the response
         """
-        return f"{self.__class__.__name__}(\"{self.__code}\")"
+        raise Exception("Cannot answer the guess, " + self.__class__.__name__ + " does not say how to answer one.")
+
+    def create_response(self, guess):
+        """
+        Create a response based on the guess, without adding the guess
+        :param guess: a string representing a guess, or the guess's index
+        :precond: guess should be a valid code for this board, add_guess() would have already checked this
+        :return: a tuple representing a response
+        """
+        return self.__code_space.index_to_response(self.create_response_index(guess))
 
     def __str__(self):
         """
@@ -142,45 +199,122 @@ class Board:
         st = ""
 
         # print guesses and results
-        for i in range(len(self.__guesses)):
-            st += self.__guesses[i]
+        guesses = self.guesses
+        responses = self.responses
+        for i in range(len(guesses)):
+            st += guesses[i]
             st += " | "
-            st += str(self.__responses[i])
+            st += str(responses[i])
             st += "\n"
 
         # print blank lines
-        blank_lines = self.__max_guesses - len(self.__guesses)
+        blank_lines = MAX_GUESSES - len(guesses)
         for j in range(blank_lines):
-            st += "     |\n"
-        st += "-----+\n"
+            st += " " * (self.pegs + 1) + "|\n"
+        st += "-" * (self.pegs + 1) + "+\n"
 
         # print code if the puzzle is solved or if all guesses are used up
-        if blank_lines == 0 or self.__solved:
-            st += self.__code
+        if self.game_over:
+            st += self.code
         else:
-            st += "????"
+            st += "?" * self.pegs
         st += "\n"
         return st
 
     @staticmethod
-    def is_valid_code(code):
+    def is_valid_code(code, pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS):
         """
         Determine whether the parameter code is a valid code.
-        A code should be a four-digit number where each digit can be 1, 2, 3, 4, 5, or 6,
-        ex. "1246" is allowed, but "2024" is not
-        :param code: a string representing a code to check
+        With four pegs and six colours, a code should be a four-digit number where each digit can be 1, 2, 3, 4, 5,
+        or 6, ex. "1246" is allowed, but "2024" is not.
+        A code can also be given as its index, which is valid if it is from 0 to 1295.
+        :param code: a string representing a code to check, or an integer representing a code's index
+        :param pegs: the number of pegs in a code
+        :param colours: the number of colours a peg can be
         :return: True if the code is valid, False otherwise
         """
-        if len(code) != 4:
-            return False
+        return get_code_space(pegs, colours).is_valid_code(code)
+
+
+class Board(DecodingBoard):
+    # like every decoding board, a board only holds its slots and no __dict__
+    __slots__ = ("__code",)
+
+    def __init__(self, code, pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS):
+        """
+        Constructor method for the decoding board
+        :param code: a string with one character for each peg representing the code to break, or the code's index
+        :param pegs: the number of pegs in a code
+        :param colours: the number of colours a peg can be
+        :precond: is_valid_code(code, pegs, colours)
+        """
+        if not self.is_valid_code(code, pegs, colours):
+            raise Exception("Cannot make Board, code is not valid.")
+        else:
+            pass
+
+        super().__init__(pegs, colours)
+        self.__code = self.code_space.code_to_index(code)
+
+    @property
+    def code(self):
+        return self.code_space.index_to_code(self.__code)
+
+    @property
+    def code_index(self):
+        return self.__code
+
+    def add_guesses(self, guesses):
+        """
+        Add many guesses at once, see DecodingBoard.add_guesses(), with all of the responses worked out in one pass
+        :param guesses: an iterable of strings representing guesses, or of the guesses' indexes, ex. a list
+        :precond: is_valid_code(guess, pegs, colours) for every guess in guesses
+        :postcond: the guesses are added in order along with their responses, the same as calling add_guess() on
+                   each one, so guesses after the code is broken or after the last guess is used up are not added
+        """
+        guesses = self.check_guesses(guesses)
+        if self.solved:
+            return
+        else:
+            pass
+        code_space = self.code_space
+        guesses = [code_space.code_to_index(g) for g in guesses[:MAX_GUESSES - self.number_of_guesses]]
+        # a response does not change when the code and the guess are swapped, so the code stands in as the guess
+        resps = code_space.response_indexes(self.__code, guesses)
+        if code_space.winning_response in resps:
+            guesses = guesses[:resps.index(code_space.winning_response) + 1]
+            resps = resps[:len(guesses)]
+        else:
+            pass
+        self.extend_moves(guesses, resps)
+
+    def answer_guess(self, guess):
+        """
+        Work out the response to a guess that is being added, see create_response_index()
+        :param guess: the index of the guess
+        :return: the index of the response
+        """
+        return self.create_response_index(guess)
+
+    def create_response_index(self, guess):
+        """
+        Create a response based on the guess, without turning the response into a tuple
+        :param guess: a string representing a guess, or the guess's index
+        :precond: guess should be a valid code for this board, add_guess() would have already checked this
+        :return: the index of the response in the code space's responses (see codes.py)
+        """
+        return self.code_space.response_index(self.__code, self.code_space.code_to_index(guess))
+
+    def __repr__(self):
+        """
+        Make a representation of the decoding board that looks exactly like
+        the way one would make it in code
+        :return: a string representation of the code necessary to make the decoding board
+        """
+        if self.pegs == DEFAULT_PEGS and self.colours == DEFAULT_COLOURS:
+            return f"{self.__class__.__name__}(\"{self.code}\")"
         else:
-            valid_characters = ["1", "2", "3", "4", "5", "6"]
-            for char in code:
-                if char not in valid_characters:
-                    return False
-                else:
-                    pass
-        return True
+            return f"{self.__class__.__name__}(\"{self.code}\", pegs={self.pegs}, colours={self.colours})"
 
 
 if __name__ == '__main__':
@@ -197,7 +331,15 @@ if __name__ == '__main__':
         else:
             pass
 
-    invalid_codes = ["111", "11111", "0000", "7777", "2024", "abcd"]
+    valid_indexes = [0, 7, 51, 1295]
+    for vi in valid_indexes:
+        if not Board.is_valid_code(vi):
+            print("Error: is_valid_code() returned False for a valid code index.")
+            errors += 1
+        else:
+            pass
+
+    invalid_codes = ["111", "11111", "0000", "7777", "2024", "abcd", -1, 1296]
     for ic in invalid_codes:
         if Board.is_valid_code(ic):
             print("Error: is_valid_code() returned True for an invalid code.")
@@ -225,6 +367,17 @@ if __name__ == '__main__':
         print("Error: __init__() threw an exception for a valid code.")
         errors += 1
 
+    try:
+        index_board = Board(51)
+        if index_board.code != "1234" or index_board.create_response("1523") != (1, 2):
+            print("Error: __init__() did not make the same board for a code index.")
+            errors += 1
+        else:
+            pass
+    except:
+        print("Error: __init__() threw an exception for a valid code index.")
+        errors += 1
+
     try:
         invalid_board = Board("0")
         print("Error: __init__() did not throw an exception for invalid code.")
@@ -232,6 +385,65 @@ if __name__ == '__main__':
     except:
         pass
 
+    # test boards with other numbers of pegs and colours
+    if not Board.is_valid_code("12378", 5, 8) or Board.is_valid_code("12379", 5, 8) or \
+            Board.is_valid_code("1234", 5, 8) or not Board.is_valid_code(32767, 5, 8):
+        print("Error: is_valid_code() was wrong for a code with 5 pegs and 8 colours.")
+        errors += 1
+    else:
+        pass
+    big_board = Board("123456", pegs=6, colours=9)
+    big_board.add_guess("654321")
+    big_board.add_guess("123999")
+    if big_board.responses != [(0, 6), (3, 0)] or big_board.solved:
+        print("Error: the board with 6 pegs and 9 colours gave the wrong responses.")
+        errors += 1
+    else:
+        pass
+    print(repr(big_board))
+    print(big_board)
+
+    # test add_guesses(), which should add the same guesses and responses as calling add_guess() on each one
+    replay_guesses = ["1122", "1344", "3526", "1462", "1234", "4321"]
+    replay_board = Board("1234")
+    replay_board.add_guesses(replay_guesses)
+    one_at_a_time_board = Board("1234")
+    for rg in replay_guesses:
+        one_at_a_time_board.add_guess(rg)
+    if replay_board.guesses != one_at_a_time_board.guesses or replay_board.responses != \
+            one_at_a_time_board.responses or not replay_board.solved or len(replay_board.guesses) != 5:
+        print("Error: add_guesses() did not add the same guesses as add_guess().")
+        errors += 1
+    else:
+        pass
+    try:
+        Board("1234").add_guesses(["1122", "7777"])
+        print("Error: add_guesses() did not throw an exception for an invalid guess.")
+        errors += 1
+    except:
+        pass
+    long_board = Board("6666")
+    long_board.add_guesses(["1111"] * 12)
+    if len(long_board.guesses) != long_board.max_guesses:
+        print("Error: add_guesses() added more guesses than max_guesses.")
+        errors += 1
+    else:
+        pass
+    generator_board = Board("1234")
+    generator_board.add_guesses(g for g in ["1111", "2222"])
+    if generator_board.guesses != ["1111", "2222"]:
+        print("Error: add_guesses() did not add the guesses from a generator.")
+        errors += 1
+    else:
+        pass
+
+    # a board should not have a __dict__
+    if hasattr(replay_board, "__dict__"):
+        print("Error: the board is not stored compactly.")
+        errors += 1
+    else:
+        pass
+
     print("First board")
     test_board = Board("1234")
 
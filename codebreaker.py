@@ -0,0 +1,212 @@
+"""
+Code Written by Jackson L. Davis
+
+This class is for the parts of a computer codebreaker that do not depend on how it searches for guesses.
+A codebreaker plays one move at a time: propose() chooses the next guess and observe() takes the response to it.
+play() does the same as a generator, and solve() plays against a board until the code is broken or the guesses are
+used up. Each move is timed and recorded in the codebreaker's SolverStats object if it has one (see solver_stats.py).
+
+A codebreaker only has to say how it chooses a guess and what it does with a response that does not break the code,
+by overriding choose_guess() and take_response(), see ComputerPlayer (computer_player.py) and GeneticPlayer
+(genetic_player.py).
+"""
+
+from codes import DEFAULT_PEGS, DEFAULT_COLOURS, get_code_space
+import time as time
+
+
+class Codebreaker:
+
+    def __init__(self, board, pegs=None, colours=None, stats=None):
+        """
+        Constructor method for the codebreaker
+        :param board: a decoding board that the codebreaker sends guesses to,
+                      or None if the codebreaker is only used to work out guesses
+        :param pegs: the number of pegs in a code, or None to use the board's (four if there is no board)
+        :param colours: the number of colours a peg can be, or None to use the board's (six if there is no board)
+        :param stats: a SolverStats object (see solver_stats.py) to record statistics in, or None
+        """
+        if pegs is None:
+            pegs = DEFAULT_PEGS if board is None else board.pegs
+        else:
+            pass
+        if colours is None:
+            colours = DEFAULT_COLOURS if board is None else board.colours
+        else:
+            pass
+        if board is not None and (board.pegs, board.colours) != (pegs, colours):
+            raise Exception("Cannot make " + self.__class__.__name__ + ", pegs and colours do not match the board.")
+        else:
+            pass
+
+        self.__board = board
+        self.__code_space = get_code_space(pegs, colours)
+        self.__stats = stats
+        self.__solved = False          # True once the winning response has been observed
+        self.__proposed_guess = None   # the guess from propose() that is waiting for a response, or None
+        self.__move_start_time = None  # the time.perf_counter() time the current move started, if there are stats
+
+    @property
+    def board(self):
+        return self.__board
+
+    @property
+    def code_space(self):
+        return self.__code_space
+
+    @property
+    def stats(self):
+        return self.__stats
+
+    @property
+    def solved(self):
+        return self.__solved
+
+    def solve(self, verbose=True):
+        """
+        Break the code on the board.
+        solve() is built on propose() and observe(), so the board is the only thing that gives responses.
+        Note that solve() and the methods it uses do not access self.__board.code at any point.
+        :param verbose: True if each guess and response should be printed
+        :postcond: if verbose, each guess and response is printed to the console
+        :return: the amount of time it took the codebreaker to break the code
+        """
+        start_time = time.time()
+        while not self.__board.solved and len(self.__board.guess_indexes) < self.__board.max_guesses:
+            guess = self.propose()
+            self.__board.add_guess(guess)
+            resp = self.__board.response_indexes[-1]
+            if verbose:
+                print(self.__code_space.index_to_code(guess) + " | " +
+                      str(self.__code_space.index_to_response(resp)))
+            else:
+                pass
+            self.observe(resp)
+        end_time = time.time()
+        return end_time - start_time
+
+    def play(self):
+        """
+        Break a code one guess at a time, without a board.
+        This is a generator that yields the index of each guess and is sent the response to it, as a tuple or an
+        index, ex. guess = next(game) for the first guess, then guess = game.send((1, 2)) for each guess after that.
+        It stops once it is sent the winning response.
+        :return: a generator of the indexes of the guesses
+        """
+        while not self.__solved:
+            resp = yield self.propose()
+            self.observe(resp)
+
+    def propose(self):
+        """
+        Choose the next guess without making it, see choose_guess().
+        Calling propose() again before observe() gives the same guess without searching again.
+        :precond: the code has not been broken yet
+        :return: the index of the next guess
+        """
+        if self.__proposed_guess is not None:
+            return self.__proposed_guess
+        elif self.__solved:
+            raise Exception("Cannot propose a guess, the code has already been broken.")
+        else:
+            pass
+        if self.__stats is not None:
+            self.__move_start_time = time.perf_counter()
+        else:
+            pass
+        self.__proposed_guess = self.choose_guess()
+        return self.__proposed_guess
+
+    def observe(self, resp):
+        """
+        Take the response to the guess from propose() into account
+        :param resp: the response to the guess, as a tuple, ex. (1, 2), or as an index
+        :precond: propose() has been called since the last call to observe()
+        :postcond: the response is passed to take_response(), or the code is broken if resp is the winning response
+        """
+        if self.__proposed_guess is None:
+            raise Exception("Cannot observe a response, no guess has been proposed.")
+        else:
+            pass
+        guess = self.__proposed_guess
+        resp = self.__code_space.response_to_index(resp)
+        self.__proposed_guess = None
+        if resp == self.__code_space.winning_response:
+            self.__solved = True
+        else:
+            self.take_response(guess, resp)
+        self.record_move(guess, resp)
+
+    def record_move(self, guess, resp):
+        """
+        Send the statistics for a move to self.__stats, if the codebreaker has a SolverStats object
+        :param guess: the index of the code that was guessed
+        :param resp: the index of the response to guess
+        """
+        if self.__stats is not None:
+            self.__stats.record_move(self.__code_space.index_to_code(guess), self.__code_space.index_to_response(resp),
+                                     time.perf_counter() - self.__move_start_time)
+        else:
+            pass
+
+    def choose_guess(self):
+        """
+        Work out the next guess, this is overridden by each kind of codebreaker
+        :return: the index of the next guess
+        """
+        raise Exception("Cannot choose a guess, " + self.__class__.__name__ + " does not say how to choose one.")
+
+    def take_response(self, guess, resp):
+        """
+        Take a response that does not break the code into account, this is overridden by each kind of codebreaker
+        :param guess: the index of the code that was guessed
+        :param resp: the index of the response to guess
+        """
+        raise Exception("Cannot take the response, " + self.__class__.__name__ + " does not say how to take one.")
+
+
+if __name__ == '__main__':
+    from board import Board
+    from computer_player import ComputerPlayer
+    from genetic_player import GeneticPlayer
+
+    print("Testing codebreaker.py")
+    errors = 0
+
+    # a codebreaker that does not say how to choose a guess cannot propose one
+    try:
+        Codebreaker(None).propose()
+        print("Error: a Codebreaker proposed a guess without choose_guess().")
+        errors += 1
+    except:
+        pass
+
+    # every kind of codebreaker should break the code with the same loop, and refuse moves out of order
+    for test_player in [ComputerPlayer(Board("6543")), GeneticPlayer(Board("6543"), seed=1)]:
+        player_name = test_player.__class__.__name__
+        try:
+            test_player.observe((0, 0))
+            print("Error: " + player_name + " observed a response before proposing a guess.")
+            errors += 1
+        except:
+            pass
+        test_player.solve(verbose=False)
+        if not test_player.solved or not test_player.board.solved:
+            print("Error: " + player_name + " did not break the code.")
+            errors += 1
+        else:
+            pass
+        try:
+            test_player.propose()
+            print("Error: " + player_name + " proposed a guess after the code was broken.")
+            errors += 1
+        except:
+            pass
+    try:
+        ComputerPlayer(Board("12345", 5, 7), pegs=4)
+        print("Error: a computer player was made with pegs that do not match the board.")
+        errors += 1
+    except:
+        pass
+
+    print("Finished testing with " + str(errors) + " errors.")
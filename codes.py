@@ -0,0 +1,427 @@
+"""
+Code Written by Jackson L. Davis
+
+This class is for a code space, which is every code that can be made with a certain number of pegs and colours,
+along with every response that can be given. The standard game has four pegs and six colours, which makes 1296 codes.
+The code space turns codes and responses into small integers and back again. Board and ComputerPlayer use the
+integers everywhere, strings and tuples are only used for input and output.
+
+A code is written with one character for each peg, the colours are written 1, 2, ..., 9, A, B, ... in that order.
+A code is stored as its index, which is the code read as a base-(number of colours) number after taking one away
+from each colour, ex. with four pegs and six colours "1111" is 0, "1122" is 7, and "6666" is 1295. Indexes are in
+the same order as the numeric value of the codes, so the code with the least numeric value is the code with the
+least index.
+
+A response is stored as its index in the code space's list of responses, which is every (black, white) pair
+that can be given in order, ex. with four pegs (0, 0) is 0, (1, 2) is 7, and (4, 0) is 13.
+
+A code space is made once for each number of pegs and colours and shared by everything in the process (see
+get_code_space()). Making one is quick, since its tables of digits and colour counts and its bitset of every code
+are only worked out the first time they are needed, and everything it holds is a tuple or an integer, so it is never
+changed after it is made. A computer player only keeps bitsets of codes over the shared code space, not lists of
+codes.
+
+A set of codes is stored as a bitset, which is an integer where bit i is 1 if the code with index i is in the set,
+ex. the set {"1111", "1113"} is 0b101. Bitsets make taking a set apart quick: the codes in both of two sets are
+found with &, and the number of codes in a set is found with int.bit_count().
+"""
+
+import operator
+
+DEFAULT_PEGS = 4
+DEFAULT_COLOURS = 6
+COLOUR_SYMBOLS = "123456789ABCDEF"
+# the digits and colour counts of every code are worked out ahead of time if there are at most this many codes,
+# for bigger code spaces they are put together from the digits and colour counts of the two halves of the code
+MAX_DIGIT_TABLE_CODES = 65536
+
+
+class CodeSpace:
+
+    def __init__(self, pegs, colours):
+        """
+        Constructor method for the code space
+        :param pegs: the number of pegs in a code
+        :param colours: the number of colours a peg can be
+        :precond: pegs >= 1 and 2 <= colours <= len(COLOUR_SYMBOLS)
+        """
+        if pegs < 1 or colours < 2 or colours > len(COLOUR_SYMBOLS):
+            raise Exception("Cannot make CodeSpace, there must be at least one peg and from 2 to " +
+                            str(len(COLOUR_SYMBOLS)) + " colours.")
+        else:
+            pass
+
+        self.__pegs = pegs
+        self.__colours = colours
+        self.__number_of_codes = colours ** pegs
+        self.__all_codes_mask = None  # a bitset of every code, only made the first time it is needed
+        self.__symbols = COLOUR_SYMBOLS[:colours]
+
+        # every response that can be given, (pegs - 1, 1) cannot happen since the last peg would have to be in the
+        # right place if it is the right colour
+        self.__responses = tuple((black, white) for black in range(pegs + 1) for white in range(pegs + 1 - black)
+                                 if (black, white) != (pegs - 1, 1))
+        self.__response_indexes = {resp: index for index, resp in enumerate(self.__responses)}
+        # self.__response_grid[black][white] is the index of the response (black, white)
+        self.__response_grid = tuple(tuple(self.__response_indexes.get((black, white)) for white in range(pegs + 1))
+                                     for black in range(pegs + 1))
+        self.__winning_response = self.__response_indexes[(pegs, 0)]
+
+        # the tables of digits and colour counts are only worked out the first time they are needed,
+        # see build_digit_tables()
+        self.__code_digits = None
+        self.__code_colour_counts = None
+        self.__half_size = None
+
+        # the first guess is like Donald Knuth's "1122", two pegs of each colour in order, ex. "11223" for five pegs
+        self.__first_guess = 0
+        for i in range(pegs):
+            self.__first_guess = self.__first_guess * colours + min(i // 2, colours - 1)
+
+    @property
+    def pegs(self):
+        return self.__pegs
+
+    @property
+    def colours(self):
+        return self.__colours
+
+    @property
+    def number_of_codes(self):
+        return self.__number_of_codes
+
+    @property
+    def all_codes_mask(self):
+        # with eight pegs and ten colours this bitset takes 12.5 MB, so it is only made for code spaces that use it
+        if self.__all_codes_mask is None:
+            self.__all_codes_mask = (1 << self.__number_of_codes) - 1
+        else:
+            pass
+        return self.__all_codes_mask
+
+    @property
+    def responses(self):
+        return self.__responses
+
+    @property
+    def number_of_responses(self):
+        return len(self.__responses)
+
+    @property
+    def winning_response(self):
+        return self.__winning_response
+
+    @property
+    def first_guess(self):
+        return self.__first_guess
+
+    def is_valid_code(self, code):
+        """
+        Determine whether the parameter code is a valid code in this code space.
+        A code should be a string with one character for each peg, where each character is one of the colours,
+        ex. with four pegs and six colours "1246" is allowed, but "2024" is not.
+        A code can also be given as its index, which is valid if it is from 0 to one less than the number of codes.
+        :param code: a string representing a code to check, or an integer representing a code's index
+        :return: True if the code is valid, False otherwise
+        """
+        if isinstance(code, int):
+            return 0 <= code < self.__number_of_codes
+        elif not isinstance(code, str) or len(code) != self.__pegs:
+            return False
+        else:
+            for char in code:
+                if char not in self.__symbols:
+                    return False
+                else:
+                    pass
+        return True
+
+    def code_to_index(self, code):
+        """
+        Turn a code into an integer
+        :param code: a string representing a code, or a code that is already an integer
+        :precond: is_valid_code(code)
+        :return: the index of the code
+        """
+        if isinstance(code, int):
+            return code
+        else:
+            index = 0
+            for char in code:
+                index = index * self.__colours + self.__symbols.index(char)
+            return index
+
+    def index_to_code(self, index):
+        """
+        Turn an integer back into a code
+        :param index: the index of a code
+        :return: a string representing the code
+        """
+        return "".join(self.__symbols[digit] for digit in self.digits(index))
+
+    def response_to_index(self, resp):
+        """
+        Turn a response into an integer
+        :param resp: a tuple representing a response, or a response that is already an integer
+        :return: the index of the response
+        """
+        if isinstance(resp, int):
+            return resp
+        else:
+            return self.__response_indexes[resp]
+
+    def index_to_response(self, index):
+        """
+        Turn an integer back into a response
+        :param index: the index of a response
+        :return: a tuple representing the response
+        """
+        return self.__responses[index]
+
+    def work_out_digits(self, code, pegs):
+        """
+        Work out the colour of each peg of a code
+        :param code: the index of a code
+        :param pegs: the number of pegs to work out, starting from the last peg
+        :return: a tuple of the colour of each peg, where the colours are numbered from 0
+        """
+        digits = [0] * pegs
+        for i in range(pegs - 1, -1, -1):
+            code, digits[i] = divmod(code, self.__colours)
+        return tuple(digits)
+
+    def digits_to_index(self, digits):
+        """
+        Turn the colour of each peg of a code back into the code's index, this is the opposite of digits()
+        :param digits: a list or tuple of the colour of each peg, where the colours are numbered from 0
+        :return: the index of the code
+        """
+        index = 0
+        for digit in digits:
+            index = index * self.__colours + digit
+        return index
+
+    def build_digit_tables(self):
+        """
+        Work out the colour of each peg of each code (from 0), and the number of pegs of each colour in each code.
+        For code spaces with more than MAX_DIGIT_TABLE_CODES codes, the same tables are worked out for the first half
+        and the last half of the pegs instead. The tables are tuples, so they can be shared by everything that uses
+        the code space.
+        :postcond: the tables are made, and digits() and colour_counts() can look codes up in them
+        """
+        pegs = self.__pegs
+        colours = self.__colours
+        if self.__number_of_codes <= MAX_DIGIT_TABLE_CODES:
+            code_digits = tuple(self.work_out_digits(code, pegs) for code in range(self.__number_of_codes))
+            self.__code_colour_counts = tuple(tuple(digits.count(colour) for colour in range(colours))
+                                              for digits in code_digits)
+            self.__code_digits = code_digits
+        else:
+            half_size = colours ** ((pegs + 1) // 2)  # the number of ways to colour the last half
+            self.__first_half_digits = tuple(self.work_out_digits(code, pegs // 2)
+                                             for code in range(colours ** (pegs // 2)))
+            self.__last_half_digits = tuple(self.work_out_digits(code, (pegs + 1) // 2) for code in range(half_size))
+            self.__first_half_colour_counts = tuple(tuple(digits.count(colour) for colour in range(colours))
+                                                    for digits in self.__first_half_digits)
+            self.__last_half_colour_counts = tuple(tuple(digits.count(colour) for colour in range(colours))
+                                                   for digits in self.__last_half_digits)
+            self.__half_size = half_size
+
+    def digits(self, code):
+        """
+        Get the colour of each peg of a code
+        :param code: the index of a code
+        :return: a tuple of the colour of each peg, where the colours are numbered from 0
+        """
+        if self.__code_digits is not None:
+            return self.__code_digits[code]
+        elif self.__half_size is not None:
+            first_half, last_half = divmod(code, self.__half_size)
+            return self.__first_half_digits[first_half] + self.__last_half_digits[last_half]
+        else:
+            self.build_digit_tables()
+            return self.digits(code)
+
+    def colour_counts(self, code):
+        """
+        Get the number of pegs of each colour in a code
+        :param code: the index of a code
+        :return: a tuple where item c is the number of pegs with colour c
+        """
+        if self.__code_colour_counts is not None:
+            return self.__code_colour_counts[code]
+        elif self.__half_size is not None:
+            first_half, last_half = divmod(code, self.__half_size)
+            return tuple(map(operator.add, self.__first_half_colour_counts[first_half],
+                             self.__last_half_colour_counts[last_half]))
+        else:
+            self.build_digit_tables()
+            return self.colour_counts(code)
+
+    def response_index(self, code, guess):
+        """
+        Work out the response for a guess.
+        The number of pegs with the correct colour and position is found by comparing each position,
+        the number of pegs with the correct colour is the sum over every colour of the smaller of the number of times
+        the colour is in the code and the number of times it is in the guess.
+        :param code: the index of a code
+        :param guess: the index of a guess for code
+        :return: the index of the response
+        """
+        correct_colour_and_position = 0
+        for code_digit, guess_digit in zip(self.digits(code), self.digits(guess)):
+            if code_digit == guess_digit:
+                correct_colour_and_position += 1
+            else:
+                pass
+        correct_colour = sum(map(min, self.colour_counts(code), self.colour_counts(guess)))
+        return self.__response_grid[correct_colour_and_position][correct_colour - correct_colour_and_position]
+
+    def response_indexes(self, guess, codes):
+        """
+        Work out the responses for one guess and many codes.
+        This uses the same counting as response_index(), but the guess is only looked up once.
+        :param guess: the index of a guess
+        :param codes: a list of code indexes that each stand in as the code
+        :return: a list of the indexes of the responses, in the same order as codes
+        """
+        guess_digits = self.digits(guess)
+        guess_colour_counts = self.colour_counts(guess)
+        response_grid = self.__response_grid
+        resp_indexes = []
+        for code in codes:
+            correct_colour_and_position = 0
+            for code_digit, guess_digit in zip(self.digits(code), guess_digits):
+                if code_digit == guess_digit:
+                    correct_colour_and_position += 1
+                else:
+                    pass
+            correct_colour = sum(map(min, self.colour_counts(code), guess_colour_counts))
+            correct_colour_only = correct_colour - correct_colour_and_position
+            resp_indexes.append(response_grid[correct_colour_and_position][correct_colour_only])
+        return resp_indexes
+
+
+_code_spaces = {}  # code spaces that have been made, by (pegs, colours)
+
+
+def get_code_space(pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS):
+    """
+    Get the code space for a number of pegs and colours, which is shared by everything in this process
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :return: the code space
+    """
+    if (pegs, colours) not in _code_spaces:
+        _code_spaces[(pegs, colours)] = CodeSpace(pegs, colours)
+    else:
+        pass
+    return _code_spaces[(pegs, colours)]
+
+
+def codes_to_mask(codes):
+    """
+    Make a bitset from a list of codes.
+    The bits are set in a bytearray and turned into an integer at the end, so this takes time in proportion to
+    the number of codes even for very big code spaces.
+    :param codes: a list of code indexes
+    :return: the bitset of the codes
+    """
+    bits = bytearray()
+    for code in codes:
+        byte = code >> 3
+        if byte >= len(bits):
+            bits.extend(bytes(byte + 1 - len(bits)))
+        else:
+            pass
+        bits[byte] |= 1 << (code & 7)
+    return int.from_bytes(bits, "little")
+
+
+def mask_to_codes(mask):
+    """
+    Make a list of the codes in a bitset
+    :param mask: a bitset of codes
+    :return: a list of the indexes of the codes in mask, in numeric order
+    """
+    bits = bin(mask)[:1:-1]  # the bits of mask from bit 0 upwards, without the "0b"
+    codes = []
+    code = bits.find("1")
+    while code != -1:
+        codes.append(code)
+        code = bits.find("1", code + 1)
+    return codes
+
+
+if __name__ == '__main__':
+    print("Testing codes.py")
+    errors = 0
+
+    standard_space = get_code_space()
+    if standard_space.number_of_codes != 1296 or standard_space.number_of_responses != 14:
+        print("Error: the standard code space has the wrong number of codes or responses.")
+        errors += 1
+    else:
+        pass
+    if standard_space.index_to_code(standard_space.first_guess) != "1122":
+        print("Error: the first guess for the standard code space is not 1122.")
+        errors += 1
+    else:
+        pass
+    for test_code, test_index in [("1111", 0), ("1122", 7), ("1234", 51), ("6666", 1295)]:
+        if standard_space.code_to_index(test_code) != test_index or \
+                standard_space.index_to_code(test_index) != test_code:
+            print("Error: " + test_code + " was not turned into " + str(test_index) + " and back.")
+            errors += 1
+        else:
+            pass
+
+    # bigger code spaces work out digits when they are needed, which should give the same responses
+    big_space = get_code_space(6, 9)
+    if big_space.number_of_codes != 531441 or big_space.index_to_code(big_space.first_guess) != "112233":
+        print("Error: the 6 peg 9 colour code space is not set up correctly.")
+        errors += 1
+    else:
+        pass
+    test_pairs = [("123456", "654321", (0, 6)), ("999999", "999999", (6, 0)), ("112233", "123789", (1, 2)),
+                  ("918273", "981723", (2, 4))]
+    for test_code, test_guess, test_response in test_pairs:
+        resp = big_space.response_index(big_space.code_to_index(test_code), big_space.code_to_index(test_guess))
+        if big_space.index_to_response(resp) != test_response:
+            print("Bad response for code " + test_code + " and guess " + test_guess)
+            errors += 1
+        else:
+            pass
+    for test_index in [0, 7, 4242, 531440]:
+        if big_space.digits_to_index(big_space.digits(test_index)) != test_index:
+            print("Error: the digits of " + str(test_index) + " were not turned back into the same index.")
+            errors += 1
+        else:
+            pass
+
+    # making a huge code space should not build anything that is as big as the code space
+    import tracemalloc
+    tracemalloc.start()
+    huge_space = CodeSpace(8, 10)
+    huge_space.is_valid_code("12345678")
+    huge_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if huge_memory > 1000000:
+        print("Error: making a code space with 8 pegs and 10 colours took " + str(huge_memory) + " bytes.")
+        errors += 1
+    else:
+        pass
+    if huge_space.all_codes_mask.bit_count() != 100000000:
+        print("Error: the bitset of every code with 8 pegs and 10 colours is wrong.")
+        errors += 1
+    else:
+        pass
+
+    test_mask = codes_to_mask([0, 2, 1000, 531440])
+    if mask_to_codes(test_mask) != [0, 2, 1000, 531440]:
+        print("Error: codes_to_mask() and mask_to_codes() do not match.")
+        errors += 1
+    else:
+        pass
+
+    print("Finished testing with " + str(errors) + " errors.")
@@ -5,418 +5,796 @@ This class is for a computer player that plays as the codebreaker in the board g
 The computer player will use Donald Knuth's five-guess algorithm to break the code.
 Information about this algorithm can be found here:
 https://en.wikipedia.org/wiki/Mastermind_(board_game)#Worst_case:_Five-guess_algorithm
+
+Since the algorithm always makes the same guess after the same responses, the whole algorithm can also be worked
+out ahead of time as a decision tree (see decision_tree.py). A computer player made with use_decision_tree=True
+plays by walking the tree instead of searching for each guess.
+
+solve() plays against a board, but the computer player can also play one guess at a time without one: propose()
+chooses the next guess and observe() takes the response to it, or play() does the same as a generator. This way the
+responses can come from anywhere, ex. another process, and many games can be played in turns in one thread.
+These are shared with the other computer codebreakers (see codebreaker.py).
+
+Donald Knuth's minimax score is the default way to choose a guess, but a computer player can be made with any of
+the other strategies in strategies.py, ex. ComputerPlayer(board, strategy="entropy").
+Codes that are symmetric to other codes after the guesses made so far are not scored (see symmetry.py).
+
+A computer player made with a time_limit searches in anytime mode: it scores the most promising codes first and
+guesses the best code it has scored when the time for the move runs out, see next_guess().
+
+A SolverStats object (see solver_stats.py) can be attached with stats=SolverStats() to record where the time goes
+during each move. Without one, the computer player does not time or count anything extra.
+
+The computer player can also play with other numbers of pegs and colours (see codes.py). Code spaces that are too
+big for a feedback table are searched without one, and when there are too many (unused code, possible code) pairs to
+score them all, each guess is chosen from a bounded random sample instead, so every guess takes a bounded amount of
+work, ex. with six pegs and nine colours there are 531441 codes. For code spaces that are too big to even keep a
+bitset of every code, ex. with eight pegs and ten colours, see genetic_player.py.
 """
 
 from board import Board
+from codebreaker import Codebreaker
+from codes import DEFAULT_PEGS, DEFAULT_COLOURS, codes_to_mask, get_code_space, mask_to_codes
+from decision_tree import DecisionTree, DecisionTreeFormatError
+from feedback_table import get_feedback_table, get_table_directory
+from guess_cache import GuessCache, make_fingerprint
+from partitions import get_first_guess_buckets, make_buckets
+from strategies import DEFAULT_STRATEGY, get_strategy
+from symmetry import cached_orbit_representatives, orbit_representatives
+from collections import Counter
+import functools
+import os
 import random as rand
 import time as time
 
+FIRST_GUESS = get_code_space().first_guess  # 1122
+KNUTH_TREE_FILE_NAME = "knuth_tree_v1.bin"
+# next_guess() only uses a process pool if it has to score at least this many (unused code, possible code) pairs,
+# below this the work is too small to be worth sending to other processes
+MIN_PARALLEL_PAIRS = 20000
+# the most positions the guess cache that is shared by every computer player in a process can hold
+GUESS_CACHE_SIZE = 4096
+# without a feedback table, next_guess() only scores every unused code against every possible code if there are at
+# most this many pairs, otherwise it scores a sample
+MAX_EXACT_PAIRS = 200000
+# the most codes a sample can score, and the most possible codes they are scored against
+MAX_SAMPLED_GUESSES = 200
+MAX_SAMPLED_CODES = 400
+# in anytime mode, the clock is checked after scoring this many codes
+DEADLINE_CHECK_INTERVAL = 16
 
-class ComputerPlayer:
-    def __init__(self, board):
-        """
-        Constructor method for the computer player
-        :param board: a decoding board that the computer player sends guesses to
-        """
-        self.__board = board
-        self.__unused_codes = ["1111", "1112", "1113", "1114", "1115", "1116",
-                               "1121", "1122", "1123", "1124", "1125", "1126",
-                               "1131", "1132", "1133", "1134", "1135", "1136",
-                               "1141", "1142", "1143", "1144", "1145", "1146",
-                               "1151", "1152", "1153", "1154", "1155", "1156",
-                               "1161", "1162", "1163", "1164", "1165", "1166",
-                               "1211", "1212", "1213", "1214", "1215", "1216",
-                               "1221", "1222", "1223", "1224", "1225", "1226",
-                               "1231", "1232", "1233", "1234", "1235", "1236",
-                               "1241", "1242", "1243", "1244", "1245", "1246",
-                               "1251", "1252", "1253", "1254", "1255", "1256",
-                               "1261", "1262", "1263", "1264", "1265", "1266",
-                               "1311", "1312", "1313", "1314", "1315", "1316",
-                               "1321", "1322", "1323", "1324", "1325", "1326",
-                               "1331", "1332", "1333", "1334", "1335", "1336",
-                               "1341", "1342", "1343", "1344", "1345", "1346",
-                               "1351", "1352", "1353", "1354", "1355", "1356",
-                               "1361", "1362", "1363", "1364", "1365", "1366",
-                               "1411", "1412", "1413", "1414", "1415", "1416",
-                               "1421", "1422", "1423", "1424", "1425", "1426",
-                               "1431", "1432", "1433", "1434", "1435", "1436",
-                               "1441", "1442", "1443", "1444", "1445", "1446",
-                               "1451", "1452", "1453", "1454", "1455", "1456",
-                               "1461", "1462", "1463", "1464", "1465", "1466",
-                               "1511", "1512", "1513", "1514", "1515", "1516",
-                               "1521", "1522", "1523", "1524", "1525", "1526",
-                               "1531", "1532", "1533", "1534", "1535", "1536",
-                               "1541", "1542", "1543", "1544", "1545", "1546",
-                               "1551", "1552", "1553", "1554", "1555", "1556",
-                               "1561", "1562", "1563", "1564", "1565", "1566",
-                               "1611", "1612", "1613", "1614", "1615", "1616",
-                               "1621", "1622", "1623", "1624", "1625", "1626",
-                               "1631", "1632", "1633", "1634", "1635", "1636",
-                               "1641", "1642", "1643", "1644", "1645", "1646",
-                               "1651", "1652", "1653", "1654", "1655", "1656",
-                               "1661", "1662", "1663", "1664", "1665", "1666",
-                               "2111", "2112", "2113", "2114", "2115", "2116",
-                               "2121", "2122", "2123", "2124", "2125", "2126",
-                               "2131", "2132", "2133", "2134", "2135", "2136",
-                               "2141", "2142", "2143", "2144", "2145", "2146",
-                               "2151", "2152", "2153", "2154", "2155", "2156",
-                               "2161", "2162", "2163", "2164", "2165", "2166",
-                               "2211", "2212", "2213", "2214", "2215", "2216",
-                               "2221", "2222", "2223", "2224", "2225", "2226",
-                               "2231", "2232", "2233", "2234", "2235", "2236",
-                               "2241", "2242", "2243", "2244", "2245", "2246",
-                               "2251", "2252", "2253", "2254", "2255", "2256",
-                               "2261", "2262", "2263", "2264", "2265", "2266",
-                               "2311", "2312", "2313", "2314", "2315", "2316",
-                               "2321", "2322", "2323", "2324", "2325", "2326",
-                               "2331", "2332", "2333", "2334", "2335", "2336",
-                               "2341", "2342", "2343", "2344", "2345", "2346",
-                               "2351", "2352", "2353", "2354", "2355", "2356",
-                               "2361", "2362", "2363", "2364", "2365", "2366",
-                               "2411", "2412", "2413", "2414", "2415", "2416",
-                               "2421", "2422", "2423", "2424", "2425", "2426",
-                               "2431", "2432", "2433", "2434", "2435", "2436",
-                               "2441", "2442", "2443", "2444", "2445", "2446",
-                               "2451", "2452", "2453", "2454", "2455", "2456",
-                               "2461", "2462", "2463", "2464", "2465", "2466",
-                               "2511", "2512", "2513", "2514", "2515", "2516",
-                               "2521", "2522", "2523", "2524", "2525", "2526",
-                               "2531", "2532", "2533", "2534", "2535", "2536",
-                               "2541", "2542", "2543", "2544", "2545", "2546",
-                               "2551", "2552", "2553", "2554", "2555", "2556",
-                               "2561", "2562", "2563", "2564", "2565", "2566",
-                               "2611", "2612", "2613", "2614", "2615", "2616",
-                               "2621", "2622", "2623", "2624", "2625", "2626",
-                               "2631", "2632", "2633", "2634", "2635", "2636",
-                               "2641", "2642", "2643", "2644", "2645", "2646",
-                               "2651", "2652", "2653", "2654", "2655", "2656",
-                               "2661", "2662", "2663", "2664", "2665", "2666",
-                               "3111", "3112", "3113", "3114", "3115", "3116",
-                               "3121", "3122", "3123", "3124", "3125", "3126",
-                               "3131", "3132", "3133", "3134", "3135", "3136",
-                               "3141", "3142", "3143", "3144", "3145", "3146",
-                               "3151", "3152", "3153", "3154", "3155", "3156",
-                               "3161", "3162", "3163", "3164", "3165", "3166",
-                               "3211", "3212", "3213", "3214", "3215", "3216",
-                               "3221", "3222", "3223", "3224", "3225", "3226",
-                               "3231", "3232", "3233", "3234", "3235", "3236",
-                               "3241", "3242", "3243", "3244", "3245", "3246",
-                               "3251", "3252", "3253", "3254", "3255", "3256",
-                               "3261", "3262", "3263", "3264", "3265", "3266",
-                               "3311", "3312", "3313", "3314", "3315", "3316",
-                               "3321", "3322", "3323", "3324", "3325", "3326",
-                               "3331", "3332", "3333", "3334", "3335", "3336",
-                               "3341", "3342", "3343", "3344", "3345", "3346",
-                               "3351", "3352", "3353", "3354", "3355", "3356",
-                               "3361", "3362", "3363", "3364", "3365", "3366",
-                               "3411", "3412", "3413", "3414", "3415", "3416",
-                               "3421", "3422", "3423", "3424", "3425", "3426",
-                               "3431", "3432", "3433", "3434", "3435", "3436",
-                               "3441", "3442", "3443", "3444", "3445", "3446",
-                               "3451", "3452", "3453", "3454", "3455", "3456",
-                               "3461", "3462", "3463", "3464", "3465", "3466",
-                               "3511", "3512", "3513", "3514", "3515", "3516",
-                               "3521", "3522", "3523", "3524", "3525", "3526",
-                               "3531", "3532", "3533", "3534", "3535", "3536",
-                               "3541", "3542", "3543", "3544", "3545", "3546",
-                               "3551", "3552", "3553", "3554", "3555", "3556",
-                               "3561", "3562", "3563", "3564", "3565", "3566",
-                               "3611", "3612", "3613", "3614", "3615", "3616",
-                               "3621", "3622", "3623", "3624", "3625", "3626",
-                               "3631", "3632", "3633", "3634", "3635", "3636",
-                               "3641", "3642", "3643", "3644", "3645", "3646",
-                               "3651", "3652", "3653", "3654", "3655", "3656",
-                               "3661", "3662", "3663", "3664", "3665", "3666",
-                               "4111", "4112", "4113", "4114", "4115", "4116",
-                               "4121", "4122", "4123", "4124", "4125", "4126",
-                               "4131", "4132", "4133", "4134", "4135", "4136",
-                               "4141", "4142", "4143", "4144", "4145", "4146",
-                               "4151", "4152", "4153", "4154", "4155", "4156",
-                               "4161", "4162", "4163", "4164", "4165", "4166",
-                               "4211", "4212", "4213", "4214", "4215", "4216",
-                               "4221", "4222", "4223", "4224", "4225", "4226",
-                               "4231", "4232", "4233", "4234", "4235", "4236",
-                               "4241", "4242", "4243", "4244", "4245", "4246",
-                               "4251", "4252", "4253", "4254", "4255", "4256",
-                               "4261", "4262", "4263", "4264", "4265", "4266",
-                               "4311", "4312", "4313", "4314", "4315", "4316",
-                               "4321", "4322", "4323", "4324", "4325", "4326",
-                               "4331", "4332", "4333", "4334", "4335", "4336",
-                               "4341", "4342", "4343", "4344", "4345", "4346",
-                               "4351", "4352", "4353", "4354", "4355", "4356",
-                               "4361", "4362", "4363", "4364", "4365", "4366",
-                               "4411", "4412", "4413", "4414", "4415", "4416",
-                               "4421", "4422", "4423", "4424", "4425", "4426",
-                               "4431", "4432", "4433", "4434", "4435", "4436",
-                               "4441", "4442", "4443", "4444", "4445", "4446",
-                               "4451", "4452", "4453", "4454", "4455", "4456",
-                               "4461", "4462", "4463", "4464", "4465", "4466",
-                               "4511", "4512", "4513", "4514", "4515", "4516",
-                               "4521", "4522", "4523", "4524", "4525", "4526",
-                               "4531", "4532", "4533", "4534", "4535", "4536",
-                               "4541", "4542", "4543", "4544", "4545", "4546",
-                               "4551", "4552", "4553", "4554", "4555", "4556",
-                               "4561", "4562", "4563", "4564", "4565", "4566",
-                               "4611", "4612", "4613", "4614", "4615", "4616",
-                               "4621", "4622", "4623", "4624", "4625", "4626",
-                               "4631", "4632", "4633", "4634", "4635", "4636",
-                               "4641", "4642", "4643", "4644", "4645", "4646",
-                               "4651", "4652", "4653", "4654", "4655", "4656",
-                               "4661", "4662", "4663", "4664", "4665", "4666",
-                               "5111", "5112", "5113", "5114", "5115", "5116",
-                               "5121", "5122", "5123", "5124", "5125", "5126",
-                               "5131", "5132", "5133", "5134", "5135", "5136",
-                               "5141", "5142", "5143", "5144", "5145", "5146",
-                               "5151", "5152", "5153", "5154", "5155", "5156",
-                               "5161", "5162", "5163", "5164", "5165", "5166",
-                               "5211", "5212", "5213", "5214", "5215", "5216",
-                               "5221", "5222", "5223", "5224", "5225", "5226",
-                               "5231", "5232", "5233", "5234", "5235", "5236",
-                               "5241", "5242", "5243", "5244", "5245", "5246",
-                               "5251", "5252", "5253", "5254", "5255", "5256",
-                               "5261", "5262", "5263", "5264", "5265", "5266",
-                               "5311", "5312", "5313", "5314", "5315", "5316",
-                               "5321", "5322", "5323", "5324", "5325", "5326",
-                               "5331", "5332", "5333", "5334", "5335", "5336",
-                               "5341", "5342", "5343", "5344", "5345", "5346",
-                               "5351", "5352", "5353", "5354", "5355", "5356",
-                               "5361", "5362", "5363", "5364", "5365", "5366",
-                               "5411", "5412", "5413", "5414", "5415", "5416",
-                               "5421", "5422", "5423", "5424", "5425", "5426",
-                               "5431", "5432", "5433", "5434", "5435", "5436",
-                               "5441", "5442", "5443", "5444", "5445", "5446",
-                               "5451", "5452", "5453", "5454", "5455", "5456",
-                               "5461", "5462", "5463", "5464", "5465", "5466",
-                               "5511", "5512", "5513", "5514", "5515", "5516",
-                               "5521", "5522", "5523", "5524", "5525", "5526",
-                               "5531", "5532", "5533", "5534", "5535", "5536",
-                               "5541", "5542", "5543", "5544", "5545", "5546",
-                               "5551", "5552", "5553", "5554", "5555", "5556",
-                               "5561", "5562", "5563", "5564", "5565", "5566",
-                               "5611", "5612", "5613", "5614", "5615", "5616",
-                               "5621", "5622", "5623", "5624", "5625", "5626",
-                               "5631", "5632", "5633", "5634", "5635", "5636",
-                               "5641", "5642", "5643", "5644", "5645", "5646",
-                               "5651", "5652", "5653", "5654", "5655", "5656",
-                               "5661", "5662", "5663", "5664", "5665", "5666",
-                               "6111", "6112", "6113", "6114", "6115", "6116",
-                               "6121", "6122", "6123", "6124", "6125", "6126",
-                               "6131", "6132", "6133", "6134", "6135", "6136",
-                               "6141", "6142", "6143", "6144", "6145", "6146",
-                               "6151", "6152", "6153", "6154", "6155", "6156",
-                               "6161", "6162", "6163", "6164", "6165", "6166",
-                               "6211", "6212", "6213", "6214", "6215", "6216",
-                               "6221", "6222", "6223", "6224", "6225", "6226",
-                               "6231", "6232", "6233", "6234", "6235", "6236",
-                               "6241", "6242", "6243", "6244", "6245", "6246",
-                               "6251", "6252", "6253", "6254", "6255", "6256",
-                               "6261", "6262", "6263", "6264", "6265", "6266",
-                               "6311", "6312", "6313", "6314", "6315", "6316",
-                               "6321", "6322", "6323", "6324", "6325", "6326",
-                               "6331", "6332", "6333", "6334", "6335", "6336",
-                               "6341", "6342", "6343", "6344", "6345", "6346",
-                               "6351", "6352", "6353", "6354", "6355", "6356",
-                               "6361", "6362", "6363", "6364", "6365", "6366",
-                               "6411", "6412", "6413", "6414", "6415", "6416",
-                               "6421", "6422", "6423", "6424", "6425", "6426",
-                               "6431", "6432", "6433", "6434", "6435", "6436",
-                               "6441", "6442", "6443", "6444", "6445", "6446",
-                               "6451", "6452", "6453", "6454", "6455", "6456",
-                               "6461", "6462", "6463", "6464", "6465", "6466",
-                               "6511", "6512", "6513", "6514", "6515", "6516",
-                               "6521", "6522", "6523", "6524", "6525", "6526",
-                               "6531", "6532", "6533", "6534", "6535", "6536",
-                               "6541", "6542", "6543", "6544", "6545", "6546",
-                               "6551", "6552", "6553", "6554", "6555", "6556",
-                               "6561", "6562", "6563", "6564", "6565", "6566",
-                               "6611", "6612", "6613", "6614", "6615", "6616",
-                               "6621", "6622", "6623", "6624", "6625", "6626",
-                               "6631", "6632", "6633", "6634", "6635", "6636",
-                               "6641", "6642", "6643", "6644", "6645", "6646",
-                               "6651", "6652", "6653", "6654", "6655", "6656",
-                               "6661", "6662", "6663", "6664", "6665", "6666"]
-        self.__possible_codes = self.__unused_codes.copy()
-        self.__responses = [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (1, 0), (1, 1),
-                            (1, 2), (1, 3), (2, 0), (2, 1), (2, 2), (3, 0), (4, 0)]
-
-    def solve(self):
-        """
-        Break the code by using Donald Knuth's five-guess algorithm.
-        Note that solve() and the methods it uses do not access self.__board.code at any point.
-        :postcond: each guess and response is printed to the console
-        :return: the amount of time it took the computer to break the code
-        """
-        start_time = time.time()
-        # initial guess: 1122
-        guess = "1122"
-        self.__unused_codes.remove(guess)
-        self.__board.add_guess(guess)
-        resp = self.__board.responses[-1]
-        print(guess + " | " + str(resp))
-        while not self.__board.solved and len(self.__board.guesses) < self.__board.max_guesses:
-            if guess in self.__possible_codes:
-                self.__possible_codes.remove(guess)
-            else:
-                pass
-            # remove all codes that do not give the same response as resp
-            for c in self.codes_to_remove(guess, resp):
-                self.__possible_codes.remove(c)
-            # make a next guess
-            guess = self.next_guess()
-            self.__unused_codes.remove(guess)
-            self.__board.add_guess(guess)
-            resp = self.__board.responses[-1]
-            print(guess + " | " + str(resp))
-        end_time = time.time()
-        return end_time - start_time
 
-    def codes_to_remove(self, guess, resp):
+class ComputerPlayer(Codebreaker):
+    def __init__(self, board, use_decision_tree=False, decision_tree_file=None, processes=None,
+                 use_guess_cache=True, pegs=None, colours=None, seed=None, strategy=DEFAULT_STRATEGY,
+                 use_symmetry=True, time_limit=None, stats=None):
         """
-        Make a list of codes that when given the parameter guess, do not give the same response as resp
-        :param guess: the most recent guess
-        :param resp: the most recent response
-        :return: a list of codes to remove from self.__possible_codes
-        """
-        to_remove = []
-        for c in self.__possible_codes:
-            if self.simulate_response(c, guess) != resp:
-                to_remove.append(c)
-            else:
-                pass
-        return to_remove
+        Constructor method for the computer player.
+        The computer player keeps codes and responses as integers,
+        and keeps the unused codes and the possible codes as bitsets (see codes.py).
+        :param board: a decoding board that the computer player sends guesses to,
+                      or None if the computer player is only used to work out guesses
+        :param use_decision_tree: True if propose() should walk a decision tree instead of searching for guesses
+        :param decision_tree_file: the path of the decision tree file to walk,
+                                   the tree for Donald Knuth's five-guess algorithm is used if this is None
+        :param processes: the number of processes that next_guess() splits the unused codes between,
+                          or None to score every unused code in this process
+        :param use_guess_cache: True if next_guess() should look in and add to the guess cache that is shared by
+                                every computer player in this process
+        :param pegs: the number of pegs in a code, or None to use the board's (four if there is no board)
+        :param colours: the number of colours a peg can be, or None to use the board's (six if there is no board)
+        :param seed: the seed for choosing samples when a position is too big to score exactly, or None for a
+                     random seed
+        :param strategy: the name of a strategy in STRATEGIES (see strategies.py) that next_guess() uses to score
+                         codes, or a function that scores a partition histogram
+        :param use_symmetry: True if next_guess() should only score one code out of each set of codes that are
+                             symmetric after the guesses made so far
+        :param time_limit: the most seconds next_guess() should search for each guess, or None to always finish the
+                           search
+        :param stats: a SolverStats object (see solver_stats.py) to record statistics in, or None
+        """
+        get_strategy(strategy)  # throws an exception if there is no such strategy
+        super().__init__(board, pegs, colours, stats)
+        if use_decision_tree and decision_tree_file is None and self.code_space is not get_code_space():
+            # checked before the tree is loaded, since it may have to be built first
+            raise Exception("Cannot make ComputerPlayer, the decision tree for Donald Knuth's five-guess algorithm is "
+                            "for four pegs and six colours.")
+        else:
+            pass
+        # shared with every other computer player, or None if the code space is too big for a feedback table
+        self.__feedback_table = get_feedback_table(self.code_space)
+        self.__unused_codes = self.code_space.all_codes_mask    # a bitset of the codes that have not been guessed yet
+        self.__possible_codes = self.code_space.all_codes_mask  # a bitset of the codes that could still be the code
+        self.__use_decision_tree = use_decision_tree
+        self.__decision_tree_file = decision_tree_file
+        self.__processes = processes
+        self.__use_guess_cache = use_guess_cache
+        self.__random = rand.Random(seed)
+        self.__strategy = strategy
+        self.__use_symmetry = use_symmetry
+        self.__time_limit = time_limit
+        self.__search_complete = True  # False if the last search ran out of time before scoring every code
+        self.__cache_hit = None        # whether the last guess was found in the guess cache, None if it was not used
+        # without a feedback table, a tuple (guess, buckets) with the partition of the possible codes that the last
+        # search worked out for the guess it chose, see make_buckets()
+        self.__guess_buckets = None
+        self.__decision_tree = None    # the decision tree that propose() walks, once it is loaded
+        self.__tree_node = None        # the node of the decision tree for the current guess
+        if time_limit is not None and self.__feedback_table is not None:
+            missing_colour_counts(self.code_space.pegs, self.code_space.colours)  # counted now, outside any move
+        else:
+            pass
 
-    def number_of_codes_to_remove(self, guess, resp):
+    @property
+    def strategy(self):
+        return self.__strategy
+
+    @property
+    def time_limit(self):
+        return self.__time_limit
+
+    @property
+    def search_complete(self):
+        return self.__search_complete
+
+    @property
+    def possible_codes(self):
+        return mask_to_codes(self.__possible_codes)
+
+    @property
+    def unused_codes(self):
+        return mask_to_codes(self.__unused_codes)
+
+    def choose_guess(self):
         """
-        Find out how many codes can be removed from self.__possible_guesses given the parameters guess and resp
-        :param guess: a code
-        :param resp: a response
-        :return: an integer representing how many codes can be removed from self.__possible_codes
+        Work out the next guess for propose() (see codebreaker.py).
+        The first guess is 1122 (or the same pattern for other numbers of pegs and colours), and every guess after
+        it comes from next_guess(), or from the decision tree if the computer player was made with
+        use_decision_tree=True and the tree can be read.
+        :return: the index of the next guess
         """
-        to_remove = 0
-        for c in self.__possible_codes:
-            if self.simulate_response(c, guess) != resp:
-                to_remove += 1
+        if self.__use_decision_tree and self.__tree_node is None and self.load_decision_tree() is None:
+            # the decision tree cannot be read, so every guess is searched for instead
+            self.__use_decision_tree = False
+        else:
+            pass
+
+        if self.__use_decision_tree:
+            if self.__tree_node is None:
+                self.__tree_node = self.__decision_tree.root
             else:
                 pass
-        return to_remove
+            return self.__decision_tree.guess(self.__tree_node)
+        elif self.__unused_codes == self.code_space.all_codes_mask:
+            return self.code_space.first_guess
+        else:
+            return self.next_guess()
 
-    def simulate_response(self, sim_code, sim_guess):
+    def take_response(self, guess, resp):
+        """
+        Take a response that does not break the code into account for observe() (see codebreaker.py), by moving to
+        the child for the response in the decision tree, or by filtering the possible codes
+        :param guess: the index of the code that was guessed
+        :param resp: the index of the response to guess
         """
-        Simulate a response based on a mock code and mock guess
-        :param sim_code: a possible code that stands in as a code
-        :param sim_guess: a guess for sim_code
-        :return: the response for if sim_guess was a guess for sim_code
-        """
-        correct_colour_and_position = 0
-        correct_colour_wrong_position = 0
-        code_peg_taken = [False] * 4  # list to keep track of which pegs in the code are taken by a peg in the guess
-        guess_peg_taken = [False] * 4  # list to keep track of which pegs in the guess are taken by a peg in the code
-
-        # check for correct colour and position
-        for i in range(4):
-            if sim_guess[i] == sim_code[i]:
-                correct_colour_and_position += 1
-                code_peg_taken[i] = True
-                guess_peg_taken[i] = True
+        if self.__use_decision_tree:
+            self.__tree_node = self.__decision_tree.child(self.__tree_node, resp)
+            if self.__tree_node is None:
+                raise Exception("Cannot observe the response, the decision tree has no guess after this response.")
             else:
                 pass
+        else:
+            self.record_response(guess, resp)
+
+    def load_decision_tree(self):
+        """
+        Get the decision tree that propose() walks when the computer player was made with use_decision_tree=True.
+        The tree is loaded the first time any computer player in this process needs it.
+        :return: the decision tree, or None if it cannot be read
+        """
+        tree = get_decision_tree(self.__decision_tree_file)
+        if tree is None:
+            return None
+        elif tree.code_space is not self.code_space:
+            raise Exception("Cannot solve, the decision tree is for a different number of pegs or colours.")
+        else:
+            pass
+        self.__decision_tree = tree
+        return tree
+
+    def record_response(self, guess, resp):
+        """
+        Update the unused codes and possible codes after a guess gets a response
+        :param guess: the index of the code that was guessed
+        :param resp: the index of the response to guess
+        :postcond: guess is not in self.__unused_codes or self.__possible_codes,
+                   and every code that would not give resp for guess is removed from self.__possible_codes
+        """
+        possible_before = self.__possible_codes
+        self.__unused_codes &= ~(1 << guess)
+        self.__possible_codes &= ~(1 << guess)
+        # remove all codes that do not give the same response as resp
+        self.__possible_codes = self.codes_to_keep(guess, resp)
+        if self.stats is not None:
+            self.stats.record_filter(possible_before.bit_count(), self.__possible_codes.bit_count())
+        else:
+            pass
 
-        # check correct colour wrong position
-        for j in range(4):
-            if not guess_peg_taken[j]:
-                for k in range(4):
-                    if j != k:
-                        if sim_guess[j] == sim_code[k] and not code_peg_taken[k]:
-                            correct_colour_wrong_position += 1
-                            code_peg_taken[k] = True
-                            guess_peg_taken[j] = True
-                            break
-                    else:
-                        pass
+    def codes_to_keep(self, guess, resp):
+        """
+        Find the codes in self.__possible_codes that when given the parameter guess, give the same response as resp.
+        With a feedback table this is the possible codes & resp's mask. Without one, the partition that was already
+        worked out for the guess is used if there is one: the shared partition of every code for the first guess
+        (see get_first_guess_buckets()), or the partition the last search kept for the guess it chose. Otherwise each
+        possible code's response is worked out.
+        :param guess: the index of a code
+        :param resp: the index of a response
+        :return: a bitset of the codes to keep in self.__possible_codes
+        """
+        if self.__feedback_table is not None:
+            return self.__possible_codes & self.__feedback_table.masks(guess)[resp]
+        elif guess == self.code_space.first_guess:
+            return self.__possible_codes & get_first_guess_buckets(self.code_space).get(resp, 0)
+        elif self.__guess_buckets is not None and self.__guess_buckets[0] == guess:
+            # the buckets were made from a set of possible codes that has only got smaller since
+            return self.__possible_codes & self.__guess_buckets[1].get(resp, 0)
+        else:
+            possible_codes = mask_to_codes(self.__possible_codes)
+            if self.stats is not None:
+                self.stats.count_response_evaluations(len(possible_codes))
             else:
                 pass
+            resp_indexes = self.code_space.response_indexes(guess, possible_codes)
+            return codes_to_mask(possible_codes[i] for i in range(len(possible_codes)) if resp_indexes[i] == resp)
+
+    def codes_to_remove(self, guess, resp):
+        """
+        Make a list of codes that when given the parameter guess, do not give the same response as resp
+        :param guess: the index of the most recent guess
+        :param resp: the index of the most recent response
+        :return: a list of code indexes to remove from self.__possible_codes
+        """
+        return mask_to_codes(self.__possible_codes & ~self.codes_to_keep(guess, resp))
 
-        return (correct_colour_and_position, correct_colour_wrong_position)
+    def number_of_codes_to_remove(self, guess, resp):
+        """
+        Find out how many codes can be removed from self.__possible_guesses given the parameters guess and resp
+        :param guess: the index of a code
+        :param resp: the index of a response
+        :return: an integer representing how many codes can be removed from self.__possible_codes
+        """
+        return (self.__possible_codes & ~self.codes_to_keep(guess, resp)).bit_count()
+
+    def simulate_response(self, sim_code, sim_guess):
+        """
+        Simulate a response based on a mock code and mock guess.
+        The response is looked up in the shared feedback table instead of being worked out again, if there is one.
+        :param sim_code: a possible code that stands in as a code, as a string or an index
+        :param sim_guess: a guess for sim_code, as a string or an index
+        :return: the index of the response for if sim_guess was a guess for sim_code
+        """
+        if self.stats is not None:
+            self.stats.count_response_evaluations(1)
+        else:
+            pass
+        sim_code = self.code_space.code_to_index(sim_code)
+        sim_guess = self.code_space.code_to_index(sim_guess)
+        if self.__feedback_table is not None:
+            return self.__feedback_table.response_index(sim_code, sim_guess)
+        else:
+            return self.code_space.response_index(sim_code, sim_guess)
 
     def next_guess(self):
         """
-        Use the minimax technique to choose a code in self.__unused_codes with the
-        least worst score as the next guess.
-        A response to a code is one of the responses in self.__responses,
+        Use the computer player's strategy to choose a code in self.__unused_codes with the
+        least score as the next guess.
+        A response to a code is one of the responses in the code space (see codes.py),
         the score of a response is the number of codes in self.__possible_codes that are still possible after the
         response is known,
-        and the score of a code is the worst (maximum) of all its response scores.
+        and the score of a code is what the strategy makes of all its response scores, with the minimax strategy it
+        is the worst (maximum) of them.
         From the set of unused codes with the best (minimum) score, select one of them as the next guess,
         choose a code from self.__possible_codes if possible, choose the code with the least numeric value
-        (ex. 2345 is less than 3456).
-        :return: a code that will be used as the next guess
+        (ex. 2345 is less than 3456), which is also the code with the least index.
+        Only the representative of each orbit of unused codes is scored (see symmetry.py), the other codes in an
+        orbit get the same score and have greater indexes, so the same guess is chosen.
+        If the computer player was made with more than one process, the codes are split into shards that are
+        scored in a process pool, and the best codes of each shard are merged in order, so the same guess is chosen.
+        A position that has already been searched by any computer player in this process is looked up in the guess
+        cache instead of being searched again.
+        If there is no feedback table and too many pairs to score, the guess is chosen by sample_next_guess() instead.
+        If the computer player has a time limit, the codes are scored in the order from anytime_order() until the
+        time runs out, see find_best_code_by_deadline(). Symmetric codes are then only left out if their
+        representatives have already been found (see symmetry.py). The search_complete property tells whether every
+        code was scored, and only guesses from complete searches are added to the guess cache.
+        If the computer player has a SolverStats object, the search is recorded in it.
+        :return: the index of a code that will be used as the next guess
         """
-        best_score = len(self.__possible_codes)
-        best_codes = []
-        for c in self.__unused_codes:
-            code_score = self.get_code_score(c)
-            # modify best_score and best_codes if necessary
-            if code_score < best_score:
+        if self.stats is None:
+            return self.search_for_guess()
+        else:
+            start_time = time.perf_counter()
+            guess = self.search_for_guess()
+            self.stats.record_search(time.perf_counter() - start_time, self.__cache_hit, self.__search_complete)
+            return guess
+
+    def search_for_guess(self):
+        """
+        Search for the next guess, see next_guess()
+        :postcond: self.__search_complete and self.__cache_hit are set for this search
+        :return: the index of a code that will be used as the next guess
+        """
+        deadline = None
+        if self.__time_limit is not None:
+            deadline = time.perf_counter() + self.__time_limit
+        else:
+            pass
+        self.__search_complete = True
+        self.__cache_hit = None
+
+        if self.__feedback_table is None and \
+                self.__unused_codes.bit_count() * self.__possible_codes.bit_count() > MAX_EXACT_PAIRS:
+            return self.sample_next_guess(deadline)
+        else:
+            pass
+
+        key = None
+        if self.__use_guess_cache:
+            key = make_fingerprint(self.__possible_codes, self.__unused_codes, self.code_space.pegs,
+                                   self.code_space.colours, self.__strategy)
+            cached_guess = get_guess_cache().get(key)
+            self.__cache_hit = cached_guess is not None
+            if cached_guess is not None:
+                return cached_guess
+            else:
+                pass
+        else:
+            pass
+
+        representatives = None
+        if self.__use_symmetry and self.__feedback_table is not None:
+            guesses = tuple(mask_to_codes(self.code_space.all_codes_mask & ~self.__unused_codes))
+            if deadline is None:
+                representatives = orbit_representatives(self.code_space.pegs, self.code_space.colours, guesses)
+            else:
+                # finding the representatives can take much longer than the time limit, so with a time limit they
+                # are only used if they have already been found
+                representatives = cached_orbit_representatives(self.code_space.pegs, self.code_space.colours,
+                                                               guesses)
+        else:
+            pass
+        if representatives is not None:
+            codes_to_score = mask_to_codes(self.__unused_codes & representatives)
+        else:
+            codes_to_score = mask_to_codes(self.__unused_codes)
+        guess = self.find_best_code(self.__possible_codes, codes_to_score, deadline)
+
+        if key is not None and self.__search_complete:
+            get_guess_cache().put(key, guess)
+        else:
+            pass
+        return guess
+
+    def find_best_code(self, scored_against, codes_to_score, deadline=None):
+        """
+        Score codes and choose the best one, with the tie-break from choose_best_code()
+        :param scored_against: a bitset of the possible codes that the codes are scored against
+        :param codes_to_score: a list of the indexes of unused codes in order
+        :param deadline: the time.perf_counter() time that the search should stop by, or None to score every code
+        :return: the index of the chosen code
+        """
+        if self.stats is not None and deadline is None:
+            self.stats.count_codes_scored(len(codes_to_score))
+            self.stats.count_response_evaluations(len(codes_to_score) * scored_against.bit_count())
+        else:
+            pass
+        if deadline is not None:
+            return self.find_best_code_by_deadline(scored_against, codes_to_score, deadline)
+        elif self.__feedback_table is None and scored_against == self.__possible_codes and \
+                (self.__processes is None or self.__processes <= 1):
+            return self.find_best_code_keeping_buckets(codes_to_score)
+        elif self.__processes is not None and self.__processes > 1 and \
+                len(codes_to_score) * scored_against.bit_count() >= MIN_PARALLEL_PAIRS:
+            best_score, best_codes = self.score_codes_in_parallel(codes_to_score, scored_against)
+        else:
+            best_score, best_codes = score_codes(scored_against, codes_to_score,
+                                                 self.code_space.pegs, self.code_space.colours, self.__strategy)
+        return self.choose_best_code(best_codes)
+
+    def find_best_code_keeping_buckets(self, codes_to_score):
+        """
+        Score codes against every possible code like score_codes() and choose the best one, keeping the responses
+        of the best codes so that the partition of the chosen code does not have to be worked out again once its
+        response is known (see codes_to_keep()). This is only used without a feedback table, where working out
+        responses is the slow part of filtering the possible codes.
+        :param codes_to_score: a list of the indexes of unused codes in order
+        :postcond: self.__guess_buckets has the partition of self.__possible_codes for the chosen code
+        :return: the index of the chosen code
+        """
+        possible_list = mask_to_codes(self.__possible_codes)
+        score_histogram = get_strategy(self.__strategy)
+        best_score = None
+        best_responses = {}  # the responses of each best code, in the same order as codes_to_score
+        for code in codes_to_score:
+            resp_indexes = self.code_space.response_indexes(code, possible_list)
+            code_score = score_histogram(list(Counter(resp_indexes).values()) or [0])
+            if best_score is None or code_score < best_score:
                 best_score = code_score
-                best_codes.clear()
-                best_codes.append(c)
+                best_responses = {code: resp_indexes}
             elif code_score == best_score:
-                best_codes.append(c)
+                best_responses[code] = resp_indexes
             else:
                 pass
-        # choose next guess, choose a code that is in self.__possible_codes if possible
+        guess = self.choose_best_code(list(best_responses))
+        self.__guess_buckets = (guess, make_buckets(possible_list, best_responses[guess]))
+        return guess
+
+    def find_best_code_by_deadline(self, scored_against, codes_to_score, deadline):
+        """
+        Score codes in the order from anytime_order() until the deadline passes, and choose the best code scored.
+        At least one code is always scored. The best code is the one with the least (score, not possible, index),
+        which does not depend on the order the codes were scored in, so if every code is scored the same guess is
+        chosen as without a deadline.
+        :param scored_against: a bitset of the possible codes that the codes are scored against
+        :param codes_to_score: a list of the indexes of unused codes, which cannot be empty
+        :param deadline: the time.perf_counter() time that the search should stop by
+        :postcond: self.__search_complete is True if every code was scored
+        :return: the index of the chosen code
+        """
+        if len(codes_to_score) == 0:
+            raise Exception("Cannot choose a guess, there are no codes to score.")
+        else:
+            pass
+        ordered_codes = self.anytime_order(codes_to_score)
+        score_histogram = get_strategy(self.__strategy)
+        histograms = partition_histograms(scored_against, ordered_codes, self.code_space)
+        best_key = None
+        codes_scored = 0
+        for i in range(len(ordered_codes)):
+            # the clock is checked after the first code and then every DEADLINE_CHECK_INTERVAL codes
+            if i > 0 and (i - 1) % DEADLINE_CHECK_INTERVAL == 0 and time.perf_counter() > deadline:
+                self.__search_complete = False
+                break
+            else:
+                code = ordered_codes[i]
+                code_key = (score_histogram(next(histograms)), not (self.__possible_codes >> code) & 1, code)
+                codes_scored += 1
+                if best_key is None or code_key < best_key:
+                    best_key = code_key
+                else:
+                    pass
+        if self.stats is not None:
+            self.stats.count_codes_scored(codes_scored)
+            self.stats.count_response_evaluations(codes_scored * scored_against.bit_count())
+        else:
+            pass
+        return best_key[2]
+
+    def anytime_order(self, codes_to_score):
+        """
+        Put codes in the order that anytime mode scores them in, the most promising codes first.
+        Possible codes come first, since one of them could win the game, then the other codes with the most
+        different colours, since they usually split the possible codes into more groups, with ties in index order.
+        :param codes_to_score: a list of the indexes of unused codes
+        :return: a list of the same codes in order
+        """
+        possible_codes = [c for c in codes_to_score if (self.__possible_codes >> c) & 1]
+        other_codes = [c for c in codes_to_score if not (self.__possible_codes >> c) & 1]
+        if self.__feedback_table is not None:
+            # the sort is stable, so codes with as many colours stay in index order
+            other_codes.sort(key=missing_colour_counts(self.code_space.pegs, self.code_space.colours).__getitem__)
+        else:
+            other_codes.sort(key=lambda c: -sum(1 for count in self.code_space.colour_counts(c) if count > 0))
+        return possible_codes + other_codes
+
+    def sample_next_guess(self, deadline=None):
+        """
+        Use the computer player's strategy like next_guess(), but only score a random sample of the unused codes
+        against a random sample of the possible codes, so the work for each guess is bounded no matter how big the
+        code space is.
+        The sample of unused codes is up to MAX_SAMPLED_GUESSES codes, half of them possible codes if there are enough,
+        and they are scored against up to MAX_SAMPLED_CODES possible codes.
+        If there are only one or two possible codes, the one with the least index is guessed, like next_guess() would.
+        :param deadline: the time.perf_counter() time that the search should stop by, or None to score every code
+                         in the sample
+        :return: the index of a code that will be used as the next guess
+        """
+        possible_codes = mask_to_codes(self.__possible_codes)
+        if len(possible_codes) <= 2:
+            return possible_codes[0]
+        else:
+            pass
+
+        if len(possible_codes) <= MAX_SAMPLED_CODES:
+            sampled_codes = possible_codes
+        else:
+            sampled_codes = self.__random.sample(possible_codes, MAX_SAMPLED_CODES)
+        if len(possible_codes) <= MAX_SAMPLED_GUESSES // 2:
+            candidates = set(possible_codes)
+        else:
+            candidates = set(self.__random.sample(possible_codes, MAX_SAMPLED_GUESSES // 2))
+        # fill the rest of the sample with unused codes, giving up after a bounded number of tries
+        for attempt in range(MAX_SAMPLED_GUESSES * 4):
+            if len(candidates) >= MAX_SAMPLED_GUESSES:
+                break
+            else:
+                code = self.__random.randrange(self.code_space.number_of_codes)
+                if (self.__unused_codes >> code) & 1:
+                    candidates.add(code)
+                else:
+                    pass
+
+        return self.find_best_code(codes_to_mask(sampled_codes), sorted(candidates), deadline)
+
+    def choose_best_code(self, best_codes):
+        """
+        From the codes with the best score, choose a code that is in self.__possible_codes if possible,
+        otherwise choose the code with the least index
+        :param best_codes: a list of code indexes in order
+        :return: the index of the chosen code
+        """
         for best_code in best_codes:
-            if best_code in self.__possible_codes:
+            if (self.__possible_codes >> best_code) & 1:
                 return best_code
             else:
                 pass
         return best_codes[0]
 
+    def score_codes_in_parallel(self, codes_to_score, scored_against):
+        """
+        Score codes in a process pool.
+        The codes are split into shards that keep their order, each worker finds the best score and the
+        best codes of its shard, and the shards with the best score are joined back together in order.
+        :param codes_to_score: a list of the indexes of unused codes in order
+        :param scored_against: a bitset of the possible codes that the codes are scored against
+        :return: a tuple of the best score and the list of codes with that score, in order
+        """
+        # a few shards for each process so that one slow shard does not hold up the others
+        number_of_shards = self.__processes * 4
+        shard_size = -(-len(codes_to_score) // number_of_shards)
+        shards = [codes_to_score[i:i + shard_size] for i in range(0, len(codes_to_score), shard_size)]
+        shard_results = get_process_pool(self.__processes).map(score_codes, [scored_against] * len(shards),
+                                                              shards, [self.code_space.pegs] * len(shards),
+                                                              [self.code_space.colours] * len(shards),
+                                                              [self.__strategy] * len(shards))
+        best_score = None
+        best_codes = []
+        for shard_score, shard_codes in shard_results:
+            if best_score is None or shard_score < best_score:
+                best_score = shard_score
+                best_codes = shard_codes.copy()
+            elif shard_score == best_score:
+                best_codes.extend(shard_codes)
+            else:
+                pass
+        return best_score, best_codes
+
     def get_code_score(self, code):
         """
         Get a code's score.
-        A code's score is the worst (maximum) of all its response scores,
+        A code's score is what the computer player's strategy makes of all its response scores,
         a response score is the number of codes in self.__possible_codes that are still possible after a certain
         response is known,
-        a response used for a response score is one of the responses in self.__responses.
-        :param code: a code from self.__unused_codes
-        :return: the code's score
-        """
-        worst_score = 0
-        for r in self.__responses:
-            resp_score = self.get_response_score(code, r)
-            # modify worst_score if necessary
-            if resp_score > worst_score:
-                worst_score = resp_score
+        a response used for a response score is one of the responses in the code space (see codes.py).
+        The response scores are all taken from one partition of self.__possible_codes, see get_partition().
+        :param code: the index of a code from self.__unused_codes
+        :return: the code's score, with the minimax strategy this is the worst (maximum) response score
+        """
+        return get_strategy(self.__strategy)(list(self.get_partition(code).values()))
+
+    def get_partition(self, code):
+        """
+        Split self.__possible_codes into groups by the response each possible code would give if code was guessed.
+        Each group is the possible codes & the mask for a response (see FeedbackTable.masks()), so every response
+        score for code is found at once without going through the possible codes one by one.
+        Without a feedback table, the response of each possible code is worked out and counted instead.
+        Responses that no possible code would give are left out, their response score would be 0.
+        :param code: the index of a code from self.__unused_codes
+        :return: a dictionary where each key is the index of a response and each value is that response's score
+        """
+        if self.__feedback_table is None:
+            resp_counts = Counter(self.code_space.response_indexes(code, mask_to_codes(self.__possible_codes)))
+            return {r: resp_counts[r] for r in sorted(resp_counts)}
+        else:
+            pass
+
+        partition = {}
+        code_masks = self.__feedback_table.masks(code)
+        for r in range(len(code_masks)):
+            resp_score = (self.__possible_codes & code_masks[r]).bit_count()
+            if resp_score > 0:
+                partition[r] = resp_score
             else:
                 pass
-        return worst_score
+        return partition
 
     def get_response_score(self, code, resp):
         """
         Get a response score given a possible code and a specific response.
         The response's score is the number of codes in self.__possible_codes that are still possible after the
         parameter resp for the parameter code is known.
-        :param code: a code from self.__unused codes
-        :param resp: a response from self.__responses
+        :param code: the index of a code from self.__unused codes
+        :param resp: the index of a response
         :return: the response score
         """
-        return len(self.__possible_codes) - self.number_of_codes_to_remove(code, resp)
+        return self.__possible_codes.bit_count() - self.number_of_codes_to_remove(code, resp)
+
+
+def score_codes(possible_codes, codes, pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS, strategy=DEFAULT_STRATEGY):
+    """
+    Find the codes with the best (minimum) score, where a code's score is the same as in get_code_score().
+    Each code's partition histogram is worked out once and handed to the strategy, so every strategy takes one
+    pass over the possible codes for each code.
+    This is a function instead of a method so that worker processes can run it on a shard of the unused codes.
+    :param possible_codes: a bitset of the codes that are still possible
+    :param codes: a list of the indexes of the codes to score
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param strategy: the name of a strategy in STRATEGIES (see strategies.py), or a function that scores a
+                     partition histogram
+    :return: a tuple of the best score and the list of codes with that score, in the same order as codes,
+             the best score is None if there are no codes
+    """
+    score_histogram = get_strategy(strategy)
+    best_score = None
+    best_codes = []
+    histograms = partition_histograms(possible_codes, codes, get_code_space(pegs, colours))
+    for c, code_score in zip(codes, map(score_histogram, histograms)):
+        # modify best_score and best_codes if necessary
+        if best_score is None or code_score < best_score:
+            best_score = code_score
+            best_codes.clear()
+            best_codes.append(c)
+        elif code_score == best_score:
+            best_codes.append(c)
+        else:
+            pass
+    return best_score, best_codes
+
+
+@functools.lru_cache(maxsize=None)
+def missing_colour_counts(pegs, colours):
+    """
+    Count the colours that each code does not have, so anytime_order() does not have to count them during a move.
+    This is only used for code spaces with a feedback table, which are small enough to go through every code.
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :return: a bytes object where item c is the number of colours that the code with index c does not have
+    """
+    code_space = get_code_space(pegs, colours)
+    return bytes(code_space.colour_counts(c).count(0) for c in range(code_space.number_of_codes))
+
+
+def partition_histograms(possible_codes, codes, code_space):
+    """
+    Work out the partition histogram (see strategies.py) of each code, one code at a time
+    :param possible_codes: a bitset of the codes that are still possible
+    :param codes: a list of the indexes of the codes
+    :param code_space: the code space of the codes
+    :return: an iterator of lists, where list i is the partition histogram of codes[i]
+    """
+    feedback_table = get_feedback_table(code_space)
+    if feedback_table is not None:
+        # the size of each response's group is the number of possible codes in its mask
+        return (list(map(int.bit_count, map(possible_codes.__and__, feedback_table.masks(c)))) for c in codes)
+    else:
+        possible_list = mask_to_codes(possible_codes)
+        return (list(Counter(code_space.response_indexes(c, possible_list)).values()) or [0] for c in codes)
+
+
+_guess_cache = GuessCache(GUESS_CACHE_SIZE)
+
+
+def get_guess_cache():
+    """
+    Get the guess cache that is shared by every computer player in this process,
+    its hits and misses properties show how often positions were found in it
+    :return: the guess cache
+    """
+    return _guess_cache
+
+
+_process_pools = {}  # process pools that have been started, by number of processes
+
+
+def get_process_pool(processes):
+    """
+    Get a process pool that is shared by every computer player in this process, starting it if needed
+    :param processes: the number of worker processes in the pool
+    :return: the process pool
+    """
+    if processes not in _process_pools:
+        # imported here since concurrent.futures.process is slow to import, and most processes never need a pool
+        from concurrent.futures import ProcessPoolExecutor
+        _process_pools[processes] = ProcessPoolExecutor(max_workers=processes)
+    else:
+        pass
+    return _process_pools[processes]
+
+
+_decision_trees = {}  # decision trees that have been loaded, by file path
+
+
+def knuth_tree_path():
+    """
+    Get the path of the decision tree file for Donald Knuth's five-guess algorithm
+    :return: the path of the tree file, in the directory from get_table_directory()
+    """
+    return os.path.join(get_table_directory(), KNUTH_TREE_FILE_NAME)
+
+
+def build_knuth_tree():
+    """
+    Work out the decision tree for Donald Knuth's five-guess algorithm.
+    Each position is set up by giving a fresh computer player the guesses and responses that lead to it.
+    :return: the decision tree
+    """
+    def make_player(history):
+        player = ComputerPlayer(None)
+        for guess, resp in history:
+            player.record_response(guess, resp)
+        return player
+
+    return DecisionTree.build(make_player, FIRST_GUESS)
+
+
+def load_knuth_tree(path):
+    """
+    Load the decision tree for Donald Knuth's five-guess algorithm.
+    If the tree file is missing, cannot be read, or is not a tree for four pegs and six colours, the tree is built
+    and saved again, and if it cannot be saved, the tree that was built is used without saving it.
+    :param path: the path of the tree file
+    :return: the decision tree
+    """
+    try:
+        tree = DecisionTree.load(path)
+        if tree.code_space is get_code_space():
+            return tree
+        else:
+            pass
+    except (OSError, DecisionTreeFormatError):
+        pass
+    tree = build_knuth_tree()
+    try:
+        tree.save(path)
+    except OSError:
+        # the tree stays in memory for this process, like a feedback table that cannot be written
+        pass
+    return tree
+
+
+def get_decision_tree(path=None):
+    """
+    Get a decision tree that is shared by every computer player in this process, loading it if needed.
+    The tree for Donald Knuth's five-guess algorithm is built first if its file is missing or not valid, see
+    load_knuth_tree().
+    :param path: the path of a decision tree file, or None for the tree for Donald Knuth's five-guess algorithm
+    :return: the decision tree, or None if its file cannot be read or is not a valid tree file
+    """
+    if path is None:
+        path = knuth_tree_path()
+        if path not in _decision_trees:
+            _decision_trees[path] = load_knuth_tree(path)
+        else:
+            pass
+    elif path not in _decision_trees:
+        try:
+            _decision_trees[path] = DecisionTree.load(path)
+        except (OSError, DecisionTreeFormatError):
+            # the computer players search for their guesses instead
+            _decision_trees[path] = None
+    else:
+        pass
+    return _decision_trees[path]
 
 
 if __name__ == '__main__':
+    import tempfile
+
     print("Computer Player")
     solved_boards = 0
     unsolved_boards = 0
 
-    # code for printing possible codes so that I do not have to type them myself
-    # for i in range(1, 7):
-    #    for j in range(1, 7):
-    #        for k in range(1, 7):
-    #            for l in range(1, 7):
-    #                print("\"" + str(i) + str(j) + str(k) + str(l) + "\", ", end="")
-    #            print()
-
     # set up example codes
     example_codes = ["1122", "1111", "1234", "6543", "5555", "2424", "6333", "2121", "4565", "6666"]
     for ec in example_codes:
@@ -447,5 +825,107 @@ if __name__ == '__main__':
             print("Computer player did not successfully break the code\n")
             unsolved_boards += 1
 
+    # set up codes with more pegs and colours
+    for pegs_and_colours in [(5, 8), (6, 9)]:
+        big_space = get_code_space(*pegs_and_colours)
+        big_code = big_space.index_to_code(rand.randrange(big_space.number_of_codes))
+        print("Random code with " + str(big_space.pegs) + " pegs and " + str(big_space.colours) + " colours: " +
+              big_code)
+        big_board = Board(big_code, big_space.pegs, big_space.colours)
+        big_computer_player = ComputerPlayer(big_board)
+        big_solve_time = big_computer_player.solve()
+        if big_board.solved:
+            print("Solved in " + str(big_solve_time) + " seconds.\n")
+            solved_boards += 1
+        else:
+            print("Computer player did not successfully break the code\n")
+            unsolved_boards += 1
+
+    # solve with a time limit for each guess
+    anytime_board = Board("6543")
+    anytime_computer_player = ComputerPlayer(anytime_board, use_guess_cache=False, time_limit=0.001)
+    print("Code with a time limit of 1 millisecond for each guess: 6543")
+    anytime_solve_time = anytime_computer_player.solve()
+    if anytime_board.solved:
+        print("Solved in " + str(anytime_solve_time) + " seconds.\n")
+        solved_boards += 1
+    else:
+        print("Computer player did not successfully break the code\n")
+        unsolved_boards += 1
+
+    # every move with a time limit should take at most a small multiple of the time limit
+    move_time_limit = 0.01
+    slowest_move = 0
+    for timed_code in ["6543", "2424", "4565"]:
+        timed_code_index = get_code_space().code_to_index(timed_code)
+        timed_player = ComputerPlayer(None, use_guess_cache=False, time_limit=move_time_limit)
+        timed_guess = timed_player.propose()
+        timed_player.observe(get_code_space().response_index(timed_code_index, timed_guess))
+        while not timed_player.solved:
+            move_start = time.perf_counter()
+            timed_guess = timed_player.propose()
+            slowest_move = max(slowest_move, time.perf_counter() - move_start)
+            timed_player.observe(get_code_space().response_index(timed_code_index, timed_guess))
+    print("Slowest move with a time limit of " + str(move_time_limit) + " seconds: " + str(slowest_move) +
+          " seconds")
+    if slowest_move <= 5 * move_time_limit:
+        print("Every move kept to the time limit.\n")
+        solved_boards += 1
+    else:
+        print("Computer player took too long for a move\n")
+        unsolved_boards += 1
+
+    # solve with decision tree files that cannot be read or are corrupt, every guess should be searched for instead
+    corrupt_tree_directory = tempfile.mkdtemp()
+    corrupt_tree_file = os.path.join(corrupt_tree_directory, KNUTH_TREE_FILE_NAME)
+    with open(corrupt_tree_file, "wb") as bad_file:
+        bad_file.write(b"MMDT")
+    for bad_tree_name, bad_tree_file in [("cannot be read", os.path.join(os.devnull, KNUTH_TREE_FILE_NAME)),
+                                         ("is corrupt", corrupt_tree_file)]:
+        bad_tree_board = Board("6543")
+        bad_tree_player = ComputerPlayer(bad_tree_board, use_decision_tree=True, decision_tree_file=bad_tree_file)
+        print("Code with a decision tree file that " + bad_tree_name + ": 6543")
+        bad_tree_solve_time = bad_tree_player.solve()
+        if bad_tree_board.solved:
+            print("Solved in " + str(bad_tree_solve_time) + " seconds.\n")
+            solved_boards += 1
+        else:
+            print("Computer player did not successfully break the code\n")
+            unsolved_boards += 1
+    os.remove(corrupt_tree_file)
+    os.rmdir(corrupt_tree_directory)
+
+    # the decision tree for Donald Knuth's five-guess algorithm is only for four pegs and six colours
+    try:
+        ComputerPlayer(Board("12345", 5, 8), use_decision_tree=True)
+        print("Computer player was made with a decision tree for the wrong number of pegs and colours\n")
+        unsolved_boards += 1
+    except Exception:
+        pass
+
+    # play one guess at a time without a board, the guesses should be the same as solve()'s
+    for use_tree in [False, True]:
+        step_code = example_codes[rand.randrange(len(example_codes))]
+        step_board = Board(step_code)
+        ComputerPlayer(step_board, use_decision_tree=use_tree).solve(verbose=False)
+        print("Code played one guess at a time" + (" with the decision tree" if use_tree else "") + ": " + step_code)
+        step_code_index = get_code_space().code_to_index(step_code)
+        step_guesses = []
+        step_computer_player = ComputerPlayer(None, use_decision_tree=use_tree)
+        step_game = step_computer_player.play()
+        step_guess = next(step_game)
+        while True:
+            step_guesses.append(step_guess)
+            try:
+                step_guess = step_game.send(get_code_space().response_index(step_code_index, step_guess))
+            except StopIteration:
+                break
+        if step_guesses == list(step_board.guess_indexes) and step_computer_player.solved:
+            print("Solved with the same guesses as solve().\n")
+            solved_boards += 1
+        else:
+            print("Computer player did not make the same guesses as solve()\n")
+            unsolved_boards += 1
+
     print("Number of solved boards: " + str(solved_boards))
     print("Number of unsolved boards: " + str(unsolved_boards))
@@ -0,0 +1,281 @@
+"""
+Code Written by Jackson L. Davis
+
+This class is for a decision tree that holds a whole codebreaking strategy.
+Each node of the tree is a guess, and each node has a child for every response that the guess can get
+(except for the winning response, ex. (4, 0), which ends the game). A computer player can play from a decision tree
+by making the guess at the root, then moving to the child for the response it gets, and so on, without searching for
+guesses at all.
+
+The tree is stored as two arrays of integers: the guess (a code index) at each node, and for each node the index of
+the child node for each response index. The root is node 0, so a child index of 0 means there is no child.
+On disk, the file is a header followed by the two arrays, with every integer stored as four little-endian bytes.
+The header holds the number of pegs and colours, so a tree file can be made for any code space (see codes.py).
+"""
+
+from codes import COLOUR_SYMBOLS, get_code_space
+from feedback_table import FILE_MODE
+from array import array
+import os
+import sys
+import tempfile
+
+TREE_VERSION = 1
+TREE_MAGIC = b"MMDT"
+
+
+class DecisionTreeFormatError(ValueError):
+    """
+    The error DecisionTree.load() raises for a file that is not a whole tree file for this version
+    """
+    pass
+
+
+def tree_header(code_space):
+    """
+    Get the header at the start of a tree file for a code space
+    :param code_space: a code space (see codes.py)
+    :return: magic, version, pegs, colours, number of responses
+    """
+    return TREE_MAGIC + bytes([TREE_VERSION, code_space.pegs, code_space.colours, code_space.number_of_responses])
+
+
+class DecisionTree:
+
+    def __init__(self, guesses, children, code_space=None):
+        """
+        Constructor method for the decision tree
+        :param guesses: an array of code indexes where guesses[n] is the guess at node n
+        :param children: an array of node indexes where children[n * (number of responses) + r] is the child of
+                         node n for the response with index r, or 0 if there is no child
+        :param code_space: the code space of the guesses, or None for four pegs and six colours
+        :precond: len(children) == len(guesses) * code_space.number_of_responses
+        """
+        if code_space is None:
+            code_space = get_code_space()
+        else:
+            pass
+        if len(children) != len(guesses) * code_space.number_of_responses:
+            raise Exception("Cannot make DecisionTree, the number of children does not match the number of guesses.")
+        else:
+            pass
+
+        self.__guesses = guesses
+        self.__children = children
+        self.__code_space = code_space
+        self.__number_of_responses = code_space.number_of_responses
+
+    @property
+    def code_space(self):
+        return self.__code_space
+
+    @property
+    def root(self):
+        return 0
+
+    @property
+    def number_of_nodes(self):
+        return len(self.__guesses)
+
+    def guess(self, node):
+        """
+        Get the guess at a node
+        :param node: the index of a node
+        :return: the index of the code to guess at node
+        """
+        return self.__guesses[node]
+
+    def child(self, node, resp):
+        """
+        Get the node to move to after the guess at a node gets a response
+        :param node: the index of a node
+        :param resp: the index of the response to the guess at node
+        :return: the index of the child node, or None if the strategy has no move for resp
+        """
+        child = self.__children[node * self.__number_of_responses + resp]
+        if child == 0:
+            return None
+        else:
+            return child
+
+    def depth(self, node=0):
+        """
+        Find the most guesses the strategy can need from a node onwards
+        :param node: the index of a node
+        :return: the largest number of guesses the strategy makes from node, counting the guess at node
+        """
+        deepest = 0
+        for r in range(self.__number_of_responses):
+            child = self.child(node, r)
+            if child is not None:
+                deepest = max(deepest, self.depth(child))
+            else:
+                pass
+        return deepest + 1
+
+    def save(self, path):
+        """
+        Write the decision tree to a file.
+        The tree is written to a temporary file first and then moved into place,
+        so another process can never load a tree that is only partly written.
+        The file is given FILE_MODE, so every user can load it like a feedback table (see feedback_table.py).
+        :param path: the path of the tree file
+        """
+        guesses = array("I", self.__guesses)
+        children = array("I", self.__children)
+        if sys.byteorder == "big":
+            guesses.byteswap()
+            children.byteswap()
+        else:
+            pass
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_file = tempfile.NamedTemporaryFile(dir=directory, delete=False)
+        try:
+            with temp_file:
+                temp_file.write(tree_header(self.__code_space))
+                temp_file.write(len(guesses).to_bytes(4, "little"))
+                guesses.tofile(temp_file)
+                children.tofile(temp_file)
+            os.chmod(temp_file.name, FILE_MODE)
+            os.replace(temp_file.name, path)
+        except BaseException:
+            os.remove(temp_file.name)
+            raise
+
+    @staticmethod
+    def load(path):
+        """
+        Read a decision tree from a file
+        :param path: the path of a tree file written by save()
+        :return: the decision tree
+        :raises DecisionTreeFormatError: if the file is not a whole tree file for this version
+        """
+        with open(path, "rb") as tree_file:
+            header = tree_file.read(len(TREE_MAGIC) + 4)
+            if len(header) != len(TREE_MAGIC) + 4 or header[:len(TREE_MAGIC) + 1] != TREE_MAGIC + bytes([TREE_VERSION]):
+                raise DecisionTreeFormatError("Cannot load DecisionTree, " + path +
+                                              " is not a tree file for this version.")
+            elif header[-3] < 1 or header[-2] < 2 or header[-2] > len(COLOUR_SYMBOLS):
+                raise DecisionTreeFormatError("Cannot load DecisionTree, " + path +
+                                              " has a number of pegs or colours that no code space has.")
+            else:
+                pass
+            code_space = get_code_space(header[-3], header[-2])
+            if header != tree_header(code_space):
+                raise DecisionTreeFormatError("Cannot load DecisionTree, " + path +
+                                              " has the wrong number of responses.")
+            else:
+                pass
+            number_of_nodes = int.from_bytes(tree_file.read(4), "little")
+            guesses = array("I")
+            children = array("I")
+            try:
+                guesses.fromfile(tree_file, number_of_nodes)
+                children.fromfile(tree_file, number_of_nodes * code_space.number_of_responses)
+            except (EOFError, ValueError):
+                # fromfile() raises ValueError if the file ends partway through an integer
+                raise DecisionTreeFormatError("Cannot load DecisionTree, " + path + " is cut short.") from None
+        if sys.byteorder == "big":
+            guesses.byteswap()
+            children.byteswap()
+        else:
+            pass
+        if number_of_nodes == 0 or max(guesses) >= code_space.number_of_codes or max(children) >= number_of_nodes:
+            raise DecisionTreeFormatError("Cannot load DecisionTree, " + path +
+                                          " has a guess or a child that is out of range.")
+        else:
+            pass
+        return DecisionTree(guesses, children, code_space)
+
+    @staticmethod
+    def build(make_player, first_guess, code_space=None):
+        """
+        Build the decision tree for a deterministic strategy by visiting every position the strategy can reach.
+        Each position is visited once, no matter how many codes lead to it.
+        :param make_player: a function that takes a list of (guess, response) tuples and returns a computer player
+                            that has already seen those guesses and responses, the player's next_guess() picks the
+                            guess for the position and its get_partition() finds the responses the guess can get
+        :param first_guess: the index of the code to guess at the root
+        :param code_space: the code space the strategy plays in, or None for four pegs and six colours
+        :return: the decision tree
+        """
+        if code_space is None:
+            code_space = get_code_space()
+        else:
+            pass
+        number_of_responses = code_space.number_of_responses
+        guesses = array("I", [first_guess])
+        children = array("I", [0] * number_of_responses)
+        # each item is (node, history), where history is the list of guesses and responses that leads to node
+        to_visit = [(0, [])]
+        while len(to_visit) > 0:
+            node, history = to_visit.pop()
+            player = make_player(history)
+            if node != 0:
+                guesses[node] = player.next_guess()
+            else:
+                pass
+            for resp in sorted(player.get_partition(guesses[node])):
+                if resp != code_space.winning_response:
+                    child = len(guesses)
+                    guesses.append(0)  # the child's guess is filled in when the child is visited
+                    children.extend([0] * number_of_responses)
+                    children[node * number_of_responses + resp] = child
+                    to_visit.append((child, history + [(guesses[node], resp)]))
+                else:
+                    pass
+        return DecisionTree(guesses, children, code_space)
+
+
+if __name__ == '__main__':
+    from board import Board
+    from computer_player import build_knuth_tree, knuth_tree_path
+    import time as time
+
+    print("Building the decision tree for Donald Knuth's five-guess algorithm.")
+    start_time = time.time()
+    knuth_tree = build_knuth_tree()
+    knuth_tree.save(knuth_tree_path())
+    print("Built a tree with " + str(knuth_tree.number_of_nodes) + " nodes in " +
+          str(time.time() - start_time) + " seconds.")
+    print("Saved the tree to " + knuth_tree_path())
+
+    # play every code by walking the tree that was saved
+    print("Testing decision_tree.py")
+    errors = 0
+    loaded_tree = DecisionTree.load(knuth_tree_path())
+    if loaded_tree.depth() != 5:
+        print("Error: the tree should never need more than five guesses.")
+        errors += 1
+    else:
+        pass
+    for c in range(loaded_tree.code_space.number_of_codes):
+        test_board = Board(c)
+        current_node = loaded_tree.root
+        while current_node is not None and not test_board.solved:
+            test_board.add_guess(loaded_tree.guess(current_node))
+            current_node = loaded_tree.child(current_node, test_board.response_indexes[-1])
+        if not test_board.solved:
+            print("Error: the tree did not break the code " + test_board.code)
+            errors += 1
+        else:
+            pass
+
+    # a file that is not a whole tree file should raise DecisionTreeFormatError
+    with open(knuth_tree_path(), "rb") as test_tree_file:
+        tree_bytes = test_tree_file.read()
+    for test_name, test_bytes in [("garbage", b"not a tree file"), ("truncated", tree_bytes[:len(tree_bytes) // 2]),
+                                  ("old version", TREE_MAGIC + bytes([0]) + tree_bytes[len(TREE_MAGIC) + 1:])]:
+        with tempfile.NamedTemporaryFile(delete=False) as test_tree_file:
+            test_tree_file.write(test_bytes)
+        try:
+            DecisionTree.load(test_tree_file.name)
+            print("Error: a " + test_name + " tree file was loaded.")
+            errors += 1
+        except DecisionTreeFormatError:
+            pass
+        finally:
+            os.remove(test_tree_file.name)
+    print("Finished testing with " + str(errors) + " errors.")
@@ -0,0 +1,341 @@
+"""
+Code Written by Jackson L. Davis
+
+This class is for a feedback table used by the computer player.
+The feedback table stores the response for every pair of codes, so that a response never has to be worked out
+more than once.
+
+The table is generated the first time it is needed and saved to a versioned file. After that, the file is
+memory-mapped read-only, so every computer player in a process (and every process on the machine) reads the same
+copy of the table instead of making its own.
+
+The table file can be read by every user, so worker processes that run as other users can map it too. If the table
+cannot be generated, ex. because its directory cannot be written to, the code space is used without a table, the
+same as a code space that is too big for one.
+
+There is one table for each code space (see codes.py) that is small enough, since the table for n codes takes n * n
+bytes. Codes and responses are used as integers, and each response is stored as one byte.
+The response for the code with index i and the guess with index j is the byte at i * (number of codes) + j
+(after the header). Since a response does not change if the code and the guess are swapped, row j of the table
+is also the list of responses every code would give to the guess with index j, which is what lets responses() find
+the responses for one guess and many codes in a single call.
+
+A row can also be turned into one bitset of codes (see codes.py) for each response, these are the masks for the guess.
+The masks for a guess are only made the first time they are needed, and then kept for every computer player in the
+process to use.
+"""
+
+from codes import get_code_space
+import mmap
+import operator
+import os
+import tempfile
+
+TABLE_VERSION = 1
+# code spaces with more codes than this do not get a feedback table, 4096 codes makes a 16 MB table
+MAX_TABLE_CODES = 4096
+# generated files can be read by every user and written by their owner
+FILE_MODE = 0o644
+
+# MASK_TRANSLATIONS[r] turns each byte of a row into the character "1" if it is the response with index r,
+# or "0" if it is not, for use with bytes.translate()
+MASK_TRANSLATIONS = [bytes(ord("1") if b == r else ord("0") for b in range(256)) for r in range(256)]
+
+
+def table_file_name(code_space):
+    """
+    Get the name of the table file for a code space
+    :param code_space: a code space (see codes.py)
+    :return: the file name, ex. "feedback_table_v1_4x6.bin" for four pegs and six colours
+    """
+    return ("feedback_table_v" + str(TABLE_VERSION) + "_" + str(code_space.pegs) + "x" + str(code_space.colours) +
+            ".bin")
+
+
+def table_header(code_space):
+    """
+    Get the header at the start of the table file for a code space
+    :param code_space: a code space (see codes.py)
+    :return: magic, version, pegs, colours, padding
+    """
+    return b"MMFB" + bytes([TABLE_VERSION, code_space.pegs, code_space.colours, 0])
+
+
+class FeedbackTable:
+
+    def __init__(self, path, code_space=None):
+        """
+        Constructor method for the feedback table, the table file is generated first if it is missing or out of date
+        :param path: the path of the table file
+        :param code_space: the code space the table is for, or None for four pegs and six colours
+        :precond: code_space has at most MAX_TABLE_CODES codes
+        """
+        if code_space is None:
+            code_space = get_code_space()
+        else:
+            pass
+        if code_space.number_of_codes > MAX_TABLE_CODES:
+            raise Exception("Cannot make FeedbackTable, the code space has more than " + str(MAX_TABLE_CODES) +
+                            " codes.")
+        else:
+            pass
+        if not self.is_valid_file(path, code_space):
+            self.generate(path, code_space)
+        else:
+            pass
+
+        self.__path = path
+        self.__code_space = code_space
+        self.__number_of_codes = code_space.number_of_codes
+        with open(path, "rb") as table_file:
+            self.__table = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__offset = len(table_header(code_space))
+        self.__masks = [None] * self.__number_of_codes  # the masks for each guess, made when they are first needed
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def code_space(self):
+        return self.__code_space
+
+    def response_index(self, code, guess):
+        """
+        Look up a response in the table
+        :param code: the index of a code
+        :param guess: the index of a guess for code
+        :return: the index of the response
+        """
+        return self.__table[self.__offset + code * self.__number_of_codes + guess]
+
+    def responses(self, guess, codes):
+        """
+        Look up the responses for one guess and many codes in a single call.
+        The guess's row is copied out of the table once, and the codes are looked up in it with
+        operator.itemgetter, so there is no Python-level loop over codes.
+        :param guess: the index of a guess
+        :param codes: a list of code indexes that each stand in as the code
+        :return: a tuple of the indexes of the responses, in the same order as codes
+        """
+        if len(codes) == 0:
+            return ()
+        elif len(codes) == 1:
+            return (self.response_index(codes[0], guess),)
+        else:
+            start = self.__offset + guess * self.__number_of_codes
+            return operator.itemgetter(*codes)(self.__table[start:start + self.__number_of_codes])
+
+    def masks(self, guess):
+        """
+        Get the masks for a guess, where the mask for a response is the bitset of every code that would give that
+        response to the guess.
+        Each mask is made by translating the guess's row into a string of "0"s and "1"s and reading it as a binary
+        number, so there is no Python-level loop over codes.
+        :param guess: the index of a guess
+        :return: a tuple where item r is the mask for the response with index r
+        """
+        guess_masks = self.__masks[guess]
+        if guess_masks is None:
+            start = self.__offset + guess * self.__number_of_codes
+            reversed_row = self.__table[start:start + self.__number_of_codes][::-1]  # so that code 0 is the lowest bit
+            guess_masks = tuple(int(reversed_row.translate(MASK_TRANSLATIONS[r]), 2)
+                                for r in range(self.__code_space.number_of_responses))
+            self.__masks[guess] = guess_masks
+        else:
+            pass
+        return guess_masks
+
+    @staticmethod
+    def is_valid_file(path, code_space):
+        """
+        Determine whether path is a table file that was generated for this version of the table and this code space
+        :param path: the path of a table file
+        :param code_space: the code space the table should be for
+        :return: True if the file can be used, False otherwise
+        """
+        header = table_header(code_space)
+        try:
+            if os.path.getsize(path) != len(header) + code_space.number_of_codes * code_space.number_of_codes:
+                return False
+            else:
+                with open(path, "rb") as table_file:
+                    return table_file.read(len(header)) == header
+        except OSError:
+            return False
+
+    @staticmethod
+    def generate(path, code_space):
+        """
+        Work out every response and write the table to a file.
+        The table is written to a temporary file first and then moved into place,
+        so another process can never map a table that is only partly written.
+        A temporary file can only be read by its owner, so it is given FILE_MODE before it is moved.
+        :param path: the path of the table file
+        :param code_space: the code space the table is for
+        :postcond: path is a valid table file for code_space that every user can read
+        """
+        all_codes = range(code_space.number_of_codes)
+        table = bytearray()
+        for guess in all_codes:
+            table.extend(code_space.response_indexes(guess, all_codes))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_file = tempfile.NamedTemporaryFile(dir=directory, delete=False)
+        try:
+            with temp_file:
+                temp_file.write(table_header(code_space))
+                temp_file.write(table)
+            os.chmod(temp_file.name, FILE_MODE)
+            os.replace(temp_file.name, path)
+        except BaseException:
+            os.remove(temp_file.name)
+            raise
+
+
+_shared_tables = {}  # the feedback table for each code space that has one, by (pegs, colours)
+
+
+def get_table_directory():
+    """
+    Get the directory that generated files like the feedback table are kept in.
+    This is the directory named by the MASTERMIND_TABLE_DIR environment variable,
+    or the directory this file is in if that variable is not set.
+    :return: the path of the directory
+    """
+    return os.environ.get("MASTERMIND_TABLE_DIR", os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_feedback_table(code_space=None):
+    """
+    Get the feedback table for a code space that is shared by every computer player in this process.
+    The table file is kept in the directory from get_table_directory().
+    :param code_space: a code space (see codes.py), or None for four pegs and six colours
+    :return: the shared feedback table, or None if the code space has more than MAX_TABLE_CODES codes or its table
+             file cannot be read or generated
+    """
+    if code_space is None:
+        code_space = get_code_space()
+    else:
+        pass
+    key = (code_space.pegs, code_space.colours)
+    if key not in _shared_tables:
+        if code_space.number_of_codes <= MAX_TABLE_CODES:
+            try:
+                _shared_tables[key] = FeedbackTable(os.path.join(get_table_directory(), table_file_name(code_space)),
+                                                    code_space)
+            except OSError:
+                # the computer players work out responses instead, like they do for code spaces without a table
+                _shared_tables[key] = None
+        else:
+            _shared_tables[key] = None
+    else:
+        pass
+    return _shared_tables[key]
+
+
+if __name__ == '__main__':
+    print("Testing feedback_table.py")
+    bad_responses = 0
+
+    feedback_table = get_feedback_table()
+    standard_space = feedback_table.code_space
+    code_to_index = standard_space.code_to_index
+    index_to_code = standard_space.index_to_code
+    number_of_codes = standard_space.number_of_codes
+    print("Table file: " + feedback_table.path)
+
+    # every response in the table should match response_index()
+    for c in range(number_of_codes):
+        for g in range(number_of_codes):
+            if feedback_table.response_index(c, g) != standard_space.response_index(c, g):
+                print("Bad response for code " + index_to_code(c) + " and guess " + index_to_code(g))
+                bad_responses += 1
+            else:
+                pass
+
+    # responses() should match response_indexes() for each code
+    all_codes = list(range(number_of_codes))
+    for g in ["1122", "1234", "6543", "5555"]:
+        table_responses = list(feedback_table.responses(code_to_index(g), all_codes))
+        if table_responses != standard_space.response_indexes(code_to_index(g), all_codes):
+            print("Bad responses for guess " + g)
+            bad_responses += 1
+        else:
+            pass
+
+    # masks() should hold each code under the response it gives
+    for g in ["1122", "1234", "6543", "5555"]:
+        g_masks = feedback_table.masks(code_to_index(g))
+        for c in range(number_of_codes):
+            if (g_masks[feedback_table.response_index(c, code_to_index(g))] >> c) & 1 != 1:
+                print("Bad mask for guess " + g + " and code " + index_to_code(c))
+                bad_responses += 1
+            else:
+                pass
+        if sum(m.bit_count() for m in g_masks) != number_of_codes:
+            print("Bad masks for guess " + g)
+            bad_responses += 1
+        else:
+            pass
+
+    # the examples from board.py
+    test_pairs = [("1234", "1523"), ("1234", "2341"), ("1234", "1234"), ("1234", "5555"),
+                  ("1234", "1111"), ("1234", "5111"), ("2111", "1654")]
+    test_responses = [(1, 2), (0, 4), (4, 0), (0, 0), (1, 0), (0, 1), (0, 1)]
+    for p in range(len(test_pairs)):
+        resp = feedback_table.response_index(code_to_index(test_pairs[p][0]), code_to_index(test_pairs[p][1]))
+        if standard_space.index_to_response(resp) != test_responses[p]:
+            print("Bad response for code " + test_pairs[p][0] + " and guess " + test_pairs[p][1])
+            bad_responses += 1
+        else:
+            pass
+
+    # a smaller code space gets its own table
+    small_table = get_feedback_table(get_code_space(3, 4))
+    small_space = small_table.code_space
+    for c in range(small_space.number_of_codes):
+        for g in range(small_space.number_of_codes):
+            if small_table.response_index(c, g) != small_space.response_index(c, g):
+                print("Bad response in the 3 peg 4 colour table for code " + small_space.index_to_code(c) +
+                      " and guess " + small_space.index_to_code(g))
+                bad_responses += 1
+            else:
+                pass
+    if get_feedback_table(get_code_space(6, 9)) is not None:
+        print("Error: a feedback table was made for a code space that is too big.")
+        bad_responses += 1
+    else:
+        pass
+
+    # a generated table file can be read by every user
+    import tempfile
+    with tempfile.TemporaryDirectory() as test_directory:
+        test_path = os.path.join(test_directory, table_file_name(get_code_space(2, 2)))
+        FeedbackTable(test_path, get_code_space(2, 2))
+        if os.stat(test_path).st_mode & 0o777 != FILE_MODE:
+            print("Error: the table file has mode " + oct(os.stat(test_path).st_mode & 0o777) + " instead of " +
+                  oct(FILE_MODE))
+            bad_responses += 1
+        else:
+            pass
+
+        # a table directory that cannot be made means no table, not an exception
+        blocking_file = os.path.join(test_directory, "not_a_directory")
+        open(blocking_file, "w").close()
+        old_directory = os.environ.get("MASTERMIND_TABLE_DIR")
+        os.environ["MASTERMIND_TABLE_DIR"] = os.path.join(blocking_file, "tables")
+        try:
+            if get_feedback_table(get_code_space(2, 5)) is not None:
+                print("Error: a feedback table was made in a directory that cannot be written to.")
+                bad_responses += 1
+            else:
+                pass
+        finally:
+            if old_directory is None:
+                del os.environ["MASTERMIND_TABLE_DIR"]
+            else:
+                os.environ["MASTERMIND_TABLE_DIR"] = old_directory
+
+    print("Finished testing with " + str(bad_responses) + " bad responses.")
@@ -0,0 +1,577 @@
+"""
+Code Written by Jackson L. Davis
+
+This file is for a game server that hosts many games of Mastermind at once from one process.
+Clients connect to a local socket and send one JSON object on each line, and the server answers each one with one
+JSON object on a line, in order. Each request has an "op", and can have an "id" that is sent back with the answer.
+
+{"op": "new", "mode": "codebreaker"} starts a game where the client breaks a random code.
+{"op": "new", "mode": "codemaker", "code": "1234"} starts a game where a computer player breaks the client's code.
+The code is random if it is left out. Both can also have "pegs" and "colours", and a codemaker game can have a
+"strategy" (see strategies.py). The answer has the "session" to use for the rest of the game.
+
+{"op": "guess", "session": ..., "guess": "1122"} makes a guess in a codebreaker game.
+{"op": "move", "session": ...} has the computer player make its next guess in a codemaker game.
+Both answer with the guess, the "response" as [black, white], whether the game is "solved", and the number of
+"guesses_left". Once the game is over, the code is sent and the game is removed from the server.
+
+{"op": "close", "session": ...} ends a game, and {"op": "metrics"} gets the server's metrics.
+An answer always has "ok", and if "ok" is false it has an "error" instead. A line longer than MAX_LINE_BYTES is
+answered with an error and the rest of it is thrown away.
+
+The event loop only handles the sockets and the boards. Each computer player move is worked out in a process pool,
+from the guesses and responses made so far (see find_computer_guess()), so a slow move never holds up other games.
+A move that takes longer than the move timeout ends its game, and games that have not had a request for longer than
+the idle timeout are removed. A process in the pool cannot be stopped part way through a move, so after a timeout the
+process keeps working out that move until it is done, and other moves wait for a free process meanwhile. This is why
+games can have at most MAX_SESSION_CODES codes, where every move takes a bounded amount of work (see
+computer_player.py), and the sizes are checked before anything is built for them.
+
+python game_server.py --port 7755 starts a server, python game_server.py --test tests one, and load_client.py can be
+used to benchmark it.
+"""
+
+from board import Board
+from codes import DEFAULT_PEGS, DEFAULT_COLOURS, COLOUR_SYMBOLS, get_code_space
+from computer_player import ComputerPlayer
+from strategies import DEFAULT_STRATEGY, get_strategy
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import asyncio
+import json
+import os
+import random as rand
+import secrets
+import time
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7755
+# the most seconds a computer player move can take before its game is ended
+DEFAULT_MOVE_TIMEOUT = 30.0
+# the most seconds a game can go without a request before it is removed
+DEFAULT_IDLE_TIMEOUT = 300.0
+# the most games the server hosts at once
+DEFAULT_MAX_SESSIONS = 100000
+# the most codes a game can have, the same as six pegs and nine colours, since bigger code spaces take too long to
+# build and too much memory to keep for every client that asks for one
+MAX_SESSION_CODES = 9 ** 6
+# the number of seconds between looking for idle games
+EVICTION_INTERVAL = 5.0
+# the most bytes a request line can have, longer lines are answered with an error and thrown away
+MAX_LINE_BYTES = 65536
+
+
+def find_computer_guess(pegs, colours, strategy, guess_indexes, response_indexes):
+    """
+    Work out the guess a computer player would make after some guesses and responses.
+    This runs in the server's process pool, where each process keeps its own guess cache, so positions that many
+    games reach are only searched once in each process.
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param strategy: the name of a strategy in STRATEGIES (see strategies.py)
+    :param guess_indexes: a list of the indexes of the guesses made so far
+    :param response_indexes: a list of the indexes of the responses to the guesses
+    :return: the index of the next guess
+    """
+    player = ComputerPlayer(None, pegs=pegs, colours=colours, strategy=strategy)
+    for i in range(len(guess_indexes)):
+        player.record_response(guess_indexes[i], response_indexes[i])
+    return player.propose()
+
+
+class GameSession:
+
+    def __init__(self, session_id, board, mode, strategy=DEFAULT_STRATEGY):
+        """
+        Constructor method for a game hosted by the server
+        :param session_id: the string that the client uses to refer to the game
+        :param board: the decoding board of the game
+        :param mode: "codebreaker" if the client breaks the code, or "codemaker" if a computer player does
+        :param strategy: the strategy of the computer player in a codemaker game
+        """
+        self.__session_id = session_id
+        self.__board = board
+        self.__mode = mode
+        self.__strategy = strategy
+        self.__last_active = time.monotonic()
+        self.__lock = asyncio.Lock()  # only one computer player move is worked out at a time for each game
+
+    @property
+    def session_id(self):
+        return self.__session_id
+
+    @property
+    def board(self):
+        return self.__board
+
+    @property
+    def mode(self):
+        return self.__mode
+
+    @property
+    def strategy(self):
+        return self.__strategy
+
+    @property
+    def last_active(self):
+        return self.__last_active
+
+    @property
+    def lock(self):
+        return self.__lock
+
+    @property
+    def finished(self):
+        return self.__board.solved or len(self.__board.guess_indexes) >= self.__board.max_guesses
+
+    def touch(self):
+        """
+        Mark the game as active now
+        """
+        self.__last_active = time.monotonic()
+
+
+class GameServer:
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, processes=None, move_timeout=DEFAULT_MOVE_TIMEOUT,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, max_sessions=DEFAULT_MAX_SESSIONS):
+        """
+        Constructor method for the game server
+        :param host: the address to listen on
+        :param port: the port to listen on, or 0 for any free port
+        :param processes: the number of processes that work out computer player moves, or None for one for each CPU
+        :param move_timeout: the most seconds a computer player move can take before its game is ended
+        :param idle_timeout: the most seconds a game can go without a request before it is removed
+        :param max_sessions: the most games the server hosts at once
+        """
+        self.__host = host
+        self.__port = port
+        self.__processes = processes if processes is not None else os.cpu_count()
+        self.__move_timeout = move_timeout
+        self.__idle_timeout = idle_timeout
+        self.__max_sessions = max_sessions
+        self.__sessions = {}
+        self.__server = None
+        self.__pool = None
+        self.__eviction_task = None
+        self.__connections = {}  # the writer of each open connection, by the task that handles it
+        self.__start_time = None
+        self.__metrics = {
+            "connections_open": 0,
+            "connections_total": 0,
+            "requests": 0,
+            "errors": 0,
+            "sessions_created": 0,
+            "sessions_finished": 0,
+            "sessions_evicted": 0,
+            "guesses": 0,
+            "moves": 0,
+            "move_timeouts": 0,
+            "move_seconds_total": 0.0,
+            "move_seconds_max": 0.0,
+        }
+
+    @property
+    def port(self):
+        return self.__port
+
+    @property
+    def sessions(self):
+        return self.__sessions
+
+    async def start(self):
+        """
+        Start listening for connections, and start the process pool and the task that removes idle games
+        :postcond: self.__port is the port the server is listening on
+        """
+        self.__pool = ProcessPoolExecutor(max_workers=self.__processes)
+        self.__server = await asyncio.start_server(self.handle_connection, self.__host, self.__port,
+                                                   limit=MAX_LINE_BYTES)
+        self.__port = self.__server.sockets[0].getsockname()[1]
+        self.__start_time = time.monotonic()
+        self.__eviction_task = asyncio.create_task(self.evict_idle_sessions())
+
+    async def serve_forever(self):
+        """
+        Start the server if needed, and handle connections until the server is stopped
+        """
+        if self.__server is None:
+            await self.start()
+        else:
+            pass
+        await self.__server.serve_forever()
+
+    async def stop(self):
+        """
+        Stop listening for connections, close the open connections, and stop the process pool and the task that
+        removes idle games
+        """
+        if self.__eviction_task is not None:
+            self.__eviction_task.cancel()
+        else:
+            pass
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+        else:
+            pass
+        # closing a connection ends its handler the same way as the client disconnecting
+        connection_tasks = list(self.__connections)
+        for writer in self.__connections.values():
+            writer.close()
+        await asyncio.gather(*connection_tasks, return_exceptions=True)
+        if self.__pool is not None:
+            self.__pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            pass
+
+    async def handle_connection(self, reader, writer):
+        """
+        Answer each line a client sends until it disconnects
+        :param reader: the asyncio stream the client's requests come from
+        :param writer: the asyncio stream the answers are written to
+        """
+        self.__metrics["connections_open"] += 1
+        self.__metrics["connections_total"] += 1
+        self.__connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as error:
+                    line = error.partial  # the client disconnected, partway through a line or between lines
+                except asyncio.LimitOverrunError:
+                    # the line is longer than MAX_LINE_BYTES, so it is thrown away and the connection can go on
+                    await self.skip_line(reader)
+                    line = None
+                if line is None:
+                    self.__metrics["requests"] += 1
+                    self.__metrics["errors"] += 1
+                    answer = {"ok": False, "error": "Cannot handle request, the line is too long."}
+                elif len(line) == 0:
+                    break
+                else:
+                    answer = await self.handle_line(line)
+                writer.write((json.dumps(answer) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.__metrics["connections_open"] -= 1
+            del self.__connections[asyncio.current_task()]
+            writer.close()
+
+    async def skip_line(self, reader):
+        """
+        Throw away the rest of a line that is too long, a chunk of at most MAX_LINE_BYTES at a time, so that none of it
+        is taken as the next request
+        :param reader: the asyncio stream the line comes from
+        """
+        while True:
+            try:
+                await reader.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as error:
+                await reader.readexactly(error.consumed)
+            except asyncio.IncompleteReadError:
+                return  # the client disconnected before the end of the line
+
+    async def handle_line(self, line):
+        """
+        Answer one line from a client
+        :param line: the bytes of a JSON object
+        :return: a dictionary to send back to the client
+        """
+        self.__metrics["requests"] += 1
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                # this is also raised for bytes that are not UTF-8
+                raise Exception("Cannot handle request, it is not valid JSON.")
+            if not isinstance(request, dict):
+                raise Exception("Cannot handle request, it is not a JSON object.")
+            else:
+                pass
+            request_id = request.get("id")
+            answer = await self.handle_request(request)
+            answer["ok"] = True
+        except Exception as error:
+            self.__metrics["errors"] += 1
+            answer = {"ok": False, "error": str(error)}
+        if request_id is not None:
+            answer["id"] = request_id
+        else:
+            pass
+        return answer
+
+    async def handle_request(self, request):
+        """
+        Carry out a request
+        :param request: a dictionary with an "op"
+        :return: a dictionary of the results to send back to the client
+        """
+        op = request.get("op")
+        if op == "new":
+            return self.new_session(request)
+        elif op == "guess":
+            return self.make_guess(self.get_session(request), request.get("guess"))
+        elif op == "move":
+            return await self.make_move(self.get_session(request))
+        elif op == "close":
+            return self.close_session(self.get_session(request))
+        elif op == "metrics":
+            return {"metrics": self.metrics()}
+        else:
+            raise Exception("Cannot handle request, " + str(op) + " is not an op.")
+
+    def get_session(self, request):
+        """
+        Find the game a request is for, and mark it as active
+        :param request: a dictionary with a "session"
+        :return: the game
+        """
+        session = self.__sessions.get(request.get("session"))
+        if session is None:
+            raise Exception("Cannot find session, it does not exist or it was removed.")
+        else:
+            session.touch()
+            return session
+
+    def new_session(self, request):
+        """
+        Start a new game
+        :param request: a dictionary with a "mode", and maybe a "code", "pegs", "colours", and "strategy"
+        :return: a dictionary with the "session" and the size of the game
+        """
+        if len(self.__sessions) >= self.__max_sessions:
+            raise Exception("Cannot start a session, the server is full.")
+        else:
+            pass
+        mode = request.get("mode")
+        if mode != "codebreaker" and mode != "codemaker":
+            raise Exception("Cannot start a session, the mode must be codebreaker or codemaker.")
+        else:
+            pass
+        pegs = request.get("pegs", DEFAULT_PEGS)
+        colours = request.get("colours", DEFAULT_COLOURS)
+        if not isinstance(pegs, int) or not isinstance(colours, int) or isinstance(pegs, bool) or \
+                isinstance(colours, bool):
+            raise Exception("Cannot start a session, pegs and colours must be integers.")
+        elif pegs < 1 or colours < 2 or colours > len(COLOUR_SYMBOLS):
+            raise Exception("Cannot start a session, there must be at least one peg and from 2 to " +
+                            str(len(COLOUR_SYMBOLS)) + " colours.")
+        elif pegs >= MAX_SESSION_CODES.bit_length() or colours ** pegs > MAX_SESSION_CODES:
+            # with at least 2 colours, pegs is checked first so that colours ** pegs is never worked out for a huge pegs
+            raise Exception("Cannot start a session, a game can have at most " + str(MAX_SESSION_CODES) + " codes.")
+        else:
+            pass
+        code_space = get_code_space(pegs, colours)
+        code = request.get("code")
+        if mode == "codebreaker" or code is None:
+            code = rand.randrange(code_space.number_of_codes)
+        elif not isinstance(code, str):
+            raise Exception("Cannot start a session, the code must be a string.")
+        else:
+            pass
+        strategy = request.get("strategy", DEFAULT_STRATEGY)
+        if not isinstance(strategy, str):
+            raise Exception("Cannot start a session, the strategy must be a string.")
+        else:
+            get_strategy(strategy)  # throws an exception if there is no such strategy
+        board = Board(code, pegs, colours)
+
+        session_id = secrets.token_hex(8)
+        self.__sessions[session_id] = GameSession(session_id, board, mode, strategy)
+        self.__metrics["sessions_created"] += 1
+        return {"session": session_id, "mode": mode, "pegs": pegs, "colours": colours,
+                "max_guesses": board.max_guesses}
+
+    def make_guess(self, session, guess):
+        """
+        Make the client's guess in a codebreaker game
+        :param session: the game
+        :param guess: a string representing the guess
+        :return: a dictionary of the results of the guess
+        """
+        if session.mode != "codebreaker":
+            raise Exception("Cannot guess, the computer player is the codebreaker in this session.")
+        elif session.finished:
+            raise Exception("Cannot guess, the game is over.")
+        elif not isinstance(guess, str):
+            raise Exception("Cannot guess, the guess must be a string.")
+        else:
+            pass
+        session.board.add_guess(guess)
+        self.__metrics["guesses"] += 1
+        return self.guess_results(session)
+
+    async def make_move(self, session):
+        """
+        Have the computer player make its next guess in a codemaker game.
+        The guess is worked out in the process pool, and the game is ended if that takes longer than the move timeout.
+        The process that was working out a move that timed out is not stopped, it stays busy until the move is done.
+        :param session: the game
+        :return: a dictionary of the results of the guess
+        """
+        if session.mode != "codemaker":
+            raise Exception("Cannot move, the client is the codebreaker in this session.")
+        else:
+            pass
+        async with session.lock:
+            if session.finished:
+                raise Exception("Cannot move, the game is over.")
+            else:
+                pass
+            board = session.board
+            start_time = time.perf_counter()
+            future = asyncio.get_running_loop().run_in_executor(
+                self.__pool, find_computer_guess, board.pegs, board.colours, session.strategy,
+                list(board.guess_indexes), list(board.response_indexes))
+            try:
+                guess = await asyncio.wait_for(future, self.__move_timeout)
+            except asyncio.TimeoutError:
+                self.__metrics["move_timeouts"] += 1
+                self.remove_session(session)
+                raise Exception("Cannot move, the computer player took too long and the session was ended.")
+            move_seconds = time.perf_counter() - start_time
+            self.__metrics["moves"] += 1
+            self.__metrics["move_seconds_total"] += move_seconds
+            self.__metrics["move_seconds_max"] = max(self.__metrics["move_seconds_max"], move_seconds)
+            board.add_guess(guess)
+            session.touch()
+            return self.guess_results(session)
+
+    def guess_results(self, session):
+        """
+        Make the answer for the last guess of a game, and remove the game if it is over
+        :param session: the game
+        :return: a dictionary with the "guess", "response", "solved", "guesses_left", and the "code" if the game is over
+        """
+        board = session.board
+        results = {"guess": board.guesses[-1], "response": list(board.responses[-1]), "solved": board.solved,
+                   "guesses_left": board.max_guesses - len(board.guess_indexes)}
+        if session.finished:
+            results["code"] = board.code
+            self.__metrics["sessions_finished"] += 1
+            self.remove_session(session)
+        else:
+            pass
+        return results
+
+    def close_session(self, session):
+        """
+        End a game
+        :param session: the game
+        :return: a dictionary with the code of the game
+        """
+        self.remove_session(session)
+        return {"code": session.board.code}
+
+    def remove_session(self, session):
+        """
+        Remove a game from the server, if it has not been removed already
+        :param session: the game
+        """
+        self.__sessions.pop(session.session_id, None)
+
+    async def evict_idle_sessions(self):
+        """
+        Remove the games that have not had a request for longer than the idle timeout, every EVICTION_INTERVAL seconds
+        """
+        while True:
+            await asyncio.sleep(min(EVICTION_INTERVAL, self.__idle_timeout))
+            oldest_time = time.monotonic() - self.__idle_timeout
+            idle_sessions = [s for s in self.__sessions.values() if s.last_active < oldest_time and not s.lock.locked()]
+            for session in idle_sessions:
+                self.remove_session(session)
+            self.__metrics["sessions_evicted"] += len(idle_sessions)
+
+    def metrics(self):
+        """
+        Get the server's metrics
+        :return: a dictionary of the counts since the server started, along with the number of games being hosted,
+                 the time the server has been running, and the requests and moves made each second
+        """
+        metrics = dict(self.__metrics)
+        uptime = time.monotonic() - self.__start_time if self.__start_time is not None else 0.0
+        metrics["sessions_active"] = len(self.__sessions)
+        metrics["uptime_seconds"] = uptime
+        metrics["requests_per_second"] = metrics["requests"] / uptime if uptime > 0 else 0.0
+        metrics["moves_per_second"] = metrics["moves"] / uptime if uptime > 0 else 0.0
+        metrics["move_seconds_average"] = metrics["move_seconds_total"] / metrics["moves"] if metrics["moves"] > 0 \
+            else 0.0
+        return metrics
+
+
+async def test_game_server():
+    """
+    Start a game server on a free port and check its answers to a good request, a request that is not JSON, and a
+    line that is too long, followed by another good request
+    :return: the number of errors found
+    """
+    errors = 0
+    test_server = GameServer(port=0, processes=1)
+    await test_server.start()
+    try:
+        reader, writer = await asyncio.open_connection(DEFAULT_HOST, test_server.port)
+        long_line = b'{"op": "metrics", "padding": "' + b"1" * (3 * MAX_LINE_BYTES) + b'"}\n'
+        test_requests = [(b'{"op": "new", "mode": "codebreaker", "id": 1}\n', True, 1),
+                         (b'this is not json\n', False, None),
+                         (long_line, False, None),
+                         (b'{"op": "metrics", "id": 2}\n', True, 2)]
+        answers = []
+        for test_line, expected_ok, expected_id in test_requests:
+            writer.write(test_line)
+            await writer.drain()
+            answer = json.loads(await reader.readline())
+            answers.append(answer)
+            if answer.get("ok") != expected_ok or answer.get("id") != expected_id:
+                print("Error: the answer to " + repr(test_line[:40]) + " was " + str(answer)[:200])
+                errors += 1
+            else:
+                pass
+        # every line was answered once, so none of the long line was taken as another request
+        test_metrics = answers[-1].get("metrics", {})
+        if test_metrics.get("requests") != len(test_requests) or test_metrics.get("errors") != 2:
+            print("Error: the server counted the wrong number of requests or errors, " + str(test_metrics))
+            errors += 1
+        else:
+            pass
+        writer.close()
+        await writer.wait_closed()
+    finally:
+        await test_server.stop()
+    return errors
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Host many games of Mastermind on a local socket.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="the address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="the port to listen on")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="the number of processes that work out computer player moves")
+    parser.add_argument("--move-timeout", type=float, default=DEFAULT_MOVE_TIMEOUT,
+                        help="the most seconds a computer player move can take")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="the most seconds a session can go without a request")
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS,
+                        help="the most sessions hosted at once")
+    parser.add_argument("--test", action="store_true", help="test the server on a free port instead of hosting games")
+    arguments = parser.parse_args()
+
+    if arguments.test:
+        print("Testing game_server.py")
+        print("Finished testing with " + str(asyncio.run(test_game_server())) + " errors.")
+        raise SystemExit
+    else:
+        pass
+
+    game_server = GameServer(arguments.host, arguments.port, arguments.processes, arguments.move_timeout,
+                             arguments.idle_timeout, arguments.max_sessions)
+    print("Listening on " + arguments.host + ":" + str(arguments.port))
+    try:
+        asyncio.run(game_server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,560 @@
+"""
+Code Written by Jackson L. Davis
+
+This class is for a computer player that breaks codes in code spaces that are far too big for ComputerPlayer to go
+through, ex. with eight pegs and ten colours there are 100000000 codes. Instead of keeping every possible code, it
+only keeps the guesses and responses so far, and searches for codes that are consistent with them (codes that would
+have given every response) with a genetic algorithm, like the one by Berghman, Goossens, and Leus:
+https://doi.org/10.1057/jors.2008.150
+
+The search keeps a population of codes. The fitness of a code is how far the responses it would have given are from
+the real responses, adding up the difference in each number of the responses, so a code with a fitness of 0 is
+consistent. Each generation is made from the last one by crossover of two parents that each won a tournament of two
+codes, then random mutation (a peg changes colour), permutation (two pegs swap), and inversion (the pegs between two
+positions are put in reverse order). The fittest codes of each generation are also improved by local search (see
+climb()), since late in a game consistent codes are rare and crossover alone often gets stuck a few pegs away from
+one. Every consistent code the search finds is kept in the eligible set.
+
+The search stops once the eligible set has max_eligible codes or after max_generations generations. The next guess
+is the eligible code that splits the eligible set best with the computer player's strategy (see strategies.py),
+since the eligible set stands in for the possible codes. The search keeps going for up to
+EXTRA_GENERATIONS_FACTOR times as many generations if no consistent code has been found, or until the fitness of
+MAX_SCORED_CODES codes has been worked out, which stops the local search from filling the memory. If the eligible set
+is still not full, consistent codes are rare, and the generations can miss them, so the rest of the eligible set is
+found by going through the codes one peg at a time (see find_consistent_codes()), for up to max_search_nodes pegs.
+So the memory for each guess is bounded by MAX_SCORED_CODES and max_eligible, no matter how big the code space is,
+and the work by those and max_search_nodes, or by the time limit. With eight pegs and ten colours a guess can still
+take a few seconds. If there is still no consistent code, ex. if the search runs out of time, the fittest unused code
+is guessed.
+
+The genetic player has the same propose(), observe(), play(), and solve() methods as ComputerPlayer (see
+codebreaker.py), ex.
+GeneticPlayer(Board("12345678", pegs=8, colours=10)).solve().
+"""
+
+from codebreaker import Codebreaker
+from strategies import get_strategy
+from collections import Counter
+import random as rand
+import time as time
+
+DEFAULT_POPULATION_SIZE = 150
+DEFAULT_MAX_GENERATIONS = 100
+DEFAULT_MAX_ELIGIBLE = 60
+DEFAULT_MAX_SEARCH_NODES = 2000000
+DEFAULT_GENETIC_STRATEGY = "most_parts"
+# the chance that each child is changed in each way
+CROSSOVER_TWO_POINT_RATE = 0.5
+MUTATION_RATE = 0.03
+PERMUTATION_RATE = 0.03
+INVERSION_RATE = 0.02
+# the number of the fittest codes in each generation that are improved by local search, see climb()
+CLIMBS_PER_GENERATION = 10
+# how many times max_generations the search can run for if it has not found a consistent code yet
+EXTRA_GENERATIONS_FACTOR = 4
+# the most codes the fitness is kept for in each search, the generations stop once there are this many
+MAX_SCORED_CODES = 200000
+
+
+class GeneticPlayer(Codebreaker):
+
+    def __init__(self, board, pegs=None, colours=None, seed=None, strategy=DEFAULT_GENETIC_STRATEGY,
+                 population_size=DEFAULT_POPULATION_SIZE, max_generations=DEFAULT_MAX_GENERATIONS,
+                 max_eligible=DEFAULT_MAX_ELIGIBLE, max_search_nodes=DEFAULT_MAX_SEARCH_NODES, time_limit=None,
+                 stats=None, first_guess=None):
+        """
+        Constructor method for the genetic player
+        :param board: a decoding board that the genetic player sends guesses to,
+                      or None if the genetic player is only used to work out guesses
+        :param pegs: the number of pegs in a code, or None to use the board's (four if there is no board)
+        :param colours: the number of colours a peg can be, or None to use the board's (six if there is no board)
+        :param seed: the seed for the genetic algorithm, or None for a random seed
+        :param strategy: the name of a strategy in STRATEGIES (see strategies.py) that is used to choose a guess from
+                         the eligible set, or a function that scores a partition histogram
+        :param population_size: the number of codes in each generation
+        :param max_generations: the most generations to search for each guess once a consistent code has been found
+        :param max_eligible: the most consistent codes to find for each guess
+        :param max_search_nodes: the most pegs to try a colour for when going through the codes for each guess, see
+                                 find_consistent_codes()
+        :param time_limit: the most seconds to search for each guess, or None for no limit
+        :param stats: a SolverStats object (see solver_stats.py) to record statistics in, or None
+        :param first_guess: the first guess as a string or an index, or None to use the code space's first guess
+        """
+        get_strategy(strategy)  # throws an exception if there is no such strategy
+        super().__init__(board, pegs, colours, stats)
+        if population_size < 2 or max_generations < 1 or max_eligible < 1 or max_search_nodes < 0:
+            raise Exception("Cannot make GeneticPlayer, the population size must be at least 2, the generations "
+                            "and eligible codes must be at least 1, and the search nodes cannot be negative.")
+        else:
+            pass
+
+        self.__random = rand.Random(seed)
+        self.__strategy = strategy
+        self.__population_size = population_size
+        self.__max_generations = max_generations
+        self.__max_eligible = max_eligible
+        self.__max_search_nodes = max_search_nodes
+        self.__time_limit = time_limit
+        self.__first_guess = self.code_space.first_guess if first_guess is None else \
+            self.code_space.code_to_index(first_guess)
+        self.__guesses = []    # the index of each guess so far
+        self.__responses = []  # the index of the response to each guess so far
+        # self.__response_distances[r][s] is how far the response with index r is from the response with index s
+        self.__response_distances = tuple(tuple(abs(black - other_black) + abs(white - other_white)
+                                                for other_black, other_white in self.code_space.responses)
+                                          for black, white in self.code_space.responses)
+        self.__eligible_codes = []     # the consistent codes the last search found, in the order they were found
+        self.__generations = 0         # the number of generations the last search took
+        self.__search_complete = True  # False if the last search ran out of time or search nodes
+
+    @property
+    def strategy(self):
+        return self.__strategy
+
+    @property
+    def eligible_codes(self):
+        return list(self.__eligible_codes)
+
+    @property
+    def generations(self):
+        return self.__generations
+
+    @property
+    def search_complete(self):
+        return self.__search_complete
+
+    def choose_guess(self):
+        """
+        Work out the next guess for propose() (see codebreaker.py).
+        The first guess is the same as ComputerPlayer's, ex. 11223344 with eight pegs, and every guess after it comes
+        from next_guess().
+        :return: the index of the next guess
+        """
+        if len(self.__guesses) == 0:
+            return self.__first_guess
+        elif self.stats is not None:
+            start_time = time.perf_counter()
+            guess = self.next_guess()
+            self.stats.record_search(time.perf_counter() - start_time, None, self.__search_complete)
+            return guess
+        else:
+            return self.next_guess()
+
+    def take_response(self, guess, resp):
+        """
+        Take a response that does not break the code into account for observe() (see codebreaker.py), by adding the
+        guess and response to the history
+        :param guess: the index of the code that was guessed
+        :param resp: the index of the response to guess
+        """
+        self.__guesses.append(guess)
+        self.__responses.append(resp)
+
+    def fitness(self, code):
+        """
+        Find how far a code is from being consistent with the guesses and responses so far.
+        The responses of code are worked out with CodeSpace.response_indexes(), the same way
+        ComputerPlayer.simulate_response() works them out without a feedback table. The response to a guess for a
+        code is the same as the response to the code for the guess, so code is looked up once for every guess.
+        :param code: the index of a code
+        :return: the sum over every guess of the difference between the response code would have given and the
+                 real response, counting both numbers in the response, so 0 means code is consistent
+        """
+        distances = self.__response_distances
+        return sum(distances[r][s] for r, s in zip(self.code_space.response_indexes(code, self.__guesses),
+                                                   self.__responses))
+
+    def is_consistent(self, code):
+        """
+        Determine whether a code would have given every response so far
+        :param code: the index of a code
+        :return: True if code is consistent, False otherwise
+        """
+        return self.code_space.response_indexes(code, self.__guesses) == self.__responses
+
+    def next_guess(self):
+        """
+        Search for consistent codes with the genetic algorithm and choose the next guess from them.
+        At least one generation is always searched, even with a time limit.
+        The population starts with the consistent codes from the last search that are still consistent, and random
+        codes for the rest. Each generation is made by breed(), and every unused consistent code in it is added to
+        the eligible set. The generations stop when the eligible set is full, after max_generations generations if it
+        has at least one code (or EXTRA_GENERATIONS_FACTOR times as many if it does not), once MAX_SCORED_CODES
+        codes have been scored, or when the time limit runs out. If the eligible set is not full by then, the rest of
+        it comes from find_consistent_codes().
+        :postcond: self.__eligible_codes, self.__generations, and self.__search_complete are set for this search
+        :return: the index of a code that will be used as the next guess
+        """
+        deadline = None
+        if self.__time_limit is not None:
+            deadline = time.perf_counter() + self.__time_limit
+        else:
+            pass
+        guessed = set(self.__guesses)
+        eligible = [code for code in self.__eligible_codes if code not in guessed and self.is_consistent(code)]
+        eligible_set = set(eligible)
+        population = eligible[:self.__population_size]
+        while len(population) < self.__population_size:
+            population.append(self.__random.randrange(self.code_space.number_of_codes))
+        scores = {}  # the fitness of each code scored during this search
+
+        self.__generations = 0
+        self.__search_complete = True
+        while len(eligible) < self.__max_eligible:
+            max_generations = self.__max_generations * (1 if len(eligible) > 0 else EXTRA_GENERATIONS_FACTOR)
+            if self.__generations >= max_generations or len(scores) >= MAX_SCORED_CODES:
+                break
+            elif self.__generations > 0 and deadline is not None and time.perf_counter() > deadline:
+                self.__search_complete = False
+                break
+            else:
+                pass
+            for code in population:
+                if code not in scores:
+                    scores[code] = self.fitness(code)
+                    if scores[code] == 0 and code not in guessed and code not in eligible_set:
+                        eligible.append(code)
+                        eligible_set.add(code)
+                    else:
+                        pass
+                else:
+                    pass
+            # local search from the fittest codes that are not consistent yet
+            for i in sorted(range(len(population)), key=lambda i: scores[population[i]])[:CLIMBS_PER_GENERATION]:
+                if scores[population[i]] > 0:
+                    climbed = self.climb(population[i], scores)
+                    if scores[climbed] == 0 and climbed not in guessed and climbed not in eligible_set:
+                        eligible.append(climbed)
+                        eligible_set.add(climbed)
+                    else:
+                        pass
+                    population[i] = climbed
+                else:
+                    pass
+            population = self.breed(population, scores)
+            self.__generations += 1
+        if len(eligible) < self.__max_eligible and self.__search_complete:
+            # consistent codes are rare, so the generations can miss some or all of them, and they are few enough to
+            # go through every one of them, see find_consistent_codes()
+            found_codes, self.__search_complete = self.find_consistent_codes(self.__max_eligible - len(eligible),
+                                                                             guessed | eligible_set, deadline,
+                                                                             self.__max_search_nodes)
+            eligible.extend(found_codes)
+        else:
+            pass
+
+        if self.stats is not None:
+            self.stats.count_codes_scored(len(scores))
+            # the fitness of a code works out its response to every guess so far
+            self.stats.count_response_evaluations(len(scores) * len(self.__guesses))
+        else:
+            pass
+        self.__eligible_codes = eligible[:self.__max_eligible]
+        if len(self.__eligible_codes) > 0:
+            return self.choose_from_eligible(self.__eligible_codes)
+        else:
+            pass
+        # no consistent code was found, so guess the fittest code that has not been guessed
+        unguessed_scores = [(score, code) for code, score in scores.items() if code not in guessed]
+        if len(unguessed_scores) > 0:
+            return min(unguessed_scores)[1]
+        elif len(guessed) >= self.code_space.number_of_codes:
+            raise Exception("Cannot choose a guess, every code has already been guessed.")
+        else:
+            # every code that was scored has been guessed, so guess a random code that has not been
+            code = self.__random.randrange(self.code_space.number_of_codes)
+            while code in guessed:
+                code = self.__random.randrange(self.code_space.number_of_codes)
+            return code
+
+    def find_consistent_codes(self, limit, excluded, deadline=None, max_nodes=None):
+        """
+        Find consistent codes by going through the codes one peg at a time, in numeric order, and leaving out every
+        code that starts with pegs that cannot be consistent.
+        For each guess, the number of pegs so far that are the same as the guess's (black) and the number that match
+        a colour of the guess, counting each of the guess's pegs once (black and white), can only go up, by at most
+        1 for each peg, so a start is left out once either number is more than the response or can no longer reach
+        it. Late in a game this leaves out almost every code, ex. with eight pegs and ten colours it tries a colour
+        for up to about 300000 pegs, a few seconds, after five guesses, so next_guess() only uses it when the genetic
+        algorithm finds few consistent codes, and stops it after max_search_nodes pegs.
+        :param limit: the most codes to find
+        :param excluded: a set of the indexes of codes to leave out, ex. the codes that have been guessed
+        :param deadline: the time.perf_counter() time to stop the search at, or None for no limit
+        :param max_nodes: the most pegs to try a colour for, or None for no limit
+        :return: a tuple of a list of the indexes of the consistent codes found, and False if the search ran out of
+                 time or nodes, True otherwise
+        """
+        pegs = self.code_space.pegs
+        colours = self.code_space.colours
+        guess_digits = [self.code_space.digits(guess) for guess in self.__guesses]
+        guess_colour_counts = [[digits.count(colour) for colour in range(colours)] for digits in guess_digits]
+        blacks = [self.code_space.index_to_response(resp)[0] for resp in self.__responses]
+        matches = [sum(self.code_space.index_to_response(resp)) for resp in self.__responses]
+        guess_range = range(len(self.__guesses))
+        black_counts = [0 for i in guess_range]  # the black count so far for each guess
+        match_counts = [0 for i in guess_range]  # the black and white count so far for each guess
+        colour_counts = [0 for colour in range(colours)]  # the number of each colour so far
+        digits = [-1 for peg in range(pegs)]  # the colour of each peg so far, -1 for a peg without a colour yet
+        found_codes = []
+        peg = 0
+        nodes = 0
+        while peg >= 0 and len(found_codes) < limit:
+            if (deadline is not None and time.perf_counter() > deadline) or (max_nodes is not None and
+                                                                              nodes >= max_nodes):
+                return found_codes, False
+            else:
+                pass
+            nodes += 1
+            colour = digits[peg]
+            if colour >= 0:
+                # take the peg's colour back off the counts before trying the next colour
+                colour_counts[colour] -= 1
+                for i in guess_range:
+                    black_counts[i] -= guess_digits[i][peg] == colour
+                    match_counts[i] -= colour_counts[colour] < guess_colour_counts[i][colour]
+            else:
+                pass
+            pegs_left = pegs - 1 - peg
+            colour += 1
+            while colour < colours and not all(
+                    blacks[i] - pegs_left <= black_counts[i] + (guess_digits[i][peg] == colour) <= blacks[i] and
+                    matches[i] - pegs_left <=
+                    match_counts[i] + (colour_counts[colour] < guess_colour_counts[i][colour]) <= matches[i]
+                    for i in guess_range):
+                colour += 1
+            if colour == colours:
+                # no colour works for this peg, so go back to the peg before it
+                digits[peg] = -1
+                peg -= 1
+                continue
+            else:
+                pass
+            for i in guess_range:
+                black_counts[i] += guess_digits[i][peg] == colour
+                match_counts[i] += colour_counts[colour] < guess_colour_counts[i][colour]
+            colour_counts[colour] += 1
+            digits[peg] = colour
+            if peg == pegs - 1:
+                code = self.code_space.digits_to_index(digits)
+                if code not in excluded:
+                    found_codes.append(code)
+                else:
+                    pass
+            else:
+                peg += 1
+        return found_codes, True
+
+    def climb(self, code, scores):
+        """
+        Improve a code by local search: move to the fittest code that differs from it by one peg's colour or by two
+        pegs swapping places, as long as that code is fitter.
+        :param code: the index of a code
+        :param scores: a dictionary of the fitness of codes that have been scored, which the codes scored here are
+                       added to
+        :return: the index of the fittest code found, which has no fitter code one change away
+        """
+        colours = self.code_space.colours
+        best_code = code
+        improved = True
+        while improved and scores[best_code] > 0:
+            improved = False
+            digits = self.code_space.digits(best_code)
+            pegs = len(digits)
+            neighbours = []
+            for peg in range(pegs):
+                place = colours ** (pegs - 1 - peg)
+                neighbours.extend(best_code + (colour - digits[peg]) * place for colour in range(colours)
+                                  if colour != digits[peg])
+                for other_peg in range(peg + 1, pegs):
+                    if digits[peg] != digits[other_peg]:
+                        other_place = colours ** (pegs - 1 - other_peg)
+                        neighbours.append(best_code + (digits[other_peg] - digits[peg]) * (place - other_place))
+                    else:
+                        pass
+            for neighbour in neighbours:
+                if neighbour not in scores:
+                    scores[neighbour] = self.fitness(neighbour)
+                else:
+                    pass
+            fittest = min(neighbours, key=scores.__getitem__)
+            if scores[fittest] < scores[best_code]:
+                best_code = fittest
+                improved = True
+            else:
+                pass
+        return best_code
+
+    def breed(self, population, scores):
+        """
+        Make the next generation from a population.
+        Each child comes from crossover of two parents, each the fitter of two random codes, and is then changed by
+        mutation, permutation, and inversion at random. A child that is already in the next generation is replaced by
+        a random code, so the population does not fill up with copies of one code.
+        :param population: a list of the indexes of the codes in the current generation
+        :param scores: a dictionary with the fitness of every code in population
+        :return: a list of the indexes of the codes in the next generation
+        """
+        pegs = self.code_space.pegs
+        colours = self.code_space.colours
+        children = []
+        children_set = set()
+        while len(children) < self.__population_size:
+            mother = min(self.__random.sample(population, 2), key=scores.__getitem__)
+            father = min(self.__random.sample(population, 2), key=scores.__getitem__)
+            mother_digits = self.code_space.digits(mother)
+            father_digits = self.code_space.digits(father)
+            if pegs > 2 and self.__random.random() < CROSSOVER_TWO_POINT_RATE:
+                start, end = sorted(self.__random.sample(range(1, pegs), 2))
+                digits = list(mother_digits[:start] + father_digits[start:end] + mother_digits[end:])
+            else:
+                point = self.__random.randrange(1, pegs) if pegs > 1 else 0
+                digits = list(mother_digits[:point] + father_digits[point:])
+            if self.__random.random() < MUTATION_RATE:
+                digits[self.__random.randrange(pegs)] = self.__random.randrange(colours)
+            else:
+                pass
+            if pegs > 1 and self.__random.random() < PERMUTATION_RATE:
+                first, second = self.__random.sample(range(pegs), 2)
+                digits[first], digits[second] = digits[second], digits[first]
+            else:
+                pass
+            if pegs > 1 and self.__random.random() < INVERSION_RATE:
+                start, end = sorted(self.__random.sample(range(pegs + 1), 2))
+                digits[start:end] = digits[start:end][::-1]
+            else:
+                pass
+
+            child = self.code_space.digits_to_index(digits)
+            if child in children_set:
+                child = self.__random.randrange(self.code_space.number_of_codes)
+            else:
+                pass
+            children.append(child)
+            children_set.add(child)
+        return children
+
+    def choose_from_eligible(self, eligible_codes):
+        """
+        Choose the eligible code that splits the eligible set best.
+        Each code is scored with the genetic player's strategy on its partition histogram of the eligible set, like
+        ComputerPlayer scores codes against the possible codes, and ties go to the code with the least index.
+        :param eligible_codes: a list of the indexes of consistent codes that have not been guessed
+        :return: the index of the chosen code
+        """
+        score_histogram = get_strategy(self.__strategy)
+        return min(eligible_codes, key=lambda code: (
+            score_histogram(list(Counter(self.code_space.response_indexes(code, eligible_codes)).values())), code))
+
+
+if __name__ == '__main__':
+    from board import Board, MAX_GUESSES
+    from codes import get_code_space
+    from solver_stats import SolverStats
+
+    print("Testing genetic_player.py")
+    errors = 0
+
+    # every guess after the first should be consistent with the responses before it, and each game should be won
+    # within MAX_GUESSES guesses
+    test_games = [(4, 6, 5), (6, 9, 3), (8, 10, 6)]
+    test_random = rand.Random(2024)
+    for test_pegs, test_colours, test_count in test_games:
+        test_space = get_code_space(test_pegs, test_colours)
+        test_guesses = 0
+        test_start = time.time()
+        for g in range(test_count):
+            test_board = Board(test_random.randrange(test_space.number_of_codes), test_pegs, test_colours)
+            test_stats = SolverStats()
+            GeneticPlayer(test_board, seed=g, stats=test_stats).solve(verbose=False)
+            if not test_board.solved or len(test_board.guesses) > MAX_GUESSES:
+                print("Error: the genetic player did not break " + test_board.code + " within " + str(MAX_GUESSES) +
+                      " guesses.")
+                errors += 1
+            else:
+                pass
+            for m in range(1, len(test_board.guesses)):
+                earlier_board = Board(test_board.guess_indexes[m], test_pegs, test_colours)
+                earlier_board.add_guesses(test_board.guess_indexes[:m])
+                if earlier_board.response_indexes != test_board.response_indexes[:m]:
+                    print("Error: guess " + str(m + 1) + " for " + test_board.code + " was not consistent.")
+                    errors += 1
+                else:
+                    pass
+            test_guesses += len(test_board.guesses)
+            slowest = test_stats.slowest_move()
+            if slowest is not None and slowest["seconds"] > 10:
+                print("Error: a move for " + test_board.code + " took " + str(slowest["seconds"]) + " seconds.")
+                errors += 1
+            else:
+                pass
+        print(str(test_pegs) + " pegs and " + str(test_colours) + " colours: " +
+              str(test_guesses / test_count) + " guesses on average, " +
+              str((time.time() - test_start) / test_count) + " seconds a game")
+
+    # going through the codes peg by peg should find exactly the consistent codes, in numeric order
+    for test_pegs, test_colours in [(4, 6), (3, 5)]:
+        test_space = get_code_space(test_pegs, test_colours)
+        test_player = GeneticPlayer(None, pegs=test_pegs, colours=test_colours, seed=0)
+        for test_guess in [0, 7, test_space.number_of_codes - 1]:
+            test_player.take_response(test_guess, test_space.response_index(test_space.number_of_codes // 3,
+                                                                            test_guess))
+        every_consistent = [code for code in range(test_space.number_of_codes) if test_player.is_consistent(code)]
+        if test_player.find_consistent_codes(test_space.number_of_codes, set()) != (every_consistent, True) or \
+                test_player.find_consistent_codes(2, {every_consistent[0]}) != (every_consistent[1:3], True) or \
+                test_player.find_consistent_codes(test_space.number_of_codes, set(), max_nodes=1) != \
+                ([], False):
+            print("Error: find_consistent_codes() did not find the consistent codes with " + str(test_pegs) +
+                  " pegs and " + str(test_colours) + " colours.")
+            errors += 1
+        else:
+            pass
+
+    # the same seed should make the same guesses
+    first_board = Board("918273", 6, 9)
+    second_board = Board("918273", 6, 9)
+    GeneticPlayer(first_board, seed=7).solve(verbose=False)
+    GeneticPlayer(second_board, seed=7).solve(verbose=False)
+    if first_board.guess_indexes != second_board.guess_indexes:
+        print("Error: the same seed did not make the same guesses.")
+        errors += 1
+    else:
+        pass
+
+    # play() should work without a board
+    step_space = get_code_space(6, 9)
+    step_code = step_space.code_to_index("123456")
+    step_game = GeneticPlayer(None, pegs=6, colours=9, seed=1).play()
+    step_guess = next(step_game)
+    step_moves = 1
+    try:
+        while True:
+            step_guess = step_game.send(step_space.response_index(step_code, step_guess))
+            step_moves += 1
+    except StopIteration:
+        pass
+    if step_guess != step_code or step_moves > 10:
+        print("Error: play() did not break the code.")
+        errors += 1
+    else:
+        pass
+
+    # with responses that no code could give, the genetic player should still guess a code it has not guessed
+    for tiny_colours in [2, 3]:
+        tiny_player = GeneticPlayer(None, pegs=1, colours=tiny_colours, seed=3, population_size=2, max_generations=1)
+        tiny_guesses = []
+        try:
+            while len(tiny_guesses) < tiny_colours:
+                tiny_guesses.append(tiny_player.propose())
+                tiny_player.observe((0, 0))
+            tiny_player.propose()
+            print("Error: the genetic player proposed a guess after every code had been guessed.")
+            errors += 1
+        except Exception as error:
+            if len(set(tiny_guesses)) != tiny_colours or "every code" not in str(error):
+                print("Error: the genetic player did not guess every code once with 1 peg and " +
+                      str(tiny_colours) + " colours: " + str(error))
+                errors += 1
+            else:
+                pass
+
+    print("Finished testing with " + str(errors) + " errors.")
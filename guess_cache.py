@@ -0,0 +1,162 @@
+"""
+Code Written by Jackson L. Davis
+
+This class is for a cache of guesses that have already been chosen by computer players.
+Different guesses and responses often leave a computer player with the same possible codes and unused codes, and
+then the computer player would choose the same guess again. The cache remembers the guess chosen for each of those
+positions, so the search only has to be done once for each position in a process.
+
+The cache holds a limited number of positions. When it is full, the position that was used least recently is
+removed to make room (least recently used eviction). Each position is kept by a small digest of its bitsets rather than
+the bitsets themselves, so a full cache stays small even in code spaces with hundreds of thousands of codes.
+"""
+
+from codes import DEFAULT_PEGS, DEFAULT_COLOURS
+from strategies import DEFAULT_STRATEGY
+from collections import OrderedDict
+import hashlib
+import threading
+
+FINGERPRINT_DIGEST_SIZE = 16  # the number of bytes in the digest of a position's bitsets
+
+
+def make_fingerprint(possible_codes, unused_codes, pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS,
+                     strategy=DEFAULT_STRATEGY):
+    """
+    Make a key for a position that is the same for every computer player that has the same possible codes and
+    unused codes, no matter which guesses and responses led to them.
+    A bitset already stands for exactly one set of codes in a code space, but it can be tens of kilobytes in a big
+    code space, so the key holds a blake2b digest of the two bitsets instead. Each bitset is written with the same
+    number of bytes in a code space, so no two positions are written the same way. The number of pegs and colours
+    keep positions from different code spaces apart, and the strategy is in the key since each strategy can choose a
+    different guess for the same position.
+    :param possible_codes: a bitset of the possible codes (see codes.py)
+    :param unused_codes: a bitset of the unused codes
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param strategy: the strategy that chooses the guess (see strategies.py)
+    :return: a tuple that stands for the position, the same size in every code space
+    """
+    mask_bytes = (colours ** pegs + 7) // 8
+    digest = hashlib.blake2b(possible_codes.to_bytes(mask_bytes, "little"), digest_size=FINGERPRINT_DIGEST_SIZE)
+    digest.update(unused_codes.to_bytes(mask_bytes, "little"))
+    return (pegs, colours, strategy, digest.digest())
+
+
+class GuessCache:
+
+    def __init__(self, max_size):
+        """
+        Constructor method for the guess cache
+        :param max_size: the most positions the cache can hold
+        """
+        if max_size < 1:
+            raise Exception("Cannot make GuessCache, max_size must be at least 1.")
+        else:
+            pass
+
+        self.__max_size = max_size
+        self.__guesses = OrderedDict()  # from position key to guess, the least recently used position is first
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return self.__max_size
+
+    @property
+    def size(self):
+        return len(self.__guesses)
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def get(self, key):
+        """
+        Look up the guess for a position
+        :param key: the key for a position, from make_fingerprint()
+        :return: the index of the guess for the position, or None if the position is not in the cache
+        """
+        with self.__lock:
+            guess = self.__guesses.get(key)
+            if guess is None:
+                self.__misses += 1
+            else:
+                self.__hits += 1
+                self.__guesses.move_to_end(key)
+            return guess
+
+    def put(self, key, guess):
+        """
+        Remember the guess for a position
+        :param key: the key for a position, from make_fingerprint()
+        :param guess: the index of the guess for the position
+        :postcond: the position is in the cache, and the cache holds no more than max_size positions
+        """
+        with self.__lock:
+            self.__guesses[key] = guess
+            self.__guesses.move_to_end(key)
+            while len(self.__guesses) > self.__max_size:
+                self.__guesses.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove every position from the cache and set the hit and miss counts back to 0
+        """
+        with self.__lock:
+            self.__guesses.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+
+if __name__ == '__main__':
+    print("Testing guess_cache.py")
+    errors = 0
+
+    test_cache = GuessCache(2)
+    key_a = make_fingerprint(0b1110, 0b11110)
+    key_b = make_fingerprint(0b0110, 0b11110)
+    key_c = make_fingerprint(0b1110, 0b01110)
+
+    if key_a == key_b or key_a == key_c or key_a != make_fingerprint(0b1110, 0b11110) or \
+            key_a == make_fingerprint(0b1110, 0b11110, 5, 8) or \
+            key_a == make_fingerprint(0b1110, 0b11110, 4, 6, "entropy"):
+        print("Error: make_fingerprint() did not make one key for each position.")
+        errors += 1
+    else:
+        pass
+    # the key should not grow with the bitsets, ex. every code of 6 pegs and 9 colours
+    big_mask = (1 << 9 ** 6) - 1
+    if len(make_fingerprint(big_mask, big_mask, 6, 9)[-1]) != FINGERPRINT_DIGEST_SIZE:
+        print("Error: make_fingerprint() made a key that grows with the bitsets.")
+        errors += 1
+    else:
+        pass
+
+    if test_cache.get(key_a) is not None:
+        print("Error: get() found a position in an empty cache.")
+        errors += 1
+    else:
+        pass
+    test_cache.put(key_a, 7)
+    test_cache.put(key_b, 8)
+    test_cache.get(key_a)         # key_a is now used more recently than key_b
+    test_cache.put(key_c, 9)      # so key_b should be evicted
+    if test_cache.get(key_a) != 7 or test_cache.get(key_b) is not None or test_cache.get(key_c) != 9:
+        print("Error: the cache did not evict the least recently used position.")
+        errors += 1
+    else:
+        pass
+    if test_cache.size != 2 or test_cache.hits != 3 or test_cache.misses != 2:
+        print("Error: the cache has the wrong size or counts.")
+        errors += 1
+    else:
+        pass
+
+    print("Finished testing with " + str(errors) + " errors.")
@@ -0,0 +1,246 @@
+"""
+Code Written by Jackson L. Davis
+
+This file is for a load generator that benchmarks the game server (see game_server.py) from the same machine.
+It opens a number of connections, and each connection plays games one after another until the total number of games
+has been played:
+
+in a codemaker game, the client sends a code and asks the server's computer player to move until the game is over.
+
+in a codebreaker game, the client breaks the server's code with its own computer player, which walks the decision
+tree (see decision_tree.py) through ComputerPlayer.play(), so the client spends almost no time choosing guesses.
+
+It reports the games played each second, the requests made each second, the latency of the requests, and the
+server's own metrics, ex.
+python load_client.py --start-server --connections 50 --games 2000
+"""
+
+from codes import get_code_space
+from computer_player import ComputerPlayer, get_decision_tree
+from game_server import DEFAULT_HOST, DEFAULT_PORT, GameServer
+import argparse
+import asyncio
+import json
+import random as rand
+import statistics
+import time
+
+DEFAULT_CONNECTIONS = 20
+DEFAULT_GAMES = 500
+
+
+class LoadClient:
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, mode="codemaker", seed=None):
+        """
+        Constructor method for the load client
+        :param host: the address of the game server
+        :param port: the port of the game server
+        :param mode: "codemaker" if the server's computer player breaks the codes, or "codebreaker" if the client
+                     breaks the server's codes
+        :param seed: the seed for choosing codes, or None for a random seed
+        """
+        self.__host = host
+        self.__port = port
+        self.__mode = mode
+        self.__random = rand.Random(seed)
+        self.__latencies = []  # the seconds each request took to be answered
+        self.__games_played = 0
+        self.__games_solved = 0
+        self.__errors = 0
+
+    @property
+    def latencies(self):
+        return self.__latencies
+
+    @property
+    def games_played(self):
+        return self.__games_played
+
+    @property
+    def games_solved(self):
+        return self.__games_solved
+
+    @property
+    def errors(self):
+        return self.__errors
+
+    async def request(self, reader, writer, request):
+        """
+        Send a request to the server and wait for its answer
+        :param reader: the asyncio stream the answers come from
+        :param writer: the asyncio stream the requests are written to
+        :param request: a dictionary to send
+        :return: the dictionary the server sent back
+        """
+        start_time = time.perf_counter()
+        writer.write((json.dumps(request) + "\n").encode())
+        await writer.drain()
+        answer = json.loads(await reader.readline())
+        self.__latencies.append(time.perf_counter() - start_time)
+        if not answer["ok"]:
+            self.__errors += 1
+        else:
+            pass
+        return answer
+
+    async def play_games(self, games):
+        """
+        Play games on one connection, one after another.
+        If the connection cannot be made or is lost, it is counted as an error and no more games are played on it.
+        :param games: the number of games to play
+        """
+        try:
+            reader, writer = await asyncio.open_connection(self.__host, self.__port)
+        except OSError:
+            self.__errors += 1
+            return
+        try:
+            for g in range(games):
+                if self.__mode == "codemaker":
+                    solved = await self.play_codemaker_game(reader, writer)
+                else:
+                    solved = await self.play_codebreaker_game(reader, writer)
+                self.__games_played += 1
+                if solved:
+                    self.__games_solved += 1
+                else:
+                    pass
+        except (ConnectionError, ValueError):
+            # the server closed the connection, so there was no answer to read
+            self.__errors += 1
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def play_codemaker_game(self, reader, writer):
+        """
+        Send a code and have the server's computer player break it
+        :param reader: the asyncio stream the answers come from
+        :param writer: the asyncio stream the requests are written to
+        :return: True if the code was broken
+        """
+        code = get_code_space().index_to_code(self.__random.randrange(get_code_space().number_of_codes))
+        answer = await self.request(reader, writer, {"op": "new", "mode": "codemaker", "code": code})
+        if not answer["ok"]:
+            return False
+        else:
+            session = answer["session"]
+        while True:
+            answer = await self.request(reader, writer, {"op": "move", "session": session})
+            if not answer["ok"]:
+                return False
+            elif answer["solved"] or answer["guesses_left"] == 0:
+                return answer["solved"]
+            else:
+                pass
+
+    async def play_codebreaker_game(self, reader, writer):
+        """
+        Break the server's code with a computer player that walks the decision tree
+        :param reader: the asyncio stream the answers come from
+        :param writer: the asyncio stream the requests are written to
+        :return: True if the code was broken
+        """
+        answer = await self.request(reader, writer, {"op": "new", "mode": "codebreaker"})
+        if not answer["ok"]:
+            return False
+        else:
+            session = answer["session"]
+        game = ComputerPlayer(None, use_decision_tree=True).play()
+        guess = next(game)
+        while True:
+            answer = await self.request(reader, writer, {"op": "guess", "session": session,
+                                                         "guess": get_code_space().index_to_code(guess)})
+            if not answer["ok"]:
+                return False
+            elif answer["solved"] or answer["guesses_left"] == 0:
+                return answer["solved"]
+            else:
+                guess = game.send(tuple(answer["response"]))
+
+    async def get_server_metrics(self):
+        """
+        Get the game server's metrics on a new connection
+        :return: the dictionary of the server's metrics, or None if the server cannot be reached
+        """
+        try:
+            reader, writer = await asyncio.open_connection(self.__host, self.__port)
+        except OSError:
+            return None
+        try:
+            return (await self.request(reader, writer, {"op": "metrics"}))["metrics"]
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+
+async def run_load(host, port, mode, connections, games, seed=None, start_server=False):
+    """
+    Play games on many connections at once and measure the game server
+    :param host: the address of the game server
+    :param port: the port of the game server, or 0 with start_server to use any free port
+    :param mode: "codemaker" or "codebreaker", see LoadClient
+    :param connections: the number of connections to play games on at once
+    :param games: the total number of games to play, split between the connections
+    :param seed: the seed for choosing codes, or None for a random seed
+    :param start_server: True if a game server should be started in this process first
+    :return: a dictionary of the results
+    """
+    server = None
+    if start_server:
+        server = GameServer(host, port)
+        await server.start()
+        port = server.port
+    else:
+        pass
+    try:
+        client = LoadClient(host, port, mode, seed)
+        start_time = time.perf_counter()
+        await asyncio.gather(*[client.play_games(games // connections + (1 if c < games % connections else 0))
+                               for c in range(connections)])
+        total_seconds = time.perf_counter() - start_time
+        latencies = sorted(client.latencies)
+        return {
+            "mode": mode,
+            "connections": connections,
+            "games_played": client.games_played,
+            "games_solved": client.games_solved,
+            "errors": client.errors,
+            "total_seconds": total_seconds,
+            "games_per_second": client.games_played / total_seconds,
+            "requests_per_second": len(latencies) / total_seconds,
+            # there are no latencies if no request was answered, ex. if every connection failed
+            "latency_median_seconds": statistics.median(latencies) if len(latencies) > 0 else None,
+            "latency_p95_seconds": latencies[int(len(latencies) * 0.95)] if len(latencies) > 0 else None,
+            "latency_max_seconds": latencies[-1] if len(latencies) > 0 else None,
+            "server_metrics": await client.get_server_metrics(),
+        }
+    finally:
+        if server is not None:
+            await server.stop()
+        else:
+            pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the game server with many games at once.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="the address of the game server")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="the port of the game server")
+    parser.add_argument("--mode", choices=["codemaker", "codebreaker"], default="codemaker",
+                        help="codemaker to have the server break codes, codebreaker to break the server's codes")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS,
+                        help="the number of connections to play games on at once")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="the total number of games to play")
+    parser.add_argument("--seed", type=int, default=None, help="the seed for choosing codes")
+    parser.add_argument("--start-server", action="store_true", help="start a game server in this process first")
+    arguments = parser.parse_args()
+
+    if arguments.mode == "codebreaker":
+        get_decision_tree()  # build the decision tree before timing anything, if it has not been saved yet
+    else:
+        pass
+    load_results = asyncio.run(run_load(arguments.host, 0 if arguments.start_server else arguments.port,
+                                        arguments.mode, arguments.connections, arguments.games, arguments.seed,
+                                        arguments.start_server))
+    print(json.dumps(load_results, indent=2))
@@ -13,7 +13,9 @@ The codebreaker has ten tries to break the code.
 """
 
 from board import Board
+from codes import get_code_space
 from computer_player import ComputerPlayer
+from position_analysis import analyse_position
 import random as rand
 
 if __name__ == '__main__':
@@ -57,21 +59,23 @@ if __name__ == '__main__':
         else:
             print("The computer player did not break your code.")
     else:
-        # set up random code
-        code = ""
-        for i in range(4):
-            code += str(rand.randint(1, 6))
-
-        # set up board
-        decoding_board = Board(code)
+        # set up board with a random code, the board is given the code's index
+        decoding_board = Board(rand.randrange(get_code_space().number_of_codes))
 
         # guesses
-        print("You can enter guesses, or press q and enter to quit.")
+        print("You can enter guesses, press h and enter for a hint, or press q and enter to quit.")
         next_guess = ""
         while len(decoding_board.guesses) < decoding_board.max_guesses and not decoding_board.solved:
             next_guess = input("Enter your next guess: ")
             if next_guess == "q":
                 break
+            # hint, the position is analysed from the guesses and responses so far
+            if next_guess == "h":
+                hint = analyse_position(list(zip(decoding_board.guesses, decoding_board.responses)))
+                print("There are " + str(hint["possible_codes"]) + " codes that fit the responses so far.")
+                print("The computer player would guess " + hint["best_guess"] + ", which leaves at most " +
+                      str(hint["largest_part"]) + " of them.")
+                continue
             # add guess and get results
             try:
                 decoding_board.add_guess(next_guess)
@@ -0,0 +1,403 @@
+"""
+Code Written by Jackson L. Davis
+
+This file is for an offline search for the strategy that breaks codes in the fewest guesses on average.
+Donald Knuth's algorithm (see computer_player.py) never needs more than five guesses with four pegs and six colours,
+but it takes about 4.476 guesses on average, and the best average anyone can get is about 4.340 (5625 guesses over
+all 1296 codes).
+
+The search works on sets of possible codes. The cost of a set is the fewest guesses in total it takes to break
+every code in the set, so the strategy with the best average is the one whose first set, every code, has the least
+cost. Guessing a code splits the set into one part for each response (see FeedbackTable.masks()), so the cost of a
+guess is the size of the set (every code takes this guess) plus the cost of each part, not counting the part for the
+winning response. The cost of a set only depends on the set, so the cost and the best guess of each set are kept
+in a dictionary and worked out once.
+
+Most guesses are never fully searched (branch and bound). Each part of a guess has a lower bound on its cost from
+its size alone (see lower_bound()), so a guess can be skipped as soon as the best cost found so far is no more than
+the guess's size plus the lower bounds of its parts, and a part stops being searched as soon as it is clear that the
+guess cannot beat the best cost found so far. Guesses that are symmetric to other guesses after the guesses made
+so far are not searched either (see symmetry.py).
+
+The parts after the first guess are searched in a process pool. A full search can take a long time, so
+max_candidates can limit each set to its most promising guesses by lower bound, which finds a strategy close to the
+best one much faster. With four pegs and six colours on one processor, the full search from the first guess 1123
+finds the best strategy (5625 guesses) in about three minutes, and the search with at most five guesses for each set
+tries every first guess in about three minutes and finds a strategy that takes 5636 guesses.
+
+The strategy is saved as a decision tree file (see decision_tree.py), which a computer player plays from with
+ComputerPlayer(board, use_decision_tree=True, decision_tree_file=path), ex.
+python optimal_tree.py --first-guess 1123 --output optimal_tree_v1_4x6.bin
+Without --output, the file is saved in the same directory as the feedback tables (see get_table_directory()).
+"""
+
+from codes import DEFAULT_PEGS, DEFAULT_COLOURS, get_code_space, mask_to_codes
+from decision_tree import DecisionTree
+from feedback_table import get_feedback_table, get_table_directory
+from symmetry import orbit_representatives
+from array import array
+import argparse
+import os
+import time
+
+
+class OptimalSolver:
+
+    def __init__(self, pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS, max_candidates=None):
+        """
+        Constructor method for the solver
+        :param pegs: the number of pegs in a code
+        :param colours: the number of colours a peg can be
+        :param max_candidates: the most guesses to search for each set of possible codes, taking the guesses with
+                               the least lower bounds first, or None to search every guess, which finds the best
+                               strategy
+        :precond: the code space has a feedback table (see feedback_table.py)
+        """
+        self.__code_space = get_code_space(pegs, colours)
+        self.__feedback_table = get_feedback_table(self.__code_space)
+        if self.__feedback_table is None:
+            raise Exception("Cannot make OptimalSolver, the code space is too big for a feedback table.")
+        else:
+            pass
+        self.__max_candidates = max_candidates
+        self.__winning_response = self.__code_space.winning_response
+        self.__exact_costs = {}   # the cost and the best guess of each set that has been fully searched
+        self.__lower_bounds = {}  # the best known lower bound on the cost of each set that could not be searched
+        # lower bounds for sets of each size, see lower_bound()
+        self.__size_bounds = [0]
+        self.__sets_searched = 0
+
+    @property
+    def code_space(self):
+        return self.__code_space
+
+    @property
+    def max_candidates(self):
+        return self.__max_candidates
+
+    @property
+    def sets_searched(self):
+        return self.__sets_searched
+
+    def lower_bound(self, size):
+        """
+        Find a lower bound on the cost of a set of possible codes from its size alone.
+        Each guess can break at most one code (the one it guesses), and it can get at most (number of responses - 1)
+        other responses, so at best one code is broken with the first guess, (number of responses - 1) codes with
+        the second guess, (number of responses - 1) ** 2 codes with the third guess, and so on.
+        :param size: the number of codes in the set
+        :return: the lower bound, ex. 2 * size - 1 for a set that one guess can split into single codes
+        """
+        while len(self.__size_bounds) <= size:
+            codes_left = len(self.__size_bounds)
+            bound = 0
+            guesses = 1
+            codes_at_level = 1
+            while codes_left > 0:
+                broken = min(codes_left, codes_at_level)
+                bound += broken * guesses
+                codes_left -= broken
+                guesses += 1
+                codes_at_level *= self.__code_space.number_of_responses - 1
+            self.__size_bounds.append(bound)
+        return self.__size_bounds[size]
+
+    def partition(self, possible_codes, guess):
+        """
+        Split a set of possible codes by the response each code would give to a guess, leaving out the part for
+        the winning response and the parts with no codes
+        :param possible_codes: a bitset of the possible codes
+        :param guess: the index of a code
+        :return: a list of bitsets, one for each part
+        """
+        guess_masks = self.__feedback_table.masks(guess)
+        parts = []
+        for r in range(len(guess_masks)):
+            if r != self.__winning_response:
+                part = possible_codes & guess_masks[r]
+                if part != 0:
+                    parts.append(part)
+                else:
+                    pass
+            else:
+                pass
+        return parts
+
+    def candidates(self, possible_codes, guesses):
+        """
+        Find the guesses to search for a set of possible codes, with the lower bound on each one's cost.
+        Guesses that do not split the set are left out, and so are guesses that are symmetric to other guesses
+        after the guesses made so far.
+        :param possible_codes: a bitset of the possible codes
+        :param guesses: a tuple of the indexes of the guesses made so far, in numeric order
+        :return: a list of tuples (lower bound, not possible, guess, parts) in order, so the guess with the least
+                 lower bound is first, with ties broken by possible codes first and then by index
+        """
+        size = possible_codes.bit_count()
+        representatives = orbit_representatives(self.__code_space.pegs, self.__code_space.colours, guesses)
+        candidates = []
+        for guess in mask_to_codes(representatives):
+            parts = self.partition(possible_codes, guess)
+            is_possible = (possible_codes >> guess) & 1 == 1
+            if len(parts) == 1 and not is_possible:
+                pass  # every code gives the same response, so the guess tells nothing
+            else:
+                parts.sort(key=int.bit_count, reverse=True)
+                bound = size + sum(self.lower_bound(part.bit_count()) for part in parts)
+                candidates.append((bound, not is_possible, guess, parts))
+        candidates.sort(key=lambda candidate: candidate[:3])
+        if self.__max_candidates is not None:
+            return candidates[:self.__max_candidates]
+        else:
+            return candidates
+
+    def solve(self, possible_codes, guesses=(), limit=None):
+        """
+        Find the cost and the best guess of a set of possible codes, if its cost is less than limit
+        :param possible_codes: a bitset of the possible codes, which must not be empty
+        :param guesses: a tuple of the indexes of the guesses made so far, in numeric order, these are only used to
+                        skip symmetric guesses
+        :param limit: the cost the set has to beat, or None for no limit
+        :return: a tuple (cost, guess) with the least cost and the guess that gets it, or None if the cost is at
+                 least limit
+        """
+        if limit is None:
+            limit = float("inf")
+        else:
+            pass
+        size = possible_codes.bit_count()
+        if size <= 2:
+            # guess the code with the least index, which breaks one code with one guess and the other with two
+            cost = 2 * size - 1
+            return (cost, (possible_codes & -possible_codes).bit_length() - 1) if cost < limit else None
+        elif possible_codes in self.__exact_costs:
+            cost, guess = self.__exact_costs[possible_codes]
+            return (cost, guess) if cost < limit else None
+        elif max(self.lower_bound(size), self.__lower_bounds.get(possible_codes, 0)) >= limit:
+            return None
+        else:
+            pass
+
+        self.__sets_searched += 1
+        best_cost = limit
+        best_guess = None
+        for bound, not_possible, guess, parts in self.candidates(possible_codes, guesses):
+            if bound >= best_cost:
+                break  # the candidates are in order of lower bound, so no later guess can be better
+            else:
+                pass
+            next_guesses = tuple(sorted(guesses + (guess,)))
+            cost = bound
+            for part in parts:
+                part_bound = self.lower_bound(part.bit_count())
+                # the part has to cost less than this for the guess to beat the best cost
+                part_result = self.solve(part, next_guesses, best_cost - cost + part_bound)
+                if part_result is None:
+                    cost = None
+                    break
+                else:
+                    cost += part_result[0] - part_bound
+            if cost is not None and cost < best_cost:
+                best_cost = cost
+                best_guess = guess
+            else:
+                pass
+
+        if best_guess is None:
+            self.__lower_bounds[possible_codes] = max(self.__lower_bounds.get(possible_codes, 0), limit)
+            return None
+        else:
+            self.__exact_costs[possible_codes] = (best_cost, best_guess)
+            return best_cost, best_guess
+
+    def strategy(self, possible_codes, guesses=()):
+        """
+        Find the best guess of every set that the best strategy for a set of possible codes can reach
+        :param possible_codes: a bitset of the possible codes
+        :param guesses: a tuple of the indexes of the guesses made so far, in numeric order
+        :return: a dictionary from each set (as a bitset) to the index of its best guess
+        """
+        best_guesses = {}
+        to_visit = [(possible_codes, guesses)]
+        while len(to_visit) > 0:
+            codes, codes_guesses = to_visit.pop()
+            if codes not in best_guesses:
+                guess = self.solve(codes, codes_guesses)[1]
+                best_guesses[codes] = guess
+                next_guesses = tuple(sorted(codes_guesses + (guess,)))
+                to_visit.extend((part, next_guesses) for part in self.partition(codes, guess))
+            else:
+                pass
+        return best_guesses
+
+
+_solvers = {}  # solvers that have been made in this process, by (pegs, colours, max_candidates)
+
+
+def solve_part(pegs, colours, max_candidates, possible_codes, guesses):
+    """
+    Find the best strategy for one part of the possible codes.
+    This is a function instead of a method so that worker processes can run it, each process keeps one solver
+    for each code space, so sets that more than one part reaches are only searched once in each process.
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param max_candidates: see OptimalSolver
+    :param possible_codes: a bitset of the possible codes in the part
+    :param guesses: a tuple of the indexes of the guesses that lead to the part, in numeric order
+    :return: a tuple of the cost of the part and the dictionary from OptimalSolver.strategy()
+    """
+    key = (pegs, colours, max_candidates)
+    if key not in _solvers:
+        _solvers[key] = OptimalSolver(pegs, colours, max_candidates)
+    else:
+        pass
+    solver = _solvers[key]
+    return solver.solve(possible_codes, guesses)[0], solver.strategy(possible_codes, guesses)
+
+
+def find_optimal_strategy(pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS, max_candidates=None, first_guesses=None,
+                          processes=None):
+    """
+    Find the strategy with the fewest guesses in total over every code.
+    Each first guess splits every code into parts, and each part is searched on its own, in a process pool if
+    processes is more than 1. The first guess with the least total cost is chosen.
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param max_candidates: see OptimalSolver
+    :param first_guesses: a list of the indexes of the first guesses to try, or None to try one from each set of
+                          symmetric codes, ex. 1111, 1112, 1122, 1123, and 1234 with four pegs and six colours
+    :param processes: the number of processes to search in, or None to search in this process
+    :return: a tuple of the total cost, the first guess, and a dictionary from each set the strategy reaches
+             (as a bitset) to the index of its best guess
+    """
+    code_space = get_code_space(pegs, colours)
+    solver = OptimalSolver(pegs, colours, max_candidates)
+    if first_guesses is None:
+        first_guesses = mask_to_codes(orbit_representatives(pegs, colours, ()))
+    else:
+        pass
+    tasks = []
+    for first_guess in first_guesses:
+        for part in solver.partition(code_space.all_codes_mask, first_guess):
+            tasks.append((first_guess, part))
+    # the biggest parts first, so the slowest parts are not left until the end
+    tasks.sort(key=lambda task: task[1].bit_count(), reverse=True)
+    task_arguments = [[pegs] * len(tasks), [colours] * len(tasks), [max_candidates] * len(tasks),
+                      [part for first_guess, part in tasks], [(first_guess,) for first_guess, part in tasks]]
+
+    if processes is not None and processes > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(solve_part, *task_arguments))
+    else:
+        results = list(map(solve_part, *task_arguments))
+
+    costs = {first_guess: code_space.number_of_codes for first_guess in first_guesses}
+    best_guesses = {}
+    for (first_guess, part), (part_cost, part_guesses) in zip(tasks, results):
+        costs[first_guess] += part_cost
+        best_guesses[first_guess] = best_guesses.get(first_guess, {})
+        best_guesses[first_guess].update(part_guesses)
+    best_first_guess = min(first_guesses, key=lambda first_guess: (costs[first_guess], first_guess))
+    strategy = best_guesses[best_first_guess]
+    strategy[code_space.all_codes_mask] = best_first_guess
+    return costs[best_first_guess], best_first_guess, strategy
+
+
+def build_tree(code_space, strategy):
+    """
+    Turn a strategy into a decision tree
+    :param code_space: the code space of the strategy
+    :param strategy: a dictionary from each set of possible codes (as a bitset) to the index of the guess for it,
+                     with a guess for every set of more than two codes that the strategy reaches from every code
+    :return: the decision tree
+    """
+    feedback_table = get_feedback_table(code_space)
+    number_of_responses = code_space.number_of_responses
+    guesses = array("I", [strategy[code_space.all_codes_mask]])
+    children = array("I", [0] * number_of_responses)
+    to_visit = [(0, code_space.all_codes_mask)]
+    while len(to_visit) > 0:
+        node, possible_codes = to_visit.pop()
+        guess_masks = feedback_table.masks(guesses[node])
+        for resp in range(number_of_responses):
+            part = possible_codes & guess_masks[resp]
+            if resp != code_space.winning_response and part != 0:
+                child = len(guesses)
+                if part in strategy:
+                    guesses.append(strategy[part])
+                else:
+                    guesses.append((part & -part).bit_length() - 1)  # one or two codes, guess the least
+                children.extend([0] * number_of_responses)
+                children[node * number_of_responses + resp] = child
+                to_visit.append((child, part))
+            else:
+                pass
+    return DecisionTree(guesses, children, code_space)
+
+
+def total_guesses(tree):
+    """
+    Count the guesses a decision tree takes to break every code
+    :param tree: a decision tree
+    :return: the total number of guesses over every code, or None if the tree does not break every code
+    """
+    code_space = tree.code_space
+    total = 0
+    for code in range(code_space.number_of_codes):
+        node = tree.root
+        guesses = 1
+        while node is not None and tree.guess(node) != code:
+            node = tree.child(node, code_space.response_index(code, tree.guess(node)))
+            guesses += 1
+        if node is None:
+            return None
+        else:
+            total += guesses
+    return total
+
+
+def optimal_tree_path(pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS):
+    """
+    Get the default path of the tree file for a code space
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :return: the path of the tree file, in the directory from get_table_directory()
+    """
+    return os.path.join(get_table_directory(), "optimal_tree_v1_" + str(pegs) + "x" + str(colours) + ".bin")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Search for the strategy with the fewest guesses on average.")
+    parser.add_argument("--pegs", type=int, default=DEFAULT_PEGS, help="the number of pegs in a code")
+    parser.add_argument("--colours", type=int, default=DEFAULT_COLOURS, help="the number of colours a peg can be")
+    parser.add_argument("--max-candidates", type=int, default=None,
+                        help="the most guesses to search for each set of possible codes, all of them if left out")
+    parser.add_argument("--first-guess", default=None, help="the first guess, every kind of first guess if left out")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="the number of processes to search in")
+    parser.add_argument("--output", default=None, help="the path of the tree file to write")
+    arguments = parser.parse_args()
+
+    search_space = get_code_space(arguments.pegs, arguments.colours)
+    search_first_guesses = None
+    if arguments.first_guess is not None:
+        search_first_guesses = [search_space.code_to_index(arguments.first_guess)]
+    else:
+        pass
+    start_time = time.time()
+    search_cost, search_first_guess, search_strategy = find_optimal_strategy(
+        arguments.pegs, arguments.colours, arguments.max_candidates, search_first_guesses, arguments.processes)
+    search_tree = build_tree(search_space, search_strategy)
+    print("Searched in " + str(time.time() - start_time) + " seconds.")
+    print("First guess: " + search_space.index_to_code(search_first_guess))
+    print("Total guesses: " + str(search_cost) + ", average " + str(search_cost / search_space.number_of_codes) +
+          ", worst case " + str(search_tree.depth()))
+
+    # check the tree by playing every code
+    if total_guesses(search_tree) != search_cost:
+        print("Error: the tree does not take the number of guesses the search found.")
+    else:
+        output_path = arguments.output if arguments.output is not None else \
+            optimal_tree_path(arguments.pegs, arguments.colours)
+        search_tree.save(output_path)
+        print("Saved the tree to " + output_path)
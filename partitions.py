@@ -0,0 +1,125 @@
+"""
+Code Written by Jackson L. Davis
+
+This file is for splitting a set of codes into groups by the response each code would give to a guess, which is
+how a guess partitions the codes. The computer player, the adversarial board, and the lockstep solver all split codes
+this way, so the partitions are worked out here and shared between them.
+
+With a feedback table each group is the set of codes & the response's mask (see FeedbackTable.masks()). Without one,
+the responses are worked out with CodeSpace.response_indexes() and the codes are grouped by make_buckets(). Every
+game starts with the same first guess against every code, so that partition is only worked out once in each process
+(see get_first_guess_buckets()).
+"""
+
+from codes import codes_to_mask, get_code_space, mask_to_codes
+from feedback_table import get_feedback_table
+
+
+def split_codes(code_space, codes, guess):
+    """
+    Split a set of codes into groups by the response each code would give to a guess.
+    With a feedback table each group is the set of codes & the response's mask (see FeedbackTable.masks()), without
+    one the responses are worked out, except for the first guess against every code, which uses the partition that
+    is shared by every computer player (see get_first_guess_buckets()).
+    :param code_space: the code space of the codes
+    :param codes: a bitset of the codes
+    :param guess: the index of a guess
+    :return: a dictionary where each key is the index of a response and each value is a bitset of the codes that
+             give that response, responses that no code gives are left out
+    """
+    feedback_table = get_feedback_table(code_space)
+    if feedback_table is not None:
+        groups = {}
+        guess_masks = feedback_table.masks(guess)
+        for r in range(len(guess_masks)):
+            group = codes & guess_masks[r]
+            if group != 0:
+                groups[r] = group
+            else:
+                pass
+        return groups
+    elif guess == code_space.first_guess and codes == code_space.all_codes_mask:
+        return get_first_guess_buckets(code_space)
+    else:
+        code_list = mask_to_codes(codes)
+        return make_buckets(code_list, code_space.response_indexes(guess, code_list))
+
+
+def make_buckets(codes, resp_indexes):
+    """
+    Group codes by their responses
+    :param codes: a list of code indexes
+    :param resp_indexes: a list of the index of the response of each code, in the same order as codes
+    :return: a dictionary where each key is the index of a response and each value is a bitset of the codes that
+             give that response
+    """
+    buckets = {}
+    for code, resp in zip(codes, resp_indexes):
+        if resp in buckets:
+            buckets[resp].append(code)
+        else:
+            buckets[resp] = [code]
+    return {resp: codes_to_mask(buckets[resp]) for resp in buckets}
+
+
+_first_guess_buckets = {}  # the partition of every code for the first guess, by (pegs, colours)
+
+
+def get_first_guess_buckets(code_space):
+    """
+    Get the partition of every code by its response to the first guess, working it out the first time it is needed.
+    Every computer player makes the same first guess, so in a code space without a feedback table this is the one
+    filter that every game does over every code, and it is shared by every computer player in this process.
+    :param code_space: a code space (see codes.py)
+    :return: a dictionary where each key is the index of a response and each value is a bitset of the codes that
+             give that response to code_space.first_guess
+    """
+    key = (code_space.pegs, code_space.colours)
+    if key not in _first_guess_buckets:
+        all_codes = range(code_space.number_of_codes)
+        _first_guess_buckets[key] = make_buckets(all_codes, code_space.response_indexes(code_space.first_guess,
+                                                                                         all_codes))
+    else:
+        pass
+    return _first_guess_buckets[key]
+
+
+if __name__ == '__main__':
+    print("Testing partitions.py")
+    errors = 0
+
+    # with and without a feedback table, the groups should hold each code under the response it gives
+    for test_pegs, test_colours in [(4, 6), (5, 7)]:
+        test_space = get_code_space(test_pegs, test_colours)
+        test_codes = codes_to_mask(range(0, test_space.number_of_codes, 7))
+        for test_guess in [test_space.first_guess, 0, test_space.number_of_codes - 1]:
+            test_groups = split_codes(test_space, test_codes, test_guess)
+            if sum(group.bit_count() for group in test_groups.values()) != test_codes.bit_count():
+                print("Error: the groups for " + test_space.index_to_code(test_guess) + " do not hold every code.")
+                errors += 1
+            else:
+                pass
+            for resp in test_groups:
+                for code in mask_to_codes(test_groups[resp]):
+                    if test_space.response_index(code, test_guess) != resp:
+                        print("Error: " + test_space.index_to_code(code) + " is in the wrong group for " +
+                              test_space.index_to_code(test_guess))
+                        errors += 1
+                    else:
+                        pass
+
+    # the first guess against every code should use the shared partition
+    big_space = get_code_space(5, 7)
+    big_groups = split_codes(big_space, big_space.all_codes_mask, big_space.first_guess)
+    if big_groups is not get_first_guess_buckets(big_space):
+        print("Error: the first guess against every code did not use the shared partition.")
+        errors += 1
+    else:
+        pass
+    if make_buckets([3, 5, 8], [1, 0, 1]) != {1: 0b100001000, 0: 0b100000}:
+        print("Error: make_buckets() grouped the codes wrong.")
+        errors += 1
+    else:
+        pass
+
+    print("Finished testing with " + str(errors) + " errors.")
@@ -0,0 +1,202 @@
+"""
+Code Written by Jackson L. Davis
+
+This file is for analysing a position in a game without playing the game: given the guesses and responses so far,
+in any order, it checks that some code would give every response, counts the codes that are still possible, and
+finds the guess a computer player would make next along with its score (see strategies.py) and the most codes it can
+leave, ex. analyse_position(zip(board.guesses, board.responses)) gives a hint to a human codebreaker.
+
+A computer player works out its possible codes by taking one response at a time, but the possible codes only depend
+on which guesses got which responses, so here they are found at once: with a feedback table, the possible codes are
+the & of the masks for each guess and response (see FeedbackTable.masks()). The unused codes are every code that has
+not been guessed, and the next guess is chosen the same way ComputerPlayer.next_guess() chooses it. Without a
+feedback table, a computer player is given the guesses and responses and searches for the guess instead.
+
+The same position always gets the same analysis, so each analysis is kept in a functools.lru_cache, and asking
+again, ex. for a hint on every turn, does not search again.
+"""
+
+from codes import DEFAULT_PEGS, DEFAULT_COLOURS, get_code_space, mask_to_codes
+from computer_player import ComputerPlayer, score_codes
+from feedback_table import get_feedback_table
+from partitions import split_codes
+from strategies import DEFAULT_STRATEGY
+from symmetry import orbit_representatives
+import functools
+
+# the most positions the analysis cache holds
+ANALYSIS_CACHE_SIZE = 4096
+
+
+def analyse_position(history, pegs=DEFAULT_PEGS, colours=DEFAULT_COLOURS, strategy=DEFAULT_STRATEGY):
+    """
+    Analyse a position from its guesses and responses
+    :param history: a list of (guess, response) pairs, where each guess is a string or an index and each response
+                    is a tuple or an index, ex. list(zip(board.guesses, board.responses))
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param strategy: the name of a strategy in STRATEGIES (see strategies.py)
+    :precond: some code would give every response in history
+    :return: a dictionary with the number of possible codes ("possible_codes"), the best next guess as a string
+             ("best_guess"), its score with the strategy ("score"), the most possible codes it can leave, which is
+             the same as the score only with minimax ("largest_part"), and whether it could be the code ("possible")
+    """
+    code_space = get_code_space(pegs, colours)
+    pairs = set()
+    for guess, resp in history:
+        resp = resp if isinstance(resp, int) else tuple(resp)
+        if not code_space.is_valid_code(guess):
+            raise Exception("Cannot analyse the position, " + str(guess) + " is not a valid guess.")
+        elif resp not in code_space.responses and resp not in range(code_space.number_of_responses):
+            raise Exception("Cannot analyse the position, " + str(resp) + " is not a valid response.")
+        else:
+            pass
+        pairs.add((code_space.code_to_index(guess), code_space.response_to_index(resp)))
+    # the position does not depend on the order of the guesses, so the same position is always the same key
+    return dict(analyse_pairs(tuple(sorted(pairs)), pegs, colours, strategy))
+
+
+@functools.lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def analyse_pairs(pairs, pegs, colours, strategy):
+    """
+    Analyse a position, see analyse_position()
+    :param pairs: a tuple of (guess index, response index) pairs in numeric order
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param strategy: the name of a strategy in STRATEGIES
+    :return: a tuple of the (key, value) items of the analysis, so that the cached analysis cannot be changed
+    """
+    code_space = get_code_space(pegs, colours)
+    feedback_table = get_feedback_table(code_space)
+    guesses = tuple(guess for guess, resp in pairs)
+    if len(set(guesses)) != len(guesses):
+        raise Exception("Cannot analyse the position, a guess has two different responses.")
+    else:
+        pass
+
+    if feedback_table is None:
+        player = ComputerPlayer(None, pegs=pegs, colours=colours, strategy=strategy, seed=0)
+        for guess, resp in pairs:
+            player.record_response(guess, resp)
+        possible_codes = len(player.possible_codes)
+        if possible_codes == 0:
+            raise Exception("Cannot analyse the position, no code gives every response.")
+        else:
+            pass
+        best_guess = code_space.first_guess if len(pairs) == 0 else player.next_guess()
+        return (("possible_codes", possible_codes), ("best_guess", code_space.index_to_code(best_guess)),
+                ("score", player.get_code_score(best_guess)),
+                ("largest_part", max(player.get_partition(best_guess).values())),
+                ("possible", best_guess in player.possible_codes))
+    else:
+        pass
+
+    possible_mask = code_space.all_codes_mask
+    unused_mask = code_space.all_codes_mask
+    for guess, resp in pairs:
+        possible_mask &= feedback_table.masks(guess)[resp]
+        unused_mask &= ~(1 << guess)
+    possible_mask &= unused_mask
+    if possible_mask == 0 and code_space.winning_response not in [resp for guess, resp in pairs]:
+        raise Exception("Cannot analyse the position, no code gives every response.")
+    elif possible_mask == 0:
+        raise Exception("Cannot analyse the position, the code has already been broken.")
+    else:
+        pass
+
+    if len(pairs) == 0:
+        # a computer player always starts with the first guess
+        best_score, best_codes = score_codes(possible_mask, [code_space.first_guess], pegs, colours, strategy)
+    else:
+        codes_to_score = mask_to_codes(unused_mask & orbit_representatives(pegs, colours, tuple(sorted(guesses))))
+        best_score, best_codes = score_codes(possible_mask, codes_to_score, pegs, colours, strategy)
+    # like ComputerPlayer.choose_best_code(), a possible code is chosen if there is one
+    possible_best_codes = [code for code in best_codes if (possible_mask >> code) & 1]
+    best_guess = possible_best_codes[0] if len(possible_best_codes) > 0 else best_codes[0]
+    return (("possible_codes", possible_mask.bit_count()), ("best_guess", code_space.index_to_code(best_guess)),
+            ("score", best_score),
+            ("largest_part", max(group.bit_count() for group in split_codes(code_space, possible_mask,
+                                                                            best_guess).values())),
+            ("possible", (possible_mask >> best_guess) & 1 == 1))
+
+
+if __name__ == '__main__':
+    from board import Board
+    import time
+
+    print("Testing position_analysis.py")
+    errors = 0
+
+    # the best guess at every position of a game should be the computer player's next guess
+    for test_code in ["1122", "6543", "2424", "6333", "4565"]:
+        test_board = Board(test_code)
+        ComputerPlayer(test_board, use_guess_cache=False).solve(verbose=False)
+        test_guesses = test_board.guesses
+        test_responses = test_board.responses
+        for m in range(len(test_guesses)):
+            test_analysis = analyse_position(list(zip(test_guesses[:m], test_responses[:m])))
+            if test_analysis["best_guess"] != test_guesses[m]:
+                print("Error: the best guess after " + str(m) + " guesses for " + test_code + " was " +
+                      test_analysis["best_guess"] + " instead of " + test_guesses[m])
+                errors += 1
+            else:
+                pass
+
+    # the number of possible codes and the score
+    first_analysis = analyse_position([])
+    if first_analysis != {"possible_codes": 1296, "best_guess": "1122", "score": 256, "largest_part": 256,
+                          "possible": True}:
+        print("Error: the analysis of the first position is wrong: " + str(first_analysis))
+        errors += 1
+    else:
+        pass
+    # with another strategy the score is not the most codes the guess can leave
+    entropy_analysis = analyse_position([("1122", (1, 0))], strategy="entropy")
+    if entropy_analysis["largest_part"] >= entropy_analysis["score"] or entropy_analysis["largest_part"] > 256:
+        print("Error: the largest part with the entropy strategy is wrong: " + str(entropy_analysis))
+        errors += 1
+    else:
+        pass
+    second_analysis = analyse_position([("1122", (1, 0))])
+    if second_analysis["possible_codes"] != 256:
+        print("Error: there should be 256 possible codes after 1122 gets (1, 0).")
+        errors += 1
+    else:
+        pass
+
+    # the same position in another order, with indexes, should come from the cache
+    analyse_pairs.cache_clear()
+    analyse_position([("1122", (1, 0)), ("1344", (0, 2))])
+    start_time = time.perf_counter()
+    cached_analysis = analyse_position([(get_code_space().code_to_index("1344"), (0, 2)), ("1122", 5)])
+    cached_time = time.perf_counter() - start_time
+    if analyse_pairs.cache_info().hits != 1:
+        print("Error: the same position in another order was not found in the cache.")
+        errors += 1
+    else:
+        pass
+    print("A cached analysis took " + str(cached_time) + " seconds: " + str(cached_analysis))
+
+    # histories that no code fits
+    for bad_history in [[("1122", (4, 0)), ("3456", (0, 0))], [("1122", (0, 0)), ("1122", (1, 0))],
+                        [("1111", (0, 0)), ("2222", (0, 0)), ("3333", (0, 0)), ("4444", (0, 0)), ("5555", (0, 0)),
+                         ("6666", (0, 0))], [("1122", (3, 1))]]:
+        try:
+            analyse_position(bad_history)
+            print("Error: analyse_position() did not throw an exception for " + str(bad_history))
+            errors += 1
+        except:
+            pass
+
+    # a bigger code space without a feedback table
+    big_board = Board("12345", 5, 7)
+    big_board.add_guesses(["11223", "45667"])
+    big_analysis = analyse_position(list(zip(big_board.guesses, big_board.responses)), 5, 7)
+    print("5 pegs and 7 colours: " + str(big_analysis))
+    if big_analysis["possible_codes"] < 1 or not Board.is_valid_code(big_analysis["best_guess"], 5, 7):
+        print("Error: the analysis with 5 pegs and 7 colours is wrong.")
+        errors += 1
+    else:
+        pass
+
+    print("Finished testing with " + str(errors) + " errors.")
@@ -0,0 +1,228 @@
+"""
+Code Written by Jackson L. Davis
+
+This class is for the statistics of a computer player, which show where the time goes while it breaks a code.
+A SolverStats object is attached to a computer player with ComputerPlayer(board, stats=SolverStats()), and the
+computer player tells it what happens during each move:
+
+the search: how long next_guess() took, how many codes it scored, how many responses it worked out or looked up to
+score them, whether the guess was found in the guess cache, and whether the search finished before its time limit.
+
+the filter: how many codes were possible before and after the response to the guess was known.
+
+the move: the guess, the response, and how long the whole move took.
+
+It also counts the response evaluations, codes scored, and guess cache hits over every move. A response evaluation
+is one (code, possible code) pair whose response is worked out or looked up, while scoring codes or while filtering
+the possible codes after a response, so it shows how much of the work a move did.
+After each move, the move's statistics are passed to the callback if there is one, so slow games can be found while
+they are being played. A computer player without a SolverStats object skips all of this.
+"""
+
+
+class SolverStats:
+
+    def __init__(self, callback=None):
+        """
+        Constructor method for the solver statistics
+        :param callback: a function that is called with the dictionary of statistics for each move after the move
+                         is made, or None
+        """
+        self.__callback = callback
+        self.__moves = []         # a dictionary of statistics for each move, see record_move()
+        self.__current_move = {}  # the statistics for the move that is being made
+        self.__response_evaluations = 0
+        self.__codes_scored = 0
+        self.__cache_hits = 0
+        self.__cache_misses = 0
+
+    @property
+    def moves(self):
+        return self.__moves
+
+    @property
+    def response_evaluations(self):
+        return self.__response_evaluations
+
+    @property
+    def codes_scored(self):
+        return self.__codes_scored
+
+    @property
+    def cache_hits(self):
+        return self.__cache_hits
+
+    @property
+    def cache_misses(self):
+        return self.__cache_misses
+
+    @property
+    def total_seconds(self):
+        return sum(move["seconds"] for move in self.__moves)
+
+    def count_response_evaluations(self, response_evaluations):
+        """
+        Count the (code, possible code) pairs whose responses were worked out or looked up
+        :param response_evaluations: the number of pairs
+        """
+        self.__response_evaluations += response_evaluations
+        self.__current_move["response_evaluations"] = self.__current_move.get("response_evaluations", 0) + \
+            response_evaluations
+
+    def count_codes_scored(self, codes_scored):
+        """
+        Count the codes that were scored while searching for a guess
+        :param codes_scored: the number of codes
+        """
+        self.__codes_scored += codes_scored
+        self.__current_move["codes_scored"] = self.__current_move.get("codes_scored", 0) + codes_scored
+
+    def record_search(self, seconds, cache_hit, search_complete):
+        """
+        Record a search for the next guess
+        :param seconds: the number of seconds next_guess() took
+        :param cache_hit: True if the guess was found in the guess cache, False if it was not, or None if the guess
+                          cache was not used
+        :param search_complete: True if every code that should be scored was scored
+        """
+        if cache_hit is True:
+            self.__cache_hits += 1
+        elif cache_hit is False:
+            self.__cache_misses += 1
+        else:
+            pass
+        self.__current_move["search_seconds"] = seconds
+        self.__current_move["cache_hit"] = cache_hit
+        self.__current_move["search_complete"] = search_complete
+
+    def record_filter(self, possible_before, possible_after):
+        """
+        Record the possible codes being filtered after a response
+        :param possible_before: the number of possible codes before the response was known
+        :param possible_after: the number of possible codes after the response was known
+        """
+        self.__current_move["possible_before"] = possible_before
+        self.__current_move["possible_after"] = possible_after
+
+    def record_move(self, guess, resp, seconds):
+        """
+        Finish the statistics for a move and pass them to the callback.
+        The statistics for a move are a dictionary with the keys "move" (the first move is 1), "guess", "response",
+        and "seconds", along with "search_seconds", "codes_scored", "response_evaluations", "cache_hit",
+        "search_complete", "possible_before", and "possible_after" if the computer player recorded them during the
+        move.
+        :param guess: a string representing the guess
+        :param resp: a tuple representing the response
+        :param seconds: the number of seconds the move took, including the search
+        """
+        move = {"move": len(self.__moves) + 1, "guess": guess, "response": resp, "seconds": seconds}
+        move.update(self.__current_move)
+        self.__moves.append(move)
+        self.__current_move = {}
+        if self.__callback is not None:
+            self.__callback(move)
+        else:
+            pass
+
+    def slowest_move(self):
+        """
+        Find the move that took the most time
+        :return: the dictionary of statistics for the slowest move, or None if no moves have been made
+        """
+        if len(self.__moves) == 0:
+            return None
+        else:
+            return max(self.__moves, key=lambda move: move["seconds"])
+
+    def summary(self):
+        """
+        Sum up the statistics of every move
+        :return: a dictionary of the totals
+        """
+        return {
+            "moves": len(self.__moves),
+            "total_seconds": self.total_seconds,
+            "response_evaluations": self.__response_evaluations,
+            "codes_scored": self.__codes_scored,
+            "cache_hits": self.__cache_hits,
+            "cache_misses": self.__cache_misses,
+        }
+
+    def reset(self):
+        """
+        Remove the statistics of every move and set every count back to 0
+        """
+        self.__moves = []
+        self.__current_move = {}
+        self.__response_evaluations = 0
+        self.__codes_scored = 0
+        self.__cache_hits = 0
+        self.__cache_misses = 0
+
+
+if __name__ == '__main__':
+    from board import Board
+    from computer_player import ComputerPlayer
+
+    print("Testing solver_stats.py")
+    errors = 0
+
+    seen_moves = []
+    test_stats = SolverStats(callback=seen_moves.append)
+    test_board = Board("6543")
+    test_player = ComputerPlayer(test_board, use_guess_cache=False, stats=test_stats)
+    test_player.solve()
+
+    if len(test_stats.moves) != len(test_board.guesses) or seen_moves != test_stats.moves:
+        print("Error: there should be one set of statistics for each guess, and each should be passed to the callback.")
+        errors += 1
+    else:
+        pass
+    if test_stats.moves[0]["guess"] != "1122" or test_stats.moves[-1]["response"] != (4, 0):
+        print("Error: the statistics have the wrong guesses or responses.")
+        errors += 1
+    else:
+        pass
+    for test_move in test_stats.moves[:-1]:
+        if test_move["possible_after"] > test_move["possible_before"]:
+            print("Error: the number of possible codes went up after move " + str(test_move["move"]))
+            errors += 1
+        else:
+            pass
+    if test_stats.codes_scored == 0 or test_stats.cache_hits != 0:
+        print("Error: the counts are wrong.")
+        errors += 1
+    else:
+        pass
+
+    # each search after the first guess scores its codes against the codes that were possible after the last move,
+    # and with a feedback table filtering the possible codes does not evaluate any responses
+    for m in range(1, len(test_stats.moves)):
+        test_move = test_stats.moves[m]
+        if test_move.get("response_evaluations") != \
+                test_move["codes_scored"] * test_stats.moves[m - 1]["possible_after"]:
+            print("Error: move " + str(test_move["move"]) + " should have scored " + str(test_move["codes_scored"]) +
+                  " codes against " + str(test_stats.moves[m - 1]["possible_after"]) + " possible codes.")
+            errors += 1
+        else:
+            pass
+    if test_stats.response_evaluations != sum(move.get("response_evaluations", 0) for move in test_stats.moves):
+        print("Error: the response evaluations of every move do not add up to the total.")
+        errors += 1
+    else:
+        pass
+
+    # without a feedback table, filtering the possible codes after a response can also evaluate responses
+    big_stats = SolverStats()
+    big_board = Board("12345", 5, 7)
+    ComputerPlayer(big_board, use_guess_cache=False, seed=0, stats=big_stats).solve(verbose=False)
+    if not big_board.solved or big_stats.response_evaluations == 0:
+        print("Error: the computer player did not count any response evaluations with 5 pegs and 7 colours.")
+        errors += 1
+    else:
+        pass
+    print(big_stats.summary())
+    print(test_stats.summary())
+    print(test_stats.slowest_move())
+
+    print("Finished testing with " + str(errors) + " errors.")
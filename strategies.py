@@ -0,0 +1,120 @@
+"""
+Code Written by Jackson L. Davis
+
+This file is for the strategies a computer player can use to choose its next guess.
+For each code it could guess, the computer player splits the possible codes into groups by the response each one
+would give, and counts the codes in each group. This list of counts is the code's partition histogram, ex. [0, 3, 1]
+means no possible code gives the first response, three give the second, and one gives the third.
+
+A strategy is a function that takes a partition histogram and returns a score, and the computer player guesses a
+code with the least score. The histogram is only worked out once for each code, so every strategy costs the same.
+Counts of 0 can be in the histogram, and every strategy ignores them.
+
+Here are the built-in strategies:
+
+"minimax" is Donald Knuth's strategy, the score is the size of the biggest group, which is the most codes that can
+be left after the guess.
+
+"expected_size" scores by the sum of the squares of the group sizes, which is the expected number of codes left
+after the guess times the number of possible codes.
+
+"entropy" scores by the sum of s * log2(s) over the group sizes s, which is the least when the guess gives the most
+information (entropy) about the code.
+
+"most_parts" scores by the number of groups that are not empty, negated, so the guess that splits the possible
+codes into the most groups has the least score.
+"""
+
+import math
+
+
+def minimax_score(histogram):
+    """
+    Score a partition histogram by its biggest group
+    :param histogram: a list of the number of possible codes that would give each response
+    :return: the size of the biggest group
+    """
+    return max(histogram)
+
+
+def expected_size_score(histogram):
+    """
+    Score a partition histogram by the expected number of codes left
+    :param histogram: a list of the number of possible codes that would give each response
+    :return: the sum of the squares of the group sizes
+    """
+    return sum(size * size for size in histogram)
+
+
+def entropy_score(histogram):
+    """
+    Score a partition histogram by its entropy, a guess that gives more information has a lower score
+    :param histogram: a list of the number of possible codes that would give each response
+    :return: the sum of s * log2(s) over the group sizes s that are not 0
+    """
+    return sum(size * math.log2(size) for size in histogram if size > 1)
+
+
+def most_parts_score(histogram):
+    """
+    Score a partition histogram by the number of groups, a guess with more groups has a lower score
+    :param histogram: a list of the number of possible codes that would give each response
+    :return: the number of groups that are not empty, negated
+    """
+    return -sum(1 for size in histogram if size > 0)
+
+
+STRATEGIES = {
+    "minimax": minimax_score,
+    "expected_size": expected_size_score,
+    "entropy": entropy_score,
+    "most_parts": most_parts_score,
+}
+DEFAULT_STRATEGY = "minimax"
+
+
+def get_strategy(strategy):
+    """
+    Get the function for a strategy
+    :param strategy: the name of a strategy in STRATEGIES, or a function that scores a partition histogram
+    :return: the function that scores a partition histogram
+    """
+    if callable(strategy):
+        return strategy
+    elif strategy in STRATEGIES:
+        return STRATEGIES[strategy]
+    else:
+        raise Exception("Cannot get strategy, " + str(strategy) + " is not one of " + ", ".join(STRATEGIES) + ".")
+
+
+if __name__ == '__main__':
+    print("Testing strategies.py")
+    errors = 0
+
+    # an even split should beat an uneven split with every strategy
+    even_histogram = [1, 2, 2, 1]
+    uneven_histogram = [4, 1, 1, 0]
+    for strategy_name in STRATEGIES:
+        score_function = get_strategy(strategy_name)
+        if score_function(even_histogram) >= score_function(uneven_histogram):
+            print("Error: " + strategy_name + " did not prefer the even split.")
+            errors += 1
+        else:
+            pass
+
+    test_scores = [(minimax_score, 4), (expected_size_score, 18), (entropy_score, 8.0), (most_parts_score, -3)]
+    for score_function, expected_score in test_scores:
+        if score_function(uneven_histogram) != expected_score:
+            print("Error: " + score_function.__name__ + " gave the wrong score.")
+            errors += 1
+        else:
+            pass
+
+    try:
+        get_strategy("fastest")
+        print("Error: get_strategy() did not throw an exception for an unknown strategy.")
+        errors += 1
+    except:
+        pass
+
+    print("Finished testing with " + str(errors) + " errors.")
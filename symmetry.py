@@ -0,0 +1,283 @@
+"""
+Code Written by Jackson L. Davis
+
+This file is for finding the codes that a computer player does not need to score because they are symmetric to
+codes it already scores.
+
+Renaming the colours and moving the pegs around in the same way for every code does not change any response. So if
+doing that leaves every guess made so far the same, it also leaves the set of possible codes the same, and it turns
+a code into another code with the same partition histogram (see strategies.py) and the same chance of being the code.
+These moves are the symmetries of the position, ex. after "1122", colours 3, 4, 5, and 6 can be swapped with each
+other, and so can the first two pegs.
+
+The codes that the symmetries turn a code into are its orbit, and every code in an orbit gets the same score.
+Only the code with the least index in each orbit (its representative) is scored. The code with the least index out of
+the best codes is always a representative, so the computer player still chooses the same guess.
+
+Each symmetry is a tuple (colour_map, position_map), which turns a code into the code where the peg at position
+position_map[i] has the colour colour_map[c] if the peg at position i had the colour c.
+The symmetries of a position only depend on the guesses made so far, so they are found once for each set of guesses
+and kept in a cache. If there would be too many symmetries to list, only the colours that have not been guessed yet
+are swapped, which is still exact but scores more codes.
+"""
+
+from codes import codes_to_mask, get_code_space
+from collections import OrderedDict
+import functools
+import itertools
+import math
+import operator
+import threading
+
+# the whole group of symmetries is only listed if it has at most this many symmetries, ex. 17280 for four pegs and
+# six colours
+MAX_GROUP_SIZE = 20000
+# the orbits are only found from the symmetries if there are at most this many, otherwise only unguessed colours
+# are swapped
+MAX_ORBIT_SYMMETRIES = 1000
+# the most sets of guesses whose symmetries and representatives are kept
+SYMMETRY_CACHE_SIZE = 4096
+
+# the representatives found by orbit_representatives(), from (pegs, colours, guesses) to a bitset, with the least
+# recently used set of guesses first
+_representatives = OrderedDict()
+_representatives_lock = threading.Lock()
+
+
+def apply_symmetry(symmetry, digits):
+    """
+    Move the pegs and rename the colours of a code
+    :param symmetry: a tuple (colour_map, position_map)
+    :param digits: a tuple of the colour of each peg of a code (see CodeSpace.digits())
+    :return: a tuple of the colour of each peg of the code the symmetry turns the code into
+    """
+    colour_map, position_map = symmetry
+    image = [0] * len(digits)
+    for i in range(len(digits)):
+        image[position_map[i]] = colour_map[digits[i]]
+    return tuple(image)
+
+
+def symmetry_images(code_space, symmetry):
+    """
+    Find the code that a symmetry turns each code into.
+    Each code is split into its first half and its last half, the index of the new code is the sum of a number for
+    the first half and a number for the last half, so the two halves are each only worked out once.
+    :param code_space: a code space (see codes.py)
+    :param symmetry: a tuple (colour_map, position_map)
+    :return: a list where item c is the index of the code that the symmetry turns the code with index c into
+    """
+    colour_map, position_map = symmetry
+    pegs = code_space.pegs
+    colours = code_space.colours
+    # the amount that each colour adds to the new code's index at each position
+    weights = [colours ** (pegs - 1 - position_map[i]) for i in range(pegs)]
+    split = pegs // 2
+    first_halves = [sum(colour_map[digits[i]] * weights[i] for i in range(split))
+                    for digits in itertools.product(range(colours), repeat=split)]
+    last_halves = [sum(colour_map[digits[i]] * weights[split + i] for i in range(pegs - split))
+                   for digits in itertools.product(range(colours), repeat=pegs - split)]
+    return [first_half + last_half for first_half in first_halves for last_half in last_halves]
+
+
+@functools.lru_cache(maxsize=None)
+def symmetry_group(pegs, colours):
+    """
+    List every symmetry of a code space, which is every way to rename the colours along with every way to move
+    the pegs
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :return: a tuple of symmetries, or None if there are more than MAX_GROUP_SIZE
+    """
+    if math.factorial(colours) * math.factorial(pegs) > MAX_GROUP_SIZE:
+        return None
+    else:
+        return tuple(itertools.product(itertools.permutations(range(colours)), itertools.permutations(range(pegs))))
+
+
+@functools.lru_cache(maxsize=SYMMETRY_CACHE_SIZE)
+def stabilizer(pegs, colours, guesses):
+    """
+    List the symmetries that leave every guess the same.
+    These are found from the symmetries that leave all but the last guess the same, so sets of guesses that start
+    the same way share the work.
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param guesses: a tuple of the indexes of the guesses in numeric order
+    :return: a tuple of symmetries, or None if there are too many symmetries to list
+    """
+    if len(guesses) == 0:
+        return symmetry_group(pegs, colours)
+    else:
+        previous_symmetries = stabilizer(pegs, colours, guesses[:-1])
+        if previous_symmetries is None:
+            return None
+        else:
+            digits = get_code_space(pegs, colours).digits(guesses[-1])
+            return tuple(s for s in previous_symmetries if apply_symmetry(s, digits) == digits)
+
+
+def orbit_representatives(pegs, colours, guesses):
+    """
+    Get the code with the least index in each orbit under the symmetries that leave every guess the same, finding
+    them with find_orbit_representatives() if they are not in the cache
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param guesses: a tuple of the indexes of the guesses in numeric order
+    :return: a bitset of the representatives (see codes.py)
+    """
+    representatives = cached_orbit_representatives(pegs, colours, guesses)
+    if representatives is None:
+        representatives = find_orbit_representatives(pegs, colours, guesses)
+        with _representatives_lock:
+            _representatives[(pegs, colours, guesses)] = representatives
+            if len(_representatives) > SYMMETRY_CACHE_SIZE:
+                _representatives.popitem(last=False)
+            else:
+                pass
+    else:
+        pass
+    return representatives
+
+
+def cached_orbit_representatives(pegs, colours, guesses):
+    """
+    Get the representatives from orbit_representatives() only if they are in the cache, since finding them can take
+    longer than a move with a time limit
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param guesses: a tuple of the indexes of the guesses in numeric order
+    :return: a bitset of the representatives, or None if they have not been found yet
+    """
+    key = (pegs, colours, guesses)
+    with _representatives_lock:
+        if key in _representatives:
+            _representatives.move_to_end(key)
+            return _representatives[key]
+        else:
+            return None
+
+
+def find_orbit_representatives(pegs, colours, guesses):
+    """
+    Find the code with the least index in each orbit under the symmetries that leave every guess the same
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param guesses: a tuple of the indexes of the guesses in numeric order
+    :return: a bitset of the representatives (see codes.py)
+    """
+    code_space = get_code_space(pegs, colours)
+    symmetries = stabilizer(pegs, colours, guesses)
+    if symmetries is None or len(symmetries) > MAX_ORBIT_SYMMETRIES:
+        return free_colour_representatives(code_space, guesses)
+    elif len(symmetries) == 1:
+        return code_space.all_codes_mask  # only the symmetry that changes nothing, every code is its own orbit
+    else:
+        # a code is the least in its orbit if no symmetry turns it into a code with a lesser index
+        least_images = map(min, *[symmetry_images(code_space, s) for s in symmetries])
+        all_codes = range(code_space.number_of_codes)
+        return codes_to_mask(itertools.compress(all_codes, map(operator.eq, least_images, all_codes)))
+
+
+def free_colour_representatives(code_space, guesses):
+    """
+    Find the code with the least index in each orbit when only the colours that are not in any guess are swapped.
+    The least code in an orbit is the one where those colours first show up (from the first peg to the last) in
+    order, starting with the least of them, ex. "1211" if colour 1 is the only free colour, or "3435" if 3, 4, and 5
+    are the free colours.
+    :param code_space: a code space (see codes.py)
+    :param guesses: a tuple of the indexes of the guesses
+    :return: a bitset of the representatives
+    """
+    guessed_colours = set()
+    for guess in guesses:
+        guessed_colours.update(code_space.digits(guess))
+    free_colours = tuple(c for c in range(code_space.colours) if c not in guessed_colours)
+    return free_colour_representatives_for(code_space.pegs, code_space.colours, free_colours)
+
+
+@functools.lru_cache(maxsize=SYMMETRY_CACHE_SIZE)
+def free_colour_representatives_for(pegs, colours, free_colours):
+    """
+    Find the representatives from free_colour_representatives() for a set of free colours.
+    They are built one peg at a time instead of picking them out of every code: each peg can have any colour that is
+    not free, any free colour that has already shown up, or the next free colour.
+    :param pegs: the number of pegs in a code
+    :param colours: the number of colours a peg can be
+    :param free_colours: a tuple of the colours that are not in any guess, in numeric order
+    :return: a bitset of the representatives
+    """
+    if len(free_colours) <= 1:
+        return get_code_space(pegs, colours).all_codes_mask  # nothing to swap, every code is its own orbit
+    else:
+        pass
+    guessed_colours = [c for c in range(colours) if c not in free_colours]
+    # each item is (the index of the pegs so far, the index in free_colours of the free colour that can show up next)
+    starts = [(0, 0)]
+    for peg in range(pegs):
+        next_starts = []
+        for index, next_free_colour in starts:
+            index *= colours
+            next_starts.extend((index + c, next_free_colour) for c in guessed_colours)
+            next_starts.extend((index + free_colours[f], next_free_colour) for f in range(next_free_colour))
+            if next_free_colour < len(free_colours):
+                next_starts.append((index + free_colours[next_free_colour], next_free_colour + 1))
+            else:
+                pass
+        starts = next_starts
+    return codes_to_mask(index for index, next_free_colour in starts)
+
+
+if __name__ == '__main__':
+    from computer_player import ComputerPlayer
+    import random as rand
+
+    print("Testing symmetry.py")
+    errors = 0
+    standard_space = get_code_space()
+    first_guess = standard_space.code_to_index("1122")
+
+    if len(stabilizer(4, 6, (first_guess,))) != 192:
+        print("Error: there should be 192 symmetries that leave 1122 the same.")
+        errors += 1
+    else:
+        pass
+
+    # the representatives after 1122 should include 1111, 1112 (which is the same as 1121), and 1123,
+    # but not 1124, which is the same as 1123 with colours 3 and 4 swapped
+    test_representatives = orbit_representatives(4, 6, (first_guess,))
+    for test_code, expected in [("1111", True), ("1112", True), ("1121", False), ("1123", True), ("1124", False)]:
+        if ((test_representatives >> standard_space.code_to_index(test_code)) & 1 == 1) != expected:
+            print("Error: " + test_code + " is in the wrong place in the representatives after 1122.")
+            errors += 1
+        else:
+            pass
+
+    # only swapping free colours should keep at least as many codes as using every symmetry
+    free_representatives = free_colour_representatives(standard_space, (first_guess,))
+    if free_representatives & test_representatives != test_representatives:
+        print("Error: a representative of the whole group is not a free-colour representative.")
+        errors += 1
+    else:
+        pass
+
+    # a computer player should choose the same guess with and without symmetry pruning
+    for a in range(30):
+        test_code = rand.randrange(standard_space.number_of_codes)
+        pruned_player = ComputerPlayer(None, use_guess_cache=False)
+        full_player = ComputerPlayer(None, use_guess_cache=False, use_symmetry=False)
+        guess = first_guess
+        while guess != test_code:
+            resp = standard_space.response_index(test_code, guess)
+            pruned_player.record_response(guess, resp)
+            full_player.record_response(guess, resp)
+            guess = pruned_player.next_guess()
+            if guess != full_player.next_guess():
+                print("Error: symmetry pruning changed the guess for the code " +
+                      standard_space.index_to_code(test_code))
+                errors += 1
+                break
+            else:
+                pass
+
+    print("Finished testing with " + str(errors) + " errors.")